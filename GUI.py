@@ -1,7 +1,4 @@
-import customtkinter as ctk
 from typing import Optional
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import pandas as pd
 from datetime import datetime, timedelta
 import webbrowser
@@ -9,6 +6,11 @@ import tempfile
 import os
 from pyBacktest.backtest import Backtest
 from pyBacktest.strategy import Strategy
+from pyBacktest.lazy import lazyImport
+
+ctk = lazyImport("customtkinter", "gui")
+go = lazyImport("plotly.graph_objects", "gui")
+subplots = lazyImport("plotly.subplots", "gui")
 
 class BacktestGUI:
     def __init__(self, strategy: Strategy) -> None:
@@ -98,8 +100,8 @@ class BacktestGUI:
         except Exception as e:
             self.show_error(f"Backtest Error: {str(e)}")
 
-    def create_chart(self) -> go.Figure:
-        fig = make_subplots(
+    def create_chart(self) -> 'go.Figure':
+        fig = subplots.make_subplots(
             rows=3, cols=1,
             shared_xaxes=True,
             vertical_spacing=0.1,
@@ -109,13 +111,7 @@ class BacktestGUI:
 
         dates = self.backtest.hist.index
         close_prices = self.backtest.hist['Close']
-        portfolio_values = []
-        cash_values = []
-
-        for date in dates:
-            self.backtest.date = date
-            portfolio_values.append(self.backtest.totalValue())
-            cash_values.append(self.backtest.cash)
+        equity = self.results.equity
 
         fig.add_trace(
             go.Scatter(
@@ -129,8 +125,8 @@ class BacktestGUI:
 
         fig.add_trace(
             go.Scatter(
-                x=dates,
-                y=portfolio_values,
+                x=equity.index,
+                y=equity['equity'],
                 name="Portfolio Value",
                 line=dict(color='green')
             ),
@@ -2,6 +2,11 @@ from .backtest import Backtest
 from .results import BacktestResult
 from .strategy import Strategy
 from .tradeTypes import TradeType, Holding, Transaction, Order
+from .transactionLog import TransactionLog
+from .profiling import Profiler, ProfileReport, FoldedStackWriter
+from .fillModels import FillModel, OHLCFillModel
+from .checkpoint import CheckpointStore, Snapshot
+from .resampling import MultiTimeframe, Timeframe, resampleOHLCV, parseInterval
 from .utils import (
     calculateSMA,
     calculateEMA,
@@ -12,10 +17,62 @@ from .utils import (
     calculateSharpeRatio,
     calculateVolatility,
     calculateBeta,
-    calculateReturnStats
+    calculateReturnStats,
+    calculateATR,
+    calculateVWAP,
+    calculateBatchReturnStats,
+    calculateBatchSharpeRatio,
+    calculateBatchVolatility,
+    calculateBatchBeta,
+    calculateBatchVaR,
+    calculateBatchDrawdown,
+    calculateRollingSharpeRatio,
+    calculateRollingVolatility,
+    calculateRollingBeta
+)
+from .data import (
+    DataSource,
+    YFinanceSource,
+    DataFrameSource,
+    CachedSource,
+    MemoryMappedStore,
+    getDefaultDataSource,
+    setDefaultDataSource
 )
 from .commissions import calculate_commission
+from .kernels import setBackend, getBackend
+from .indicatorCache import IndicatorCache, getDefaultIndicatorCache, setDefaultIndicatorCache
+from .indicators import OnlineIndicator, SMA, EMA, RollingStd, BollingerBands, RSI, MACD, ATR, VWAP
 from .orders import cancel_order, submit_gtc_order
+from .optimize import optimize
+from .walkForward import walkForward, walkForwardSplits, WalkForwardResult
+from .monteCarlo import monteCarloReturns, monteCarloTrades, MonteCarloResult
+
+# Optional engines load on first attribute access so "import pyBacktest" stays cheap
+_lazyAttributes = {
+    "PortfolioBacktest": ".portfolio",
+    "PortfolioStrategy": ".portfolio",
+    "PanelData": ".portfolio",
+    "MultiplexBacktest": ".multiplex",
+    "runVectorized": ".vectorized",
+    "compareWithBacktest": ".vectorized",
+    "StreamingBacktest": ".streaming",
+    "FileReplaySource": ".streaming",
+}
+
+
+def __getattr__(name):
+    module = _lazyAttributes.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazyAttributes))
 
 __version__ = "1.1.5"
 __author__ = "Ben Bell"
@@ -24,10 +81,26 @@ __all__ = [
     "Backtest",
     "BacktestResult",
     "Strategy",
+    "PortfolioBacktest",
+    "PortfolioStrategy",
+    "PanelData",
+    "MultiplexBacktest",
     "TradeType",
     "Holding",
     "Transaction",
     "Order",
+    "TransactionLog",
+    "Profiler",
+    "ProfileReport",
+    "FoldedStackWriter",
+    "FillModel",
+    "OHLCFillModel",
+    "CheckpointStore",
+    "Snapshot",
+    "MultiTimeframe",
+    "Timeframe",
+    "resampleOHLCV",
+    "parseInterval",
     "calculateSMA",
     "calculateEMA",
     "calculateRSI",
@@ -38,7 +111,50 @@ __all__ = [
     "calculateVolatility",
     "calculateBeta",
     "calculateReturnStats",
+    "calculateATR",
+    "calculateVWAP",
+    "calculateBatchReturnStats",
+    "calculateBatchSharpeRatio",
+    "calculateBatchVolatility",
+    "calculateBatchBeta",
+    "calculateBatchVaR",
+    "calculateBatchDrawdown",
+    "calculateRollingSharpeRatio",
+    "calculateRollingVolatility",
+    "calculateRollingBeta",
+    "DataSource",
+    "YFinanceSource",
+    "DataFrameSource",
+    "CachedSource",
+    "MemoryMappedStore",
+    "getDefaultDataSource",
+    "setDefaultDataSource",
     "calculate_commission",
+    "setBackend",
+    "getBackend",
+    "runVectorized",
+    "compareWithBacktest",
+    "optimize",
+    "walkForward",
+    "walkForwardSplits",
+    "WalkForwardResult",
+    "monteCarloReturns",
+    "monteCarloTrades",
+    "MonteCarloResult",
+    "IndicatorCache",
+    "getDefaultIndicatorCache",
+    "setDefaultIndicatorCache",
+    "OnlineIndicator",
+    "SMA",
+    "EMA",
+    "RollingStd",
+    "BollingerBands",
+    "RSI",
+    "MACD",
+    "ATR",
+    "VWAP",
+    "StreamingBacktest",
+    "FileReplaySource",
     "cancel_order",
     "submit_gtc_order"
 ]
@@ -1,66 +1,45 @@
-import yfinance as yf
-from yfinance import Ticker
 from typing import *
+import numpy as np
 import pandas as pd
 from pandas import DataFrame
 from datetime import datetime
 from typing import TYPE_CHECKING
 from pyBacktest.trades import execute_buy, execute_sell, execute_market_buy, execute_market_sell, execute_short_sell, execute_short_cover
-from pyBacktest.tradeTypes import TradeType, Holding, Order, InvalidOrderError
+from pyBacktest.tradeTypes import TradeType, Holding, Order, InvalidOrderError, InsufficientLiquidityError
 from pyBacktest.commissions import calculate_commission
 from pyBacktest.orders import cancel_order, submit_gtc_order
+from pyBacktest.orderbook import OrderBook
+from pyBacktest.ledger import PositionLedger
+from pyBacktest.transactionLog import TransactionLog
 from pyBacktest.utils import calculateVaR
-from pyBacktest.results import BacktestResult
+from pyBacktest.results import BacktestResult, EquityRecorder
+from pyBacktest.data import DataSource, getDefaultDataSource, _toTimestamp
+from pyBacktest.bars import BarArrays
+from pyBacktest.lazy import lazyImport
+from pyBacktest.profiling import Profiler
+from pyBacktest.fillModels import FillModel
+from pyBacktest.resampling import MultiTimeframe, parseInterval
+from pyBacktest.checkpoint import CheckpointStore, Snapshot
 from dataclasses import dataclass
 
 if TYPE_CHECKING:
+    from yfinance import Ticker
     from pyBacktest.strategy import Strategy
 
-class Backtest:
-    def __init__(
-        self,
-        ticker: str,
-        cash: float | int,
-        strategy: 'Strategy',
-        commision: float | int = 0.0,
-        commisionType: str = "FLAT",
-        timePeriod: str = "1mo",
-        interval: str = "1d",
-        startDate: datetime = datetime(2024, 1, 1),
-        endDate: datetime = datetime(2024, 2, 1),
-    ) -> None:
+yf = lazyImport("yfinance", "yfinance")
 
-        self.ticker: str = ticker.upper()
-        self.commision: float = commision
-        self.commisionType: float = commisionType
-
-        self.timePeriod: str = timePeriod
-
-        interval_value = int(interval[:-1])
-        interval_unit = interval[-1]
-
-        self.interval = pd.DateOffset(
-            minutes=interval_value if interval_unit == "m" else 0,
-            hours=interval_value if interval_unit == "h" else 0,
-            days=interval_value if interval_unit == "d" else 0,
-            weeks=interval_value if interval_unit == "w" else 0,
-            months=interval_value if interval_unit == "mo" else 0,
-        )
-
-        self.date = pd.Timestamp(startDate).tz_localize("America/New_York")
-        self.endDate = pd.Timestamp(endDate).tz_localize("America/New_York")
 
-        self.data: Ticker = yf.Ticker(self.ticker)
-        self.hist: DataFrame = self.data.history(
-            start=self.date, end=self.endDate, interval=interval
-        )
-        self.transactions: List[Holding] = []
+class TradingAccount:
+    # The trading API a strategy calls through self.backtest. Subclasses provide the ticker, commission settings,
+    # bars, cursor and dates, cash, ledger, order book, fill model and transaction log it works on.
+    @property
+    def data(self) -> 'Ticker':
+        if self._data is None:
+            self._data = yf.Ticker(self.ticker)
+        return self._data
 
-        self.cash: float = cash
-        self.holdings: List[Holding] = []
-        self.pending_orders: List[Order] = []
-        self.strategy = strategy
-        self.strategy.initialize(self)
+    def timeframe(self, interval: str, partial: bool = False) -> DataFrame:
+        return self.timeframes.view(interval).history(self.cursor, partial)
 
     def getValidDate(self, target_date: pd.Timestamp) -> pd.Timestamp:
         if target_date in self.hist.index:
@@ -79,15 +58,23 @@ class Backtest:
     def calculateCommision(self, price: float, numShares: int) -> float:
         return calculate_commission(self.commisionType, self.commision, price, numShares)
 
-    def cancelOrder(self, order_index: int) -> bool:
-        return cancel_order(self, order_index)
+    @property
+    def holdings(self) -> Tuple[Holding, ...]:
+        # A read-only snapshot of the ledger's lots; positions only change through trades
+        return tuple(self.ledger.holdings())
+
+    @property
+    def pending_orders(self) -> List[Order]:
+        return list(self.orderBook)
+
+    def cancelOrder(self, orderId: int) -> bool:
+        return cancel_order(self, orderId)
 
     def submitGTCOrder(self, tradeType: TradeType, numShares: int, targetPrice: float) -> Order:
         return submit_gtc_order(self, tradeType, numShares, targetPrice)
 
     def calculate_trade_cost(self, tradeType: TradeType, numShares: int, price: float = None) -> float:
-        validDate = self.formatDate(self.date)
-        current_price = price if price is not None else self.hist.loc[validDate].Close
+        current_price = price if price is not None else self.bars.close[self.cursor]
 
         if tradeType in [TradeType.BUY, TradeType.MARKET_BUY, TradeType.LIMIT_BUY]:
             commission = self.calculateCommision(current_price, numShares)
@@ -103,80 +90,41 @@ class Backtest:
 
         return total_cost
 
-    def _check_pending_orders(self, current_price: float):
-        for order in self.pending_orders[:]:  # Use slice copy to modify safely
-            if not order.active:
-                self.pending_orders.remove(order)
-                continue
-
-            # Cancel DAY orders that have expired
-            if order.duration == 'DAY' and order.orderDate < self.date:
-                order.active = False
-                self.cancelOrder(self.pending_orders.index(order))
-                continue
-
-            try:
-                executed = False
-                if order.tradeType == TradeType.LIMIT_BUY and current_price <= order.targetPrice:
-                    result = self._execute_buy(order.targetPrice, order.numShares, self.date, TradeType.LIMIT_BUY)
-                    executed = True
-                elif order.tradeType == TradeType.LIMIT_SELL and current_price >= order.targetPrice:
-                    result = self._execute_sell(order.targetPrice, order.numShares, self.date, TradeType.LIMIT_SELL)
-                    executed = True
-
-                if executed:
-                    order.active = False
-                    self.pending_orders.remove(order)
-                    if hasattr(self.strategy, 'on_order_filled'):
-                        self.strategy.on_order_filled(order)
-            except Exception as e:
-                print(f"Order execution error: {e}")
-                order.active = False
-                self.pending_orders.remove(order)
-
-    def next(self):
-        self.date += self.interval
-        valid_date = self.getValidDate(self.date)
-        current_price = self.hist.loc[valid_date].Close
-        self._check_pending_orders(current_price)
-        row = self.hist.loc[valid_date]
-        self.strategy.step(row)  
-        return row
+    def fillCapacity(self) -> float:
+        return self.fillModel.capacity(self.bars.volume[self.cursor]) - self.volumeFilled
 
-    def run(self) -> BacktestResult:
-        while self.date < self.endDate:
-            self.next()
-        return BacktestResult(
-            final_value=self.totalValue(),
-            transactions=self.transactions,
-            strategy=self.strategy
-        )
+    def marketFill(self, sign: int, numShares: int) -> Tuple[float, int]:
+        bars, cursor = self.bars, self.cursor
+        price = float(self.fillModel.marketPrices(sign, bars.open[cursor], bars.high[cursor], bars.low[cursor], bars.close[cursor]))
+        if self.fillModel.participation is not None:
+            numShares = min(numShares, int(max(self.fillCapacity(), 0)))
+            if numShares == 0:
+                raise InsufficientLiquidityError(f"No volume left to fill a market order on {self.barDate}")
+        return price, numShares
 
     def _execute_buy(self, price: float, numShares: int, valid_date: pd.Timestamp, trade_type: TradeType = TradeType.BUY) -> Holding:
         return execute_buy(self, price, numShares, valid_date, trade_type)
 
-    def _execute_sell(self, price: float, numShares: int, valid_date: pd.Timestamp, trade_type: TradeType = TradeType.SELL) -> Holding:
-        return execute_sell(self, price, numShares, valid_date, trade_type)
+    def _execute_sell(self, price: float, numShares: int, valid_date: pd.Timestamp, trade_type: TradeType = TradeType.SELL) -> None:
+        execute_sell(self, price, numShares, valid_date, trade_type)
 
     def _execute_market_buy(self, numShares: int, valid_date: pd.Timestamp) -> Holding:
         return execute_market_buy(self, numShares, valid_date)
 
-    def _execute_market_sell(self, numShares: int, valid_date: pd.Timestamp) -> Holding:
-        return execute_market_sell(self, numShares, valid_date)
+    def _execute_market_sell(self, numShares: int, valid_date: pd.Timestamp) -> None:
+        execute_market_sell(self, numShares, valid_date)
 
     def _execute_short_sell(self, price: float, numShares: int, valid_date: pd.Timestamp) -> Holding:
         holding = execute_short_sell(self, price, numShares, valid_date)
         holding.shortPosition = True
         return holding
 
-    def _execute_short_cover(self, price: float, numShares: int, valid_date: pd.Timestamp) -> Holding:
-        holding = execute_short_cover(self, price, numShares, valid_date)
-        holding.shortPosition = False
-        return holding
+    def _execute_short_cover(self, price: float, numShares: int, valid_date: pd.Timestamp) -> None:
+        execute_short_cover(self, price, numShares, valid_date)
 
     def trade(self, tradeType: TradeType, numShares: int, price: float = None, duration: str = 'DAY') -> Optional[Holding]:
-        validDate = self.formatDate(self.date)
-        current_price = price if price is not None else self.hist.loc[validDate].Close
+        validDate = self.barDate
+        current_price = price if price is not None else self.bars.close[self.cursor]
 
         if tradeType == TradeType.BUY:
             return self._execute_buy(current_price, numShares, validDate)
@@ -201,27 +149,17 @@ class Backtest:
                 duration=duration,
                 orderDate=self.date
             )
-            self.pending_orders.append(order)
+            self.orderBook.add(order)
             return None
         else:
             raise InvalidOrderError(f"Unsupported trade type: {tradeType}")
 
     def totalValue(self) -> float:
-        total_value = self.cash
-        valid_date = self.formatDate(self.date)
-        current_price = self.hist.loc[valid_date].Close
-        for holding in self.holdings:
-            if holding.shortPosition:
-                # Subtract the liability to buy back the shares
-                total_value -= current_price * holding.numShares
-            else:
-                # Add the value of long positions
-                total_value += current_price * holding.numShares
-        return total_value
+        # Short liabilities are netted out through the signed position
+        return self.cash + self.ledger.netPosition * self.bars.close[self.cursor]
 
     def getPosition(self) -> int:
-        position = sum(h.numShares if not h.shortPosition else -h.numShares for h in self.holdings)
-        return position
+        return self.ledger.netPosition
 
     def calculatePositionSize(self, risk_per_trade: float, stop_loss: float) -> int:
         risk_amount = self.cash * risk_per_trade
@@ -229,38 +167,243 @@ class Backtest:
         return int(position_size)
 
     def applyStopLoss(self, stop_loss: float):
-        valid_date = self.getValidDate(self.date)
-        for holding in self.holdings[:]:
+        valid_date = self.barDate
+        current_price = self.bars.close[self.cursor]
+        for holding in self.holdings:
             if holding.shortPosition:
-                if holding.entryPrice * (1 + stop_loss) <= self.hist.loc[valid_date].Close:
-                    self._execute_short_cover(self.hist.loc[valid_date].Close, holding.numShares, valid_date)
+                if holding.entryPrice * (1 + stop_loss) <= current_price:
+                    self._execute_short_cover(current_price, holding.numShares, valid_date)
             else:
-                if holding.entryPrice * (1 - stop_loss) >= self.hist.loc[valid_date].Close:
-                    self._execute_sell(self.hist.loc[valid_date].Close, holding.numShares, valid_date)
+                if holding.entryPrice * (1 - stop_loss) >= current_price:
+                    self._execute_sell(current_price, holding.numShares, valid_date)
 
     def applyTakeProfit(self, take_profit: float):
-        valid_date = self.getValidDate(self.date)
-        for holding in self.holdings[:]:
+        valid_date = self.barDate
+        current_price = self.bars.close[self.cursor]
+        for holding in self.holdings:
             if holding.shortPosition:
-                if holding.entryPrice * (1 - take_profit) >= self.hist.loc[valid_date].Close:
-                    self._execute_short_cover(self.hist.loc[valid_date].Close, holding.numShares, valid_date)
+                if holding.entryPrice * (1 - take_profit) >= current_price:
+                    self._execute_short_cover(current_price, holding.numShares, valid_date)
             else:
-                if holding.entryPrice * (1 + take_profit) <= self.hist.loc[valid_date].Close:
-                    self._execute_sell(self.hist.loc[valid_date].Close, holding.numShares, valid_date)
+                if holding.entryPrice * (1 + take_profit) <= current_price:
+                    self._execute_sell(current_price, holding.numShares, valid_date)
 
     def calculateVaR(self, confidence_level: float = 0.95) -> float:
         returns = self.hist['Close'].pct_change().dropna()
         return calculateVaR(returns, confidence_level)
 
     def rebalancePortfolio(self, target_allocations: Dict[str, float]):
-        valid_date = self.getValidDate(self.date)
+        valid_date = self.barDate
+        current_price = self.bars.close[self.cursor]
         total_value = self.totalValue()
         for ticker, target_allocation in target_allocations.items():
             target_value = total_value * target_allocation
             current_value = sum(h.totalCost for h in self.holdings if h.ticker == ticker)
             if current_value < target_value:
-                num_shares_to_buy = (target_value - current_value) / self.hist.loc[valid_date].Close
-                self._execute_buy(self.hist.loc[valid_date].Close, int(num_shares_to_buy), valid_date)
+                num_shares_to_buy = (target_value - current_value) / current_price
+                self._execute_buy(current_price, int(num_shares_to_buy), valid_date)
             elif current_value > target_value:
-                num_shares_to_sell = (current_value - target_value) / self.hist.loc[valid_date].Close
-                self._execute_sell(self.hist.loc[valid_date].Close, int(num_shares_to_sell), valid_date)
+                num_shares_to_sell = (current_value - target_value) / current_price
+                self._execute_sell(current_price, int(num_shares_to_sell), valid_date)
+
+
+class Backtest(TradingAccount):
+    def __init__(
+        self,
+        ticker: str,
+        cash: float | int,
+        strategy: 'Strategy',
+        commision: float | int = 0.0,
+        commisionType: str = "FLAT",
+        timePeriod: str = "1mo",
+        interval: str = "1d",
+        startDate: datetime = datetime(2024, 1, 1),
+        endDate: datetime = datetime(2024, 2, 1),
+        dataSource: Optional[DataSource] = None,
+        engine: str = "pandas",
+        lotMatching: str = "FIFO",
+        transactionLog: Optional[TransactionLog] = None,
+        profile: Union[bool, Profiler] = False,
+        fillModel: Optional[FillModel] = None,
+        checkpointPath: Optional[str] = None,
+        checkpointEvery: Optional[int] = None,
+    ) -> None:
+        if engine not in ("array", "pandas"):
+            raise ValueError(f"Invalid engine: {engine}, accepted engines are array and pandas")
+
+        self.ticker: str = ticker.upper()
+        self.commision: float = commision
+        self.commisionType: float = commisionType
+
+        self.timePeriod: str = timePeriod
+
+        self.interval = parseInterval(interval)
+
+        self.date = _toTimestamp(startDate).tz_convert("America/New_York")
+        self.endDate = _toTimestamp(endDate).tz_convert("America/New_York")
+
+        self.dataSource: DataSource = dataSource if dataSource is not None else getDefaultDataSource()
+        self._data: Optional['Ticker'] = None
+        self.hist: DataFrame = self.dataSource.history(
+            self.ticker, self.date, self.endDate, interval
+        )
+        self.engine: str = engine
+        self._timeframes: Optional[MultiTimeframe] = None
+        self.bars: BarArrays = BarArrays.fromFrame(self.hist)
+        self.cursor: int = 0
+        if len(self.hist):
+            self.cursor = int(self.hist.index.get_indexer([self.date], method="nearest")[0])
+        self.barDate: Optional[pd.Timestamp] = self.bars.index[self.cursor] if len(self.hist) else None
+        self.transactions: TransactionLog = transactionLog if transactionLog is not None else TransactionLog()
+
+        self.cash: float = cash
+        self.ledger: PositionLedger = PositionLedger(lotMatching)
+        self.orderBook: OrderBook = OrderBook()
+        self.fillModel: FillModel = fillModel if fillModel is not None else FillModel()
+        self.volumeFilled: float = 0.0
+        self.recorder: EquityRecorder = EquityRecorder(self.bars.index)
+        if len(self.bars):
+            self._record()
+        self.checkpoints: Optional[CheckpointStore] = CheckpointStore(checkpointPath) if checkpointPath is not None else None
+        self.checkpointEvery: Optional[int] = checkpointEvery
+        if checkpointEvery is not None and self.checkpoints is None:
+            raise ValueError("checkpointEvery needs a checkpointPath")
+        self.strategy = strategy
+        self.strategy.initialize(self)
+        self.profiler: Optional[Profiler] = Profiler() if profile is True else (profile or None)
+        if self.profiler is not None:
+            self.profiler.attach(self)
+        if self.strategy.indicators and len(self.hist):
+            # The starting bar is never stepped but online indicators still need to see it
+            self.strategy.updateIndicators(self.hist.iloc[self.cursor])
+
+    @property
+    def timeframes(self) -> MultiTimeframe:
+        # Coarser views are derived from the loaded history on first use, never fetched again
+        if self._timeframes is None:
+            self._timeframes = MultiTimeframe(self.hist)
+        return self._timeframes
+
+    def _check_pending_orders(self):
+        # Cancel DAY orders that have expired
+        for order in self.orderBook.expired(self.date):
+            self.cancelOrder(order.orderId)
+
+        self.volumeFilled = 0.0
+        bars, cursor = self.bars, self.cursor
+        bar = (bars.open[cursor], bars.high[cursor], bars.low[cursor], bars.close[cursor])
+        triggered = self.orderBook.match(*self.fillModel.triggerRange(*bar))
+        if not triggered:
+            return
+
+        sign = np.array([1 if order.tradeType == TradeType.LIMIT_BUY else -1 for order in triggered])
+        prices = self.fillModel.limitPrices(sign, np.array([order.targetPrice for order in triggered]), *bar)
+        shares = self.fillModel.allocate(np.array([order.numShares for order in triggered]), self.fillCapacity())
+        for order, price, numShares in zip(triggered, prices.tolist(), shares.tolist()):
+            if numShares == 0:
+                # Out of volume for this bar, the order keeps resting
+                self.orderBook.requeue(order)
+                continue
+            try:
+                if order.tradeType == TradeType.LIMIT_BUY:
+                    self._execute_buy(price, numShares, self.date, TradeType.LIMIT_BUY)
+                else:
+                    self._execute_sell(price, numShares, self.date, TradeType.LIMIT_SELL)
+                self.volumeFilled += numShares
+                if numShares < order.numShares:
+                    order.numShares -= numShares
+                    self.orderBook.requeue(order)
+                    continue
+                order.active = False
+                if hasattr(self.strategy, 'on_order_filled'):
+                    self.strategy.on_order_filled(order)
+            except Exception as e:
+                print(f"Order execution error: {e}")
+                order.active = False
+
+    def next(self):
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.start("bar")
+        previous = self.cursor
+        try:
+            if self.engine == "array":
+                self.cursor += 1
+                self.barDate = self.bars.index[self.cursor]
+                self.date = self.barDate
+            else:
+                self.date += self.interval
+                self.barDate = self.getValidDate(self.date)
+                self.cursor = self.bars.index.get_loc(self.barDate)
+            self._check_pending_orders()
+            row = self.hist.iloc[self.cursor]
+            # The pandas engine lands on the same bar again over weekends and holidays, which indicators must see once
+            if self.strategy.indicators and self.cursor > previous:
+                self.strategy.updateIndicators(row)
+            self.strategy.step(row)
+            self._record()
+        finally:
+            if profiler is not None:
+                profiler.stop()
+        if profiler is not None:
+            profiler.endBar(self.cursor, self.barDate, self.cursor > previous)
+        return row
+
+    def warmUp(self, numBars: int) -> None:
+        # Moves the start forward without stepping or recording, so the skipped bars only serve as look-back
+        target = min(self.cursor + numBars, len(self.bars) - 1)
+        if self.strategy.indicators:
+            for cursor in range(self.cursor + 1, target + 1):
+                self.strategy.updateIndicators(self.hist.iloc[cursor])
+        self.cursor = target
+        self.barDate = self.bars.index[target]
+        self.date = self.barDate
+        self.recorder.recorded[:] = False
+        self._record()
+
+    def _record(self) -> None:
+        self.recorder.record(self.cursor, self.cash, self.getPosition(), self.bars.close[self.cursor])
+
+    def run(self) -> BacktestResult:
+        if self.profiler is not None:
+            self.profiler.runStarted()
+        every = self.checkpointEvery
+        try:
+            if self.engine == "array":
+                lastBar = len(self.bars) - 1
+                while self.cursor < lastBar:
+                    self.next()
+                    if every is not None and self.cursor % every == 0:
+                        self.checkpoint()
+            else:
+                while self.date < self.endDate:
+                    self.next()
+                    if every is not None and self.cursor % every == 0:
+                        self.checkpoint()
+        finally:
+            if self.profiler is not None:
+                self.profiler.runFinished()
+        return BacktestResult(
+            final_value=self.totalValue(),
+            transactions=self.transactions,
+            strategy=self.strategy,
+            equity=self.recorder.frame(),
+            profile=self.profiler.report() if self.profiler is not None else None
+        )
+
+    def checkpoint(self, path: Optional[str] = None) -> Snapshot:
+        # Appends a snapshot at the current bar; only rows added since the last one are written
+        if path is not None and (self.checkpoints is None or self.checkpoints.root != path):
+            self.checkpoints = CheckpointStore(path)
+        if self.checkpoints is None:
+            raise ValueError("No checkpoint path given")
+        return self.checkpoints.save(self)
+
+    def restore(self, path: Optional[str] = None, cursor: Optional[int] = None, strategyState: bool = True) -> Snapshot:
+        # Resumes from the latest snapshot at or before cursor; run() then continues from the bar after it.
+        # strategyState=False keeps the strategy as constructed, to branch with different parameters.
+        if path is not None and (self.checkpoints is None or self.checkpoints.root != path):
+            self.checkpoints = CheckpointStore(path)
+        if self.checkpoints is None:
+            raise ValueError("No checkpoint path given")
+        return self.checkpoints.restore(self, cursor, strategyState)
@@ -0,0 +1,48 @@
+from typing import Optional
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+
+class BarArrays:
+    FIELDS = ("Open", "High", "Low", "Close", "Volume")
+
+    def __init__(
+        self,
+        index: pd.DatetimeIndex,
+        open: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        volume: np.ndarray,
+    ) -> None:
+        self.index = index
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+
+    @classmethod
+    def fromFrame(cls, hist: DataFrame) -> 'BarArrays':
+        def column(name: str, fallback: Optional[np.ndarray] = None) -> np.ndarray:
+            if name in hist.columns:
+                return np.ascontiguousarray(hist[name].to_numpy(dtype=np.float64))
+            return fallback
+        close = column("Close")
+        if close is None:
+            close = np.zeros(len(hist), dtype=np.float64)
+        return cls(
+            index=hist.index,
+            open=column("Open", close),
+            high=column("High", close),
+            low=column("Low", close),
+            close=close,
+            volume=column("Volume", np.zeros(len(hist), dtype=np.float64)),
+        )
+
+    def field(self, name: str) -> np.ndarray:
+        return getattr(self, name.lower())
+
+    def __len__(self) -> int:
+        return len(self.close)
@@ -0,0 +1,58 @@
+import argparse
+import time
+import pandas as pd
+from pyBacktest.backtest import Backtest
+from pyBacktest.strategy import Strategy
+from pyBacktest.data import DataFrameSource
+from pyBacktest.tradeTypes import TradeType
+from pyBacktest.utils import calculateSMA
+from pyBacktest.benchmarks.synthetic import generateOHLCV
+
+
+class SMACross(Strategy):
+    def setup(self) -> None:
+        self.sma20 = calculateSMA(self.data['Close'], 20)
+        self.sma50 = calculateSMA(self.data['Close'], 50)
+
+    def step(self, row: pd.Series) -> None:
+        fast = self.sma20[row.name]
+        slow = self.sma50[row.name]
+        position = self.backtest.getPosition()
+        if position == 0 and fast > slow:
+            self.backtest.trade(TradeType.BUY, int(self.backtest.cash * 0.95 / row['Close']))
+        elif position > 0 and fast < slow:
+            self.backtest.trade(TradeType.SELL, position)
+
+
+class Hold(Strategy):
+    def step(self, row: pd.Series) -> None:
+        pass
+
+
+def benchEngine(engine: str, hist: pd.DataFrame, strategy: Strategy) -> float:
+    backtest = Backtest(
+        ticker="SYN",
+        cash=10000,
+        strategy=strategy,
+        commision=1.0,
+        startDate=hist.index[0].tz_localize(None).to_pydatetime(),
+        endDate=hist.index[-1].tz_localize(None).to_pydatetime(),
+        dataSource=DataFrameSource(hist),
+        engine=engine,
+    )
+    start = time.perf_counter()
+    backtest.run()
+    elapsed = time.perf_counter() - start
+    return len(backtest.bars) / elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bars per second of the pandas and array engines")
+    parser.add_argument("--bars", type=int, default=20_000)
+    args = parser.parse_args()
+
+    hist = generateOHLCV(args.bars, freq="D")
+    for strategyClass in (Hold, SMACross):
+        for engine in ("pandas", "array"):
+            barsPerSecond = benchEngine(engine, hist, strategyClass())
+            print(f"{strategyClass.__name__:<10} {engine:<8} {barsPerSecond:>12,.0f} bars/s")
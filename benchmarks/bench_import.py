@@ -0,0 +1,64 @@
+import argparse
+import statistics
+import subprocess
+import sys
+from typing import List, Tuple
+
+# Modules that must stay out of a plain "import pyBacktest"; each belongs to an optional extra or engine
+LAZY_MODULES = (
+    "yfinance",
+    "customtkinter",
+    "plotly",
+    "numba",
+    "pyBacktest.portfolio",
+    "pyBacktest.streaming",
+    "pyBacktest.vectorized",
+    "concurrent.futures.process",
+    "multiprocessing.shared_memory",
+)
+
+_PROBE = """
+import sys, time
+start = time.perf_counter()
+import pyBacktest
+elapsed = time.perf_counter() - start
+print(elapsed)
+print(",".join(name for name in {modules!r} if name in sys.modules))
+"""
+
+
+def measureImport() -> Tuple[float, List[str]]:
+    probe = _PROBE.format(modules=LAZY_MODULES)
+    output = subprocess.run([sys.executable, "-c", probe], check=True, capture_output=True, text=True).stdout.split("\n")
+    return float(output[0]), [name for name in output[1].split(",") if name]
+
+
+def baselineImport() -> float:
+    # pandas and numpy are hard dependencies, so their own import time is the floor
+    probe = "import time; start = time.perf_counter(); import pandas, numpy; print(time.perf_counter() - start)"
+    return float(subprocess.run([sys.executable, "-c", probe], check=True, capture_output=True, text=True).stdout)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cold import time of pyBacktest, failing if optional dependencies load eagerly")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-overhead-ms", type=float, default=None, help="fail when import pyBacktest costs this much more than pandas + numpy")
+    args = parser.parse_args()
+
+    timings = []
+    loaded: List[str] = []
+    for _ in range(args.runs):
+        elapsed, loaded = measureImport()
+        timings.append(elapsed)
+    floor = statistics.median(baselineImport() for _ in range(args.runs))
+    median = statistics.median(timings)
+    overhead = (median - floor) * 1000
+
+    print(f"import pyBacktest    {median * 1000:8.1f} ms (median of {args.runs})")
+    print(f"import pandas, numpy {floor * 1000:8.1f} ms")
+    print(f"pyBacktest overhead  {overhead:8.1f} ms")
+    if loaded:
+        print(f"eagerly imported: {', '.join(loaded)}")
+
+    failed = bool(loaded) or (args.max_overhead_ms is not None and overhead > args.max_overhead_ms)
+    sys.exit(1 if failed else 0)
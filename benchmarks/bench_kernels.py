@@ -0,0 +1,66 @@
+import argparse
+import time
+from typing import Callable, Dict, List
+import numpy as np
+import pandas as pd
+from pyBacktest import kernels
+from pyBacktest.utils import (
+    calculateSMA,
+    calculateEMA,
+    calculateRSI,
+    calculateBollingerBands,
+    calculateMACD,
+    calculateDrawdown,
+    calculateSharpeRatio,
+    calculateSortinoRatio,
+)
+
+
+def kernelCases(close: pd.Series, returns: pd.Series) -> Dict[str, Callable[[], object]]:
+    return {
+        "calculateSMA(20)": lambda: calculateSMA(close, 20),
+        "calculateEMA(20)": lambda: calculateEMA(close, 20),
+        "calculateRSI(14)": lambda: calculateRSI(close, 14),
+        "calculateRSI(14, wilder)": lambda: calculateRSI(close, 14, "wilder"),
+        "calculateBollingerBands(20)": lambda: calculateBollingerBands(close, 20),
+        "calculateMACD": lambda: calculateMACD(close),
+        "calculateDrawdown": lambda: calculateDrawdown(close),
+        "calculateSharpeRatio": lambda: calculateSharpeRatio(returns),
+        "calculateSortinoRatio": lambda: calculateSortinoRatio(returns),
+    }
+
+
+def benchKernels(rows: int, backends: List[str], repeat: int = 3) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    returns = pd.Series(rng.normal(0.0, 0.01, rows))
+    close = 100.0 * np.exp(returns.cumsum())
+    previous = kernels.getBackend()
+    timings = {}
+    try:
+        for backend in backends:
+            kernels.setBackend(backend)
+            for name, case in kernelCases(close, returns).items():
+                # First call pays numba compilation, so it is not timed
+                case()
+                best = np.inf
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    case()
+                    best = min(best, time.perf_counter() - start)
+                timings.setdefault(name, {})[backend] = best
+    finally:
+        kernels.setBackend(previous)
+    return pd.DataFrame(timings).T[backends]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Seconds per call of utils indicator and risk functions on each kernel backend")
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    backends = ["pandas", "numpy"] + (["numba"] if kernels.HAS_NUMBA else [])
+    table = benchKernels(args.rows, backends, args.repeat)
+    for backend in backends[1:]:
+        table[f"{backend} speedup"] = table["pandas"] / table[backend]
+    print(table.to_string(float_format=lambda v: f"{v:.4f}"))
@@ -0,0 +1,73 @@
+import argparse
+import gc
+import tracemalloc
+from dataclasses import fields, make_dataclass
+from datetime import datetime
+from typing import Callable, Dict
+from pyBacktest.tradeTypes import TradeType, Holding, Order, Transaction
+from pyBacktest.benchmarks.suite import Idle, makeBacktest
+from pyBacktest.benchmarks.synthetic import generateDailyOHLCV
+
+MILLION = 1_000_000
+
+
+def unslotted(record: type) -> type:
+    # The same fields as a plain dataclass with a per-instance __dict__, for comparison
+    return make_dataclass(f"Plain{record.__name__}", [(f.name, f.type, f) for f in fields(record)])
+
+
+def sampleArgs(record: type) -> Callable[[int], dict]:
+    date = datetime(2024, 1, 2)
+    return {
+        "Holding": lambda i: dict(tradeType=TradeType.BUY, ticker="SYN", commission=1.0, executedSuccessfully=True, numShares=i, totalCost=i * 100.0, entryPrice=100.0),
+        "Order": lambda i: dict(tradeType=TradeType.LIMIT_BUY, ticker="SYN", numShares=i, targetPrice=99.5, duration="GTC", orderDate=date),
+        "Transaction": lambda i: dict(tradeType=TradeType.SELL, ticker="SYN", commission=1.0, executedSuccessfully=True, numShares=i, pricePerShare=100.0, totalCost=i * 100.0, date=date),
+    }[record.__name__]
+
+
+def bytesPerRecord(record: type, args: Callable[[int], dict], count: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    # Field values are built first so only the records themselves are measured
+    values = [args(i) for i in range(count)]
+    baseline = tracemalloc.get_traced_memory()[0]
+    records = [record(**value) for value in values]
+    used = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    del records, values
+    return used / count
+
+
+def fillMemory(numFills: int) -> Dict[str, float]:
+    # Round trips of one-share buys and sells through Backtest.trade; retained bytes are the lots, log rows and
+    # anything else a fill leaves behind, peak bytes include the temporaries created along the way
+    backtest = makeBacktest(generateDailyOHLCV(10), Idle(), cash=1e12)
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    for i in range(numFills // 2):
+        backtest.trade(TradeType.BUY, 1)
+        backtest.trade(TradeType.SELL, 1)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    fills = 2 * (numFills // 2)
+    return {"retained": (current - start) / fills, "peak": (peak - start) / fills, "fills": fills, "logged": len(backtest.transactions)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Memory per million fills and per record for Holding, Order and Transaction")
+    parser.add_argument("--fills", type=int, default=200_000, help="fills run through the engine, scaled to a million")
+    parser.add_argument("--records", type=int, default=100_000, help="records built per type")
+    args = parser.parse_args()
+
+    print(f"{'record':<12} {'slotted B':>10} {'plain B':>10} {'MB/1M slotted':>14} {'MB/1M plain':>12}")
+    for record in (Holding, Order, Transaction):
+        makeArgs = sampleArgs(record)
+        slotted = bytesPerRecord(record, makeArgs, args.records)
+        plain = bytesPerRecord(unslotted(record), makeArgs, args.records)
+        print(f"{record.__name__:<12} {slotted:>10.1f} {plain:>10.1f} {slotted * MILLION / 2**20:>14.1f} {plain * MILLION / 2**20:>12.1f}")
+
+    result = fillMemory(args.fills)
+    print(f"engine fills {result['fills']:,}, {result['logged']:,} logged")
+    print(f"retained per 1M fills {result['retained'] * MILLION / 2**20:8.1f} MB ({result['retained']:.1f} B/fill)")
+    print(f"peak per 1M fills     {result['peak'] * MILLION / 2**20:8.1f} MB ({result['peak']:.1f} B/fill)")
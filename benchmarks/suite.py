@@ -0,0 +1,256 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+from pyBacktest import kernels
+from pyBacktest.backtest import Backtest
+from pyBacktest.multiplex import MultiplexBacktest
+from pyBacktest.strategy import Strategy
+from pyBacktest.data import DataFrameSource
+from pyBacktest.tradeTypes import TradeType
+from pyBacktest.vectorized import runVectorized
+from pyBacktest.utils import (
+    calculateSMA,
+    calculateEMA,
+    calculateRSI,
+    calculateBollingerBands,
+    calculateMACD,
+    calculateDrawdown,
+    calculateReturnStats,
+    calculateBatchReturnStats,
+)
+from pyBacktest.benchmarks.synthetic import generateDailyOHLCV, generateMinuteOHLCV
+
+
+class ReadmeSMACross(Strategy):
+    # The SMACross example from the README, kept as written
+    def setup(self) -> None:
+        self.has_position = False
+        self.entry_price = 0
+        self.sma20 = calculateSMA(self.data['Close'], 20)
+        self.sma50 = calculateSMA(self.data['Close'], 50)
+
+    def step(self, row: pd.Series) -> None:
+        if row.name not in self.sma20.index or row.name not in self.sma50.index:
+            return
+
+        if self.backtest.cash>row['Close'] and self.sma20[row.name] > self.sma50[row.name]:
+            self.has_position = True
+            self.entry_price = row['Close']
+            self.backtest.trade(TradeType.BUY, int(self.backtest.cash*0.95/row["Close"]), row['Close'], "DAY")
+        elif self.has_position and self.sma20[row.name] < self.sma50[row.name]:
+            self.has_position = False
+            self.backtest.trade(TradeType.SELL, self.current_position, row['Close'], row.name)
+
+
+class LimitGrid(Strategy):
+    def __init__(self, levels: int = 20) -> None:
+        super().__init__()
+        self.levels = levels
+
+    def setup(self) -> None:
+        self.bar = 0
+
+    def step(self, row: pd.Series) -> None:
+        self.bar += 1
+        price = row['Close']
+        if self.bar == 1:
+            # Inventory larger than every sell level the run can place, so no sell is ever rejected
+            self.backtest.trade(TradeType.BUY, 1_000_000)
+        if self.bar % 3 == 0:
+            for k in range(1, self.levels):
+                self.backtest.submitGTCOrder(TradeType.LIMIT_BUY, 1, round(price * (1 - 0.002 * k), 2))
+                self.backtest.submitGTCOrder(TradeType.LIMIT_SELL, 1, round(price * (1 + 0.002 * k), 2))
+        if self.bar % 50 == 0:
+            self.backtest.trade(TradeType.LIMIT_BUY, 1, price * 0.5, 'DAY')
+
+
+class Idle(Strategy):
+    def step(self, row: pd.Series) -> None:
+        pass
+
+
+def makeBacktest(hist: DataFrame, strategy: Strategy, cash: float = 10_000) -> Backtest:
+    return Backtest(
+        ticker="SYN",
+        cash=cash,
+        strategy=strategy,
+        commision=1.0,
+        startDate=hist.index[0].tz_localize(None).to_pydatetime(),
+        endDate=hist.index[-1].tz_localize(None).to_pydatetime(),
+        dataSource=DataFrameSource(hist),
+        engine="array",
+    )
+
+
+def timed(func: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def benchReadmeSMACross(size: int) -> Dict[str, float]:
+    backtest = makeBacktest(generateDailyOHLCV(size), ReadmeSMACross())
+    return {"seconds": timed(backtest.run), "items": len(backtest.bars), "unit": "bars"}
+
+
+def benchMultiplex(size: int) -> Dict[str, float]:
+    # Ten copies of the README strategy sharing one pass over the bars
+    hist = generateDailyOHLCV(size)
+    multiplex = MultiplexBacktest(
+        ticker="SYN",
+        cash=10_000,
+        strategies=[ReadmeSMACross() for _ in range(10)],
+        commision=1.0,
+        startDate=hist.index[0].tz_localize(None).to_pydatetime(),
+        endDate=hist.index[-1].tz_localize(None).to_pydatetime(),
+        dataSource=DataFrameSource(hist),
+    )
+    return {"seconds": timed(multiplex.run), "items": len(multiplex.bars) * 10, "unit": "strategy-bars"}
+
+
+def benchLimitOrders(size: int) -> Dict[str, float]:
+    backtest = makeBacktest(generateDailyOHLCV(size), LimitGrid(), cash=1e12)
+    seconds = timed(backtest.run)
+    return {"seconds": seconds, "items": len(backtest.bars), "unit": "bars", "transactions": len(backtest.transactions)}
+
+
+def benchManyLotSell(size: int) -> Dict[str, float]:
+    # Scale in one share per lot, then close every lot in a single sell
+    backtest = makeBacktest(generateDailyOHLCV(100), Idle(), cash=1e12)
+    for _ in range(size):
+        backtest.trade(TradeType.BUY, 1)
+    seconds = timed(lambda: backtest.trade(TradeType.SELL, size))
+    return {"seconds": seconds, "items": size, "unit": "lots"}
+
+
+def benchVectorized(size: int) -> Dict[str, float]:
+    hist = generateMinuteOHLCV(size)
+    fast = calculateSMA(hist['Close'], 20)
+    slow = calculateSMA(hist['Close'], 50)
+    seconds = timed(lambda: runVectorized(hist, 10_000, entries=fast > slow, exits=fast < slow, commision=1.0))
+    return {"seconds": seconds, "items": size, "unit": "bars"}
+
+
+def indicatorBench(backend: str) -> Callable[[int], Dict[str, float]]:
+    def bench(size: int) -> Dict[str, float]:
+        close = generateMinuteOHLCV(size)['Close']
+        previous = kernels.getBackend()
+        kernels.setBackend(backend)
+        try:
+            seconds = timed(lambda: (
+                calculateSMA(close, 20),
+                calculateEMA(close, 20),
+                calculateRSI(close, 14),
+                calculateBollingerBands(close, 20),
+                calculateMACD(close),
+            ))
+        finally:
+            kernels.setBackend(previous)
+        return {"seconds": seconds, "items": size, "unit": "rows"}
+    return bench
+
+
+def benchMetrics(size: int) -> Dict[str, float]:
+    close = generateMinuteOHLCV(size)['Close']
+    returns = close.pct_change().dropna()
+    seconds = timed(lambda: (calculateReturnStats(returns, close), calculateDrawdown(close)))
+    return {"seconds": seconds, "items": size, "unit": "rows"}
+
+
+def benchBatchMetrics(size: int) -> Dict[str, float]:
+    # The same number of cells spread over 100 runs
+    rng = np.random.default_rng(0)
+    returns = rng.normal(0.0, 0.01, (max(size // 100, 2), 100))
+    seconds = timed(lambda: calculateBatchReturnStats(returns))
+    return {"seconds": seconds, "items": returns.size, "unit": "cells"}
+
+
+ENGINE_CASES: Dict[str, Callable[[int], Dict[str, float]]] = {
+    "engine.readme_smacross": benchReadmeSMACross,
+    "engine.limit_orders": benchLimitOrders,
+    "engine.multiplex_x10": benchMultiplex,
+    "trades.many_lot_sell": benchManyLotSell,
+}
+ARRAY_CASES: Dict[str, Callable[[int], Dict[str, float]]] = {
+    "vectorized.sma_signals": benchVectorized,
+    "utils.indicators.pandas": indicatorBench("pandas"),
+    "utils.indicators.numpy": indicatorBench("numpy"),
+    "utils.metrics": benchMetrics,
+    "utils.batch_metrics": benchBatchMetrics,
+}
+if kernels.HAS_NUMBA:
+    ARRAY_CASES["utils.indicators.numba"] = indicatorBench("numba")
+
+
+def gitCommit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            check=True, capture_output=True, text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def runSuite(sizes: List[int], maxEngineBars: int, pattern: Optional[str] = None) -> dict:
+    results = []
+    cases = [(name, bench, True) for name, bench in ENGINE_CASES.items()]
+    cases += [(name, bench, False) for name, bench in ARRAY_CASES.items()]
+    for name, bench, isEngine in cases:
+        if pattern is not None and pattern not in name:
+            continue
+        for size in sizes:
+            if isEngine and size > maxEngineBars:
+                continue
+            result = bench(size)
+            result.update(name=name, size=size, rate=result["items"] / result["seconds"] if result["seconds"] else None)
+            results.append(result)
+            print(f"{name:<28} {size:>10,} {result['seconds']:>10.4f}s {result['rate']:>16,.0f} {result['unit']}/s")
+    return {
+        "meta": {
+            "commit": gitCommit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "numba": kernels.HAS_NUMBA,
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "results": results,
+    }
+
+
+def compareResults(current: dict, baseline: dict) -> DataFrame:
+    # Ratio above 1 means the current run is faster than the baseline
+    def frame(report: dict) -> pd.Series:
+        return pd.Series({(r["name"], r["size"]): r["seconds"] for r in report["results"]})
+    now, before = frame(current), frame(baseline)
+    shared = now.index.intersection(before.index)
+    return DataFrame({"baseline_s": before[shared], "current_s": now[shared], "speedup": before[shared] / now[shared]})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="pyBacktest benchmark suite on seeded synthetic data")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="comma separated bar counts, up to 10_000_000")
+    parser.add_argument("--max-engine-bars", type=int, default=100_000, help="largest size run through the event-driven engine")
+    parser.add_argument("--filter", default=None, help="only run cases whose name contains this text")
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument("--compare", default=None, help="earlier results file to compare against")
+    args = parser.parse_args()
+
+    report = runSuite([int(size) for size in args.sizes.split(",")], args.max_engine_bars, args.filter)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"results written to {args.output}")
+    if args.compare is not None:
+        with open(args.compare) as f:
+            print(compareResults(report, json.load(f)).to_string(float_format=lambda v: f"{v:.4f}"))
@@ -0,0 +1,29 @@
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+
+def generateOHLCV(numBars: int, freq: str = "B", start: str = "2000-01-03", seed: int = 0, volatility: float = 0.01) -> DataFrame:
+    rng = np.random.default_rng(seed)
+    index = pd.date_range(start, periods=numBars, freq=freq, tz="America/New_York")
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, volatility, numBars)))
+    open_ = np.empty(numBars)
+    open_[0] = close[0]
+    open_[1:] = close[:-1] * (1.0 + rng.normal(0.0, 0.002, numBars - 1))
+    spread = np.abs(rng.normal(0.0, 0.005, numBars)) * close
+    high = np.maximum(open_, close) + spread
+    low = np.minimum(open_, close) - spread
+    volume = rng.integers(100_000, 10_000_000, numBars).astype(np.float64)
+    return DataFrame(
+        {"Open": open_, "High": high, "Low": low, "Close": close, "Volume": volume},
+        index=index,
+    )
+
+
+def generateDailyOHLCV(numBars: int, seed: int = 0) -> DataFrame:
+    # Calendar days, so long series stay inside the datetime64[ns] range
+    return generateOHLCV(numBars, freq="D", start="1970-01-01" if numBars > 10_000 else "2000-01-03", seed=seed)
+
+
+def generateMinuteOHLCV(numBars: int, seed: int = 0) -> DataFrame:
+    return generateOHLCV(numBars, freq="min", start="2000-01-03 09:30", seed=seed, volatility=0.0005)
@@ -0,0 +1,182 @@
+import os
+import pickle
+import struct
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+import numpy as np
+import pandas as pd
+from pyBacktest.transactionLog import COLUMNS
+from pyBacktest.profiling import STRATEGY_PHASES
+
+if TYPE_CHECKING:
+    from pyBacktest.backtest import Backtest
+
+# Fixed little-endian row layouts, so a checkpoint reads back the same on any machine
+TRANSACTION_DTYPE = np.dtype([(name, np.dtype(dtype).newbyteorder("<")) for name, dtype in COLUMNS.items()])
+EQUITY_DTYPE = np.dtype([("cursor", "<i8"), ("cash", "<f8"), ("position", "<i8"), ("equity", "<f8")])
+
+# magic, cursor, bar date (ns), transaction rows, equity rows, payload bytes
+_HEADER = struct.Struct("<8sqqqqq")
+_MAGIC = b"PBCKPT01"
+
+
+def _strategyState(strategy: Any) -> Dict[str, Any]:
+    # The engine reference and any profiler timers wrapped onto the instance belong to the running backtest
+    return {
+        name: value for name, value in strategy.__dict__.items()
+        if name != "backtest" and not (name in STRATEGY_PHASES and hasattr(value, "__wrapped__"))
+    }
+
+
+@dataclass
+class Snapshot:
+    cursor: int
+    date: pd.Timestamp
+    transactions: int
+    equityRows: int
+    offset: int
+    end: int
+
+
+class CheckpointStore:
+    # A directory of append-only files: transaction rows, equity rows and a log of snapshots. Each snapshot
+    # pickles the small engine state and records how many rows of the other two files belong to it, so a save
+    # only writes what happened since the previous one and a restore reads just the prefix it needs.
+    def __init__(self, root: str) -> None:
+        self.root = root
+        self._started = False
+        self._resumeFrom: Optional[Snapshot] = None
+        self._transactions = 0
+        self._equityRows = 0
+        self._equityCursor = 0
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.root, name)
+
+    def snapshots(self) -> List[Snapshot]:
+        # A snapshot cut short by a crash is ignored, as is anything written after it
+        path = self._path("snapshots.bin")
+        if not os.path.exists(path):
+            return []
+        snapshots = []
+        size = os.path.getsize(path)
+        with open(path, "rb") as f:
+            offset = 0
+            while offset + _HEADER.size <= size:
+                magic, cursor, date, transactions, equityRows, length = _HEADER.unpack(f.read(_HEADER.size))
+                end = offset + _HEADER.size + length
+                if magic != _MAGIC or end > size:
+                    break
+                snapshots.append(Snapshot(cursor, pd.Timestamp(date, tz="UTC"), transactions, equityRows, offset, end))
+                f.seek(end)
+                offset = end
+        return snapshots
+
+    def _truncate(self, snapshot: Optional[Snapshot]) -> None:
+        # Drops everything after the snapshot a run resumed from; a fresh run starts the directory over
+        os.makedirs(self.root, exist_ok=True)
+        sizes = {
+            "transactions.bin": snapshot.transactions * TRANSACTION_DTYPE.itemsize if snapshot else 0,
+            "equity.bin": snapshot.equityRows * EQUITY_DTYPE.itemsize if snapshot else 0,
+            "snapshots.bin": snapshot.end if snapshot else 0,
+        }
+        for name, size in sizes.items():
+            with open(self._path(name), "ab") as f:
+                f.truncate(size)
+
+    def save(self, backtest: 'Backtest') -> Snapshot:
+        if self._resumeFrom is not None:
+            self._truncate(self._resumeFrom)
+            self._resumeFrom = None
+        elif not self._started:
+            self._truncate(None)
+        self._started = True
+
+        log = backtest.transactions
+        columns = log.rows(self._transactions)
+        rows = np.empty(len(columns["date"]), dtype=TRANSACTION_DTYPE)
+        for name in COLUMNS:
+            rows[name] = columns[name]
+        with open(self._path("transactions.bin"), "ab") as f:
+            f.write(rows.tobytes())
+
+        # The last saved bar is written again since the pandas engine can revisit it
+        recorder = backtest.recorder
+        start = self._equityCursor
+        cursors = np.flatnonzero(recorder.recorded[start:backtest.cursor + 1]) + start
+        equity = np.empty(len(cursors), dtype=EQUITY_DTYPE)
+        equity["cursor"] = cursors
+        equity["cash"] = recorder.cash[cursors]
+        equity["position"] = recorder.position[cursors]
+        equity["equity"] = recorder.equity[cursors]
+        with open(self._path("equity.bin"), "ab") as f:
+            f.write(equity.tobytes())
+
+        # One pickle for everything that can share references, such as an Order held by both book and strategy
+        payload = pickle.dumps({
+            "date": backtest.date,
+            "cash": backtest.cash,
+            "volumeFilled": backtest.volumeFilled,
+            "ledger": backtest.ledger,
+            "orderBook": backtest.orderBook,
+            "transactions": log.state(),
+            "strategy": _strategyState(backtest.strategy),
+        }, protocol=pickle.HIGHEST_PROTOCOL)
+        barDate = backtest.bars.index[backtest.cursor]
+        path = self._path("snapshots.bin")
+        offset = os.path.getsize(path)
+        with open(path, "ab") as f:
+            f.write(_HEADER.pack(_MAGIC, backtest.cursor, barDate.value, len(log), self._equityRows + len(equity), len(payload)))
+            f.write(payload)
+
+        self._transactions = len(log)
+        self._equityRows += len(equity)
+        self._equityCursor = backtest.cursor
+        return Snapshot(backtest.cursor, pd.Timestamp(barDate.value, tz="UTC"), self._transactions, self._equityRows, offset, offset + _HEADER.size + len(payload))
+
+    def find(self, cursor: Optional[int] = None) -> Snapshot:
+        snapshots = self.snapshots()
+        if cursor is not None:
+            snapshots = [snapshot for snapshot in snapshots if snapshot.cursor <= cursor]
+        if not snapshots:
+            raise ValueError(f"No checkpoint in {self.root}" + (f" at or before bar {cursor}" if cursor is not None else ""))
+        return snapshots[-1]
+
+    def restore(self, backtest: 'Backtest', cursor: Optional[int] = None, strategyState: bool = True) -> Snapshot:
+        snapshot = self.find(cursor)
+        if snapshot.cursor >= len(backtest.bars) or backtest.bars.index[snapshot.cursor].value != snapshot.date.value:
+            raise ValueError(f"Checkpoint bar {snapshot.cursor} ({snapshot.date}) is not in this backtest's history")
+        with open(self._path("snapshots.bin"), "rb") as f:
+            f.seek(snapshot.offset + _HEADER.size)
+            state: Dict[str, Any] = pickle.loads(f.read(snapshot.end - snapshot.offset - _HEADER.size))
+
+        rows = np.fromfile(self._path("transactions.bin"), dtype=TRANSACTION_DTYPE, count=snapshot.transactions)
+        backtest.transactions.load({name: rows[name] for name in COLUMNS}, state["transactions"])
+        equity = np.fromfile(self._path("equity.bin"), dtype=EQUITY_DTYPE, count=snapshot.equityRows)
+        recorder = backtest.recorder
+        recorder.recorded[:] = False
+        # Rows are in write order, so a bar written twice keeps its later values
+        _, firstFromEnd = np.unique(equity["cursor"][::-1], return_index=True)
+        equity = equity[len(equity) - 1 - firstFromEnd]
+        recorder.cash[equity["cursor"]] = equity["cash"]
+        recorder.position[equity["cursor"]] = equity["position"]
+        recorder.equity[equity["cursor"]] = equity["equity"]
+        recorder.recorded[equity["cursor"]] = True
+
+        backtest.cursor = snapshot.cursor
+        backtest.barDate = backtest.bars.index[snapshot.cursor]
+        backtest.date = state["date"]
+        backtest.cash = state["cash"]
+        backtest.volumeFilled = state["volumeFilled"]
+        backtest.ledger = state["ledger"]
+        backtest.orderBook = state["orderBook"]
+        if strategyState:
+            backtest.strategy.__dict__.update(state["strategy"])
+
+        # The next save continues this branch, cutting off anything saved after it
+        self._resumeFrom = snapshot
+        self._started = True
+        self._transactions = snapshot.transactions
+        self._equityRows = snapshot.equityRows
+        self._equityCursor = snapshot.cursor
+        return snapshot
@@ -1,3 +1,4 @@
+import numpy as np
 from pyBacktest.tradeTypes import InvalidCommissionTypeError
 
 def calculate_commission(commisionType: str, commision: float, price: float, numShares: int) -> float:
@@ -11,3 +12,16 @@ def calculate_commission(commisionType: str, commision: float, price: float, num
         return commision * numShares
     else:
         raise InvalidCommissionTypeError(f"Invalid commission type: {commisionType}, accepted types are FLAT, PERCENTAGE, PERCENTAGE_PER_SHARE, and PER_SHARE")
+
+
+def calculate_commission_array(commisionType: str, commision: float, prices: np.ndarray, numShares: np.ndarray) -> np.ndarray:
+    if commisionType == "FLAT":
+        return np.where(numShares != 0, commision, 0.0)
+    elif commisionType == "PERCENTAGE":
+        return prices * commision * numShares
+    elif commisionType == "PERCENTAGE_PER_SHARE":
+        return commision * numShares
+    elif commisionType == "PER_SHARE":
+        return commision * numShares
+    else:
+        raise InvalidCommissionTypeError(f"Invalid commission type: {commisionType}, accepted types are FLAT, PERCENTAGE, PERCENTAGE_PER_SHARE, and PER_SHARE")
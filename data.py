@@ -0,0 +1,379 @@
+import os
+import json
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+from pyBacktest.tradeTypes import DataUnavailableError
+from pyBacktest.lazy import lazyImport
+
+yf = lazyImport("yfinance", "yfinance")
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "pyBacktest")
+
+
+def _toTimestamp(date: datetime, tz: str = "America/New_York") -> pd.Timestamp:
+    date = pd.Timestamp(date)
+    if date.tz is None:
+        date = date.tz_localize(tz)
+    return date
+
+
+def sliceRange(hist: DataFrame, start: datetime, end: datetime) -> DataFrame:
+    # Positional slice of a sorted index, returns a view rather than a boolean-masked copy
+    index = hist.index
+    start = pd.Timestamp(start)
+    end = pd.Timestamp(end)
+    if index.tz is None:
+        if start.tz is not None:
+            start = start.tz_localize(None)
+        if end.tz is not None:
+            end = end.tz_localize(None)
+    else:
+        start = _toTimestamp(start, index.tz).tz_convert(index.tz)
+        end = _toTimestamp(end, index.tz).tz_convert(index.tz)
+    lo = index.searchsorted(start, side="left")
+    hi = index.searchsorted(end, side="left")
+    return hist.iloc[lo:hi]
+
+
+class DataSource(ABC):
+    @abstractmethod
+    def history(self, ticker: str, start: datetime, end: datetime, interval: str = "1d") -> DataFrame:
+        pass
+
+
+class YFinanceSource(DataSource):
+    def history(self, ticker: str, start: datetime, end: datetime, interval: str = "1d") -> DataFrame:
+        return yf.Ticker(ticker).history(start=start, end=end, interval=interval)
+
+
+class DataFrameSource(DataSource):
+    def __init__(self, data: Union[DataFrame, Dict[str, DataFrame]]) -> None:
+        if isinstance(data, DataFrame):
+            self.frames: Optional[Dict[str, DataFrame]] = None
+            self.frame: Optional[DataFrame] = self._normalised(data)
+        else:
+            self.frames = {ticker.upper(): self._normalised(df) for ticker, df in data.items()}
+            self.frame = None
+
+    @staticmethod
+    def _normalised(frame: DataFrame) -> DataFrame:
+        # Naive indexes are read as New York time, like the dates Backtest is given, so both sides compare.
+        # Already sorted histories are kept as given, so slices and memory maps are not copied
+        if isinstance(frame.index, pd.DatetimeIndex) and frame.index.tz is None:
+            frame = frame.tz_localize("America/New_York")
+        return frame if frame.index.is_monotonic_increasing else frame.sort_index()
+
+    def history(self, ticker: str, start: datetime, end: datetime, interval: str = "1d") -> DataFrame:
+        if self.frame is not None:
+            return sliceRange(self.frame, start, end)
+        if ticker.upper() not in self.frames:
+            raise DataUnavailableError(f"No data supplied for {ticker}")
+        return sliceRange(self.frames[ticker.upper()], start, end)
+
+
+class CachedSource(DataSource):
+    def __init__(
+        self,
+        upstream: Optional[DataSource] = None,
+        cacheDir: str = DEFAULT_CACHE_DIR,
+        maxBytes: Optional[int] = None,
+        fileFormat: Optional[str] = None,
+    ) -> None:
+        self.upstream = upstream
+        self.cacheDir = cacheDir
+        self.maxBytes = maxBytes
+        self.fileFormat = fileFormat or self._defaultFormat()
+        self._frames: Dict[Tuple[str, str], DataFrame] = {}
+        self._ranges: Dict[Tuple[str, str], List[Tuple[pd.Timestamp, pd.Timestamp]]] = {}
+        os.makedirs(self.cacheDir, exist_ok=True)
+        self._metaPath = os.path.join(self.cacheDir, "index.json")
+
+    @staticmethod
+    def _defaultFormat() -> str:
+        try:
+            import pyarrow  # noqa: F401
+            return "parquet"
+        except ImportError:
+            return "pickle"
+
+    def _loadMeta(self) -> dict:
+        if not os.path.exists(self._metaPath):
+            return {}
+        with open(self._metaPath, "r") as f:
+            return json.load(f)
+
+    def _saveMeta(self, meta: dict) -> None:
+        tmpPath = self._metaPath + ".tmp"
+        with open(tmpPath, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmpPath, self._metaPath)
+
+    def _fileName(self, ticker: str, interval: str) -> str:
+        safeTicker = "".join(c if c.isalnum() or c in "-_." else "_" for c in ticker)
+        return f"{safeTicker}_{interval}.{self.fileFormat}"
+
+    def _readFrame(self, path: str) -> DataFrame:
+        if self.fileFormat == "parquet":
+            frame = pd.read_parquet(path)
+        elif self.fileFormat == "feather":
+            frame = pd.read_feather(path)
+        else:
+            return pd.read_pickle(path)
+        indexName = frame.columns[0]
+        frame = frame.set_index(indexName)
+        frame.index.name = None if indexName == "__index__" else indexName
+        return frame
+
+    def _writeFrame(self, frame: DataFrame, path: str) -> None:
+        tmpPath = path + ".tmp"
+        if self.fileFormat == "pickle":
+            frame.to_pickle(tmpPath)
+        else:
+            flat = frame.reset_index(names=frame.index.name or "__index__")
+            if self.fileFormat == "parquet":
+                flat.to_parquet(tmpPath)
+            else:
+                flat.to_feather(tmpPath)
+        os.replace(tmpPath, path)
+
+    @staticmethod
+    def _missingRanges(covered: List[Tuple[pd.Timestamp, pd.Timestamp]], start: pd.Timestamp, end: pd.Timestamp) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+        missing = []
+        cursor = start
+        for lo, hi in covered:
+            if hi <= cursor:
+                continue
+            if lo >= end:
+                break
+            if lo > cursor:
+                missing.append((cursor, lo))
+            cursor = max(cursor, hi)
+            if cursor >= end:
+                break
+        if cursor < end:
+            missing.append((cursor, end))
+        return missing
+
+    @staticmethod
+    def _mergeRanges(ranges: List[Tuple[pd.Timestamp, pd.Timestamp]]) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+        merged: List[Tuple[pd.Timestamp, pd.Timestamp]] = []
+        for lo, hi in sorted(ranges):
+            if merged and lo <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], hi))
+            else:
+                merged.append((lo, hi))
+        return merged
+
+    def _evict(self, meta: dict, keep: str) -> None:
+        if self.maxBytes is None:
+            return
+        total = sum(entry["bytes"] for entry in meta.values())
+        for name in sorted(meta, key=lambda n: meta[n]["lastAccess"]):
+            if total <= self.maxBytes:
+                break
+            if name == keep:
+                continue
+            path = os.path.join(self.cacheDir, name)
+            if os.path.exists(path):
+                os.remove(path)
+            total -= meta[name]["bytes"]
+            del meta[name]
+            for key in [k for k in self._frames if self._fileName(*k) == name]:
+                del self._frames[key]
+                del self._ranges[key]
+
+    def history(self, ticker: str, start: datetime, end: datetime, interval: str = "1d") -> DataFrame:
+        ticker = ticker.upper()
+        start = _toTimestamp(start).tz_convert("UTC")
+        end = _toTimestamp(end).tz_convert("UTC")
+        key = (ticker, interval)
+
+        # Fast path: fully covered by what this process already holds, no disk or network I/O
+        if key in self._frames and not self._missingRanges(self._ranges[key], start, end):
+            return self._slice(self._frames[key], start, end)
+
+        name = self._fileName(ticker, interval)
+        path = os.path.join(self.cacheDir, name)
+        meta = self._loadMeta()
+        entry = meta.get(name, {"ranges": [], "bytes": 0})
+        covered = [(pd.Timestamp(lo), pd.Timestamp(hi)) for lo, hi in entry["ranges"]]
+
+        frame = self._readFrame(path) if covered and os.path.exists(path) else None
+        if frame is None:
+            covered = []
+
+        missing = self._missingRanges(covered, start, end)
+        if missing:
+            if self.upstream is None:
+                raise DataUnavailableError(f"{ticker} {interval} is not cached for {missing[0][0]} to {missing[-1][1]}")
+            parts = [frame] if frame is not None and not frame.empty else []
+            for lo, hi in missing:
+                fetched = self.upstream.history(ticker, lo.tz_convert("America/New_York"), hi.tz_convert("America/New_York"), interval)
+                if not fetched.empty:
+                    parts.append(fetched)
+            if parts:
+                frame = pd.concat(parts)
+                frame = frame[~frame.index.duplicated(keep="last")].sort_index()
+            else:
+                frame = DataFrame()
+            self._writeFrame(frame, path)
+            covered = self._mergeRanges(covered + missing)
+            entry["ranges"] = [[lo.isoformat(), hi.isoformat()] for lo, hi in covered]
+            entry["bytes"] = os.path.getsize(path)
+
+        entry["lastAccess"] = time.time()
+        meta[name] = entry
+        self._evict(meta, keep=name)
+        self._saveMeta(meta)
+
+        self._frames[key] = frame
+        self._ranges[key] = covered
+        return self._slice(frame, start, end)
+
+    @staticmethod
+    def _slice(frame: DataFrame, start: pd.Timestamp, end: pd.Timestamp) -> DataFrame:
+        if frame.empty:
+            return frame
+        return sliceRange(frame, start, end)
+
+    def clear(self) -> None:
+        for name in self._loadMeta():
+            path = os.path.join(self.cacheDir, name)
+            if os.path.exists(path):
+                os.remove(path)
+        self._saveMeta({})
+        self._frames.clear()
+        self._ranges.clear()
+
+
+class MemoryMappedStore(DataSource):
+    # One directory per (ticker, interval): a raw int64 file of UTC nanosecond timestamps, one raw float64 file per field,
+    # and a small meta.json. Reads map the files, so every process using the store shares the OS page cache.
+    INDEX_FILE = "index.i8"
+
+    def __init__(self, root: str, fields: Tuple[str, ...] = ("Open", "High", "Low", "Close", "Volume")) -> None:
+        self.root = root
+        self.fields = fields
+        self._maps: Dict[Tuple[str, str], Tuple[np.ndarray, Dict[str, np.ndarray], dict]] = {}
+        os.makedirs(self.root, exist_ok=True)
+
+    def _dir(self, ticker: str, interval: str) -> str:
+        safeTicker = "".join(c if c.isalnum() or c in "-_." else "_" for c in ticker.upper())
+        return os.path.join(self.root, f"{safeTicker}_{interval}")
+
+    def _loadMeta(self, directory: str) -> Optional[dict]:
+        path = os.path.join(directory, "meta.json")
+        if not os.path.exists(path):
+            return None
+        with open(path, "r") as f:
+            return json.load(f)
+
+    def _saveMeta(self, directory: str, meta: dict) -> None:
+        tmpPath = os.path.join(directory, "meta.json.tmp")
+        with open(tmpPath, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmpPath, os.path.join(directory, "meta.json"))
+
+    def tickers(self, interval: str = "1d") -> List[str]:
+        suffix = f"_{interval}"
+        return sorted(name[:-len(suffix)] for name in os.listdir(self.root) if name.endswith(suffix))
+
+    def write(self, ticker: str, frame: DataFrame, interval: str = "1d") -> int:
+        directory = self._dir(ticker, interval)
+        if os.path.exists(directory):
+            for name in os.listdir(directory):
+                os.remove(os.path.join(directory, name))
+        self._maps.pop((ticker.upper(), interval), None)
+        return self.append(ticker, frame, interval)
+
+    def append(self, ticker: str, frame: DataFrame, interval: str = "1d") -> int:
+        # Rows go on the end of each file, so histories larger than memory can be written chunk by chunk
+        directory = self._dir(ticker, interval)
+        os.makedirs(directory, exist_ok=True)
+        meta = self._loadMeta(directory)
+        index = frame.index if isinstance(frame.index, pd.DatetimeIndex) else pd.DatetimeIndex(frame.index)
+        if meta is None:
+            meta = {
+                "rows": 0,
+                "fields": [name for name in self.fields if name in frame.columns],
+                "tz": str(index.tz) if index.tz is not None else None,
+                "indexName": index.name,
+                "last": None,
+            }
+        stamps = (index.tz_convert("UTC") if index.tz is not None else index).as_unit("ns").asi8
+        if len(stamps) and (np.any(np.diff(stamps) <= 0) or (meta["last"] is not None and stamps[0] <= meta["last"])):
+            raise ValueError("Appended rows must have strictly increasing timestamps after the stored history")
+
+        with open(os.path.join(directory, self.INDEX_FILE), "ab") as f:
+            f.write(np.ascontiguousarray(stamps, dtype=np.int64).tobytes())
+        for name in meta["fields"]:
+            values = frame[name].to_numpy(dtype=np.float64) if name in frame.columns else np.full(len(frame), np.nan)
+            with open(os.path.join(directory, f"{name}.f8"), "ab") as f:
+                f.write(np.ascontiguousarray(values).tobytes())
+        meta["rows"] += len(stamps)
+        if len(stamps):
+            meta["last"] = int(stamps[-1])
+        self._saveMeta(directory, meta)
+        self._maps.pop((ticker.upper(), interval), None)
+        return meta["rows"]
+
+    def ingest(self, ticker: str, frames: Iterable[DataFrame], interval: str = "1d") -> int:
+        # Builds a history from chunks, e.g. FileReplaySource(path).frames(), without holding it all in memory
+        rows = 0
+        for i, frame in enumerate(frames):
+            rows = self.write(ticker, frame, interval) if i == 0 else self.append(ticker, frame, interval)
+        return rows
+
+    def _open(self, ticker: str, interval: str) -> Tuple[np.ndarray, Dict[str, np.ndarray], dict]:
+        key = (ticker.upper(), interval)
+        mapped = self._maps.get(key)
+        if mapped is None:
+            directory = self._dir(ticker, interval)
+            meta = self._loadMeta(directory)
+            if meta is None:
+                raise DataUnavailableError(f"{ticker} {interval} is not in the store at {self.root}")
+            rows = meta["rows"]
+
+            def mapFile(name: str, dtype: type) -> np.ndarray:
+                if rows == 0:
+                    return np.zeros(0, dtype=dtype)
+                return np.memmap(os.path.join(directory, name), dtype=dtype, mode="r", shape=(rows,)).view(np.ndarray)
+            mapped = (mapFile(self.INDEX_FILE, np.int64), {name: mapFile(f"{name}.f8", np.float64) for name in meta["fields"]}, meta)
+            self._maps[key] = mapped
+        return mapped
+
+    def arrays(self, ticker: str, start: datetime, end: datetime, interval: str = "1d") -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        stamps, columns, meta = self._open(ticker, interval)
+        tz = meta["tz"] or "UTC"
+        lo = int(np.searchsorted(stamps, _toTimestamp(start, tz).as_unit("ns").value, side="left"))
+        hi = int(np.searchsorted(stamps, _toTimestamp(end, tz).as_unit("ns").value, side="left"))
+        return stamps[lo:hi], {name: values[lo:hi] for name, values in columns.items()}
+
+    def history(self, ticker: str, start: datetime, end: datetime, interval: str = "1d") -> DataFrame:
+        # Columns and index are views of the mapped files; nothing is read until a page is touched
+        stamps, columns = self.arrays(ticker, start, end, interval)
+        meta = self._open(ticker, interval)[2]
+        dtype = pd.DatetimeTZDtype("ns", meta["tz"]) if meta["tz"] is not None else "datetime64[ns]"
+        values = stamps if meta["tz"] is not None else stamps.view("datetime64[ns]")
+        index = pd.DatetimeIndex(values, dtype=dtype, name=meta["indexName"], copy=False)
+        return DataFrame(columns, index=index, copy=False)
+
+    def close(self) -> None:
+        self._maps.clear()
+
+
+_defaultSource: DataSource = YFinanceSource()
+
+
+def getDefaultDataSource() -> DataSource:
+    return _defaultSource
+
+
+def setDefaultDataSource(source: DataSource) -> None:
+    global _defaultSource
+    _defaultSource = source
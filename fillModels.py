@@ -0,0 +1,90 @@
+from typing import Optional, Tuple, Union
+import numpy as np
+
+ArrayLike = Union[float, np.ndarray]
+
+
+class FillModel:
+    # Legacy fills: limit orders trigger on the close and fill at their target, market orders take the bar's open
+    def __init__(
+        self,
+        slippage: float = 0.0,
+        slippageType: str = "PERCENTAGE",
+        participation: Optional[float] = None,
+        marketPrice: str = "open",
+    ) -> None:
+        if slippageType not in ("PERCENTAGE", "FIXED"):
+            raise ValueError(f"Invalid slippage type: {slippageType}, accepted types are PERCENTAGE and FIXED")
+        if marketPrice not in ("open", "close"):
+            raise ValueError(f"Invalid market price: {marketPrice}, accepted prices are open and close")
+        if participation is not None and not 0 < participation <= 1:
+            raise ValueError("participation must be in (0, 1]")
+        self.slippage = slippage
+        self.slippageType = slippageType
+        self.participation = participation
+        self.marketPrice = marketPrice
+
+    def triggerRange(self, open: ArrayLike, high: ArrayLike, low: ArrayLike, close: ArrayLike) -> Tuple[ArrayLike, ArrayLike]:
+        return close, close
+
+    def triggered(self, sign: np.ndarray, target: np.ndarray, open: ArrayLike, high: ArrayLike, low: ArrayLike, close: ArrayLike) -> np.ndarray:
+        # Buys (sign > 0) trigger once the bar trades at or below their target, sells at or above
+        low, high = self.triggerRange(open, high, low, close)
+        return np.where(sign > 0, low <= target, high >= target)
+
+    def limitPrices(self, sign: np.ndarray, target: np.ndarray, open: ArrayLike, high: ArrayLike, low: ArrayLike, close: ArrayLike) -> np.ndarray:
+        return np.asarray(target, dtype=np.float64)
+
+    def marketPrices(self, sign: ArrayLike, open: ArrayLike, high: ArrayLike, low: ArrayLike, close: ArrayLike) -> ArrayLike:
+        price = open if self.marketPrice == "open" else close
+        return self.slip(sign, price)
+
+    def slip(self, sign: ArrayLike, price: ArrayLike) -> ArrayLike:
+        # Slippage always moves the price against the order
+        if not self.slippage:
+            return price
+        if self.slippageType == "PERCENTAGE":
+            return price * (1 + sign * self.slippage)
+        return price + sign * self.slippage
+
+    def capacity(self, volume: ArrayLike) -> ArrayLike:
+        if self.participation is None:
+            return np.inf
+        return np.floor(self.participation * volume)
+
+    def allocate(self, shares: np.ndarray, available: ArrayLike, groups: Optional[np.ndarray] = None) -> np.ndarray:
+        # Hands out the bar's remaining volume to orders in time priority, per group (asset) when given
+        shares = np.asarray(shares)
+        if self.participation is None:
+            return shares
+        if groups is None:
+            ahead = np.cumsum(shares) - shares
+        else:
+            order = np.argsort(groups, kind="stable")
+            sortedShares = shares[order]
+            cumulative = np.cumsum(sortedShares) - sortedShares
+            sortedGroups = groups[order]
+            starts = np.r_[True, sortedGroups[1:] != sortedGroups[:-1]]
+            cumulative = cumulative - np.maximum.accumulate(np.where(starts, cumulative, 0))
+            ahead = np.empty_like(cumulative)
+            ahead[order] = cumulative
+        return np.clip(np.floor(available - ahead), 0, shares).astype(shares.dtype)
+
+
+class OHLCFillModel(FillModel):
+    # Triggers on the bar's range and fills gapped orders at the open; market orders take the close the strategy just saw
+    def __init__(
+        self,
+        slippage: float = 0.0,
+        slippageType: str = "PERCENTAGE",
+        participation: Optional[float] = None,
+        marketPrice: str = "close",
+    ) -> None:
+        super().__init__(slippage, slippageType, participation, marketPrice)
+
+    def triggerRange(self, open: ArrayLike, high: ArrayLike, low: ArrayLike, close: ArrayLike) -> Tuple[ArrayLike, ArrayLike]:
+        return low, high
+
+    def limitPrices(self, sign: np.ndarray, target: np.ndarray, open: ArrayLike, high: ArrayLike, low: ArrayLike, close: ArrayLike) -> np.ndarray:
+        # An open already through the limit fills there, which is never worse than the target
+        return np.where(sign > 0, np.minimum(open, target), np.maximum(open, target)).astype(np.float64)
@@ -0,0 +1,168 @@
+import hashlib
+import os
+import pickle
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+
+def fingerprint(data: Any) -> str:
+    # Content hash of the values and index, taken on every lookup so an array edited in place gets a new key
+    digest = hashlib.blake2b(digest_size=16)
+    if isinstance(data, (pd.Series, pd.DataFrame)):
+        digest.update(repr(data.shape).encode())
+        if isinstance(data, pd.DataFrame):
+            digest.update(repr(list(data.columns)).encode())
+        digest.update(np.ascontiguousarray(data.to_numpy()).tobytes())
+        index = data.index
+        if isinstance(index, pd.DatetimeIndex):
+            digest.update(str(index.tz).encode())
+            digest.update(np.ascontiguousarray(index.asi8).tobytes())
+        else:
+            digest.update(np.ascontiguousarray(index.to_numpy()).tobytes())
+    elif isinstance(data, np.ndarray):
+        digest.update(repr((data.shape, data.dtype.str)).encode())
+        digest.update(np.ascontiguousarray(data).tobytes())
+    else:
+        digest.update(repr(data).encode())
+    return digest.hexdigest()
+
+
+def _sizeOf(value: Any) -> int:
+    if isinstance(value, (pd.Series, pd.DataFrame)):
+        return int(np.sum(value.memory_usage(index=True)))
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (tuple, list)):
+        return sum(_sizeOf(item) for item in value)
+    return 64
+
+
+class IndicatorCache:
+    def __init__(self, maxBytes: int = 256 * 1024 * 1024, cacheDir: Optional[str] = None, maxDiskBytes: Optional[int] = None) -> None:
+        self.maxBytes = maxBytes
+        self.cacheDir = cacheDir
+        self.maxDiskBytes = maxDiskBytes
+        self._entries: "OrderedDict[str, Tuple[Any, int]]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.diskHits = 0
+        self.misses = 0
+
+    def key(self, func: Callable, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> str:
+        name = f"{getattr(func, '__module__', '')}.{getattr(func, '__qualname__', repr(func))}"
+        code = getattr(func, "__code__", None)
+        parts = [name, hashlib.blake2b(code.co_code + repr(code.co_consts).encode(), digest_size=8).hexdigest() if code is not None else ""]
+        parts.extend(fingerprint(arg) for arg in args)
+        parts.extend(f"{k}={fingerprint(v)}" for k, v in sorted(kwargs.items()))
+        return hashlib.blake2b("|".join(parts).encode(), digest_size=16).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cacheDir, f"{key}.pkl")
+
+    def _readDisk(self, key: str) -> Optional[Any]:
+        if self.cacheDir is None:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+        os.utime(path)
+        return value
+
+    def _writeDisk(self, key: str, value: Any) -> None:
+        if self.cacheDir is None:
+            return
+        os.makedirs(self.cacheDir, exist_ok=True)
+        # Written under a process-unique name and renamed, so concurrent workers never see a partial file
+        tmpPath = f"{self._path(key)}.{os.getpid()}.tmp"
+        with open(tmpPath, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmpPath, self._path(key))
+        self._evictDisk()
+
+    def _evictDisk(self) -> None:
+        if self.maxDiskBytes is None:
+            return
+        files = []
+        for name in os.listdir(self.cacheDir):
+            if name.endswith(".pkl"):
+                path = os.path.join(self.cacheDir, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.maxDiskBytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def _store(self, key: str, value: Any) -> None:
+        size = _sizeOf(value)
+        if size > self.maxBytes:
+            return
+        self._entries[key] = (value, size)
+        self._bytes += size
+        while self._bytes > self.maxBytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self._bytes -= evicted
+
+    def compute(self, func: Callable, *args: Any, **kwargs: Any) -> Any:
+        key = self.key(func, args, kwargs)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+        value = self._readDisk(key)
+        if value is not None:
+            self.diskHits += 1
+        else:
+            self.misses += 1
+            value = func(*args, **kwargs)
+            self._writeDisk(key, value)
+        self._store(key, value)
+        return value
+
+    def wrap(self, func: Callable) -> Callable:
+        def cached(*args: Any, **kwargs: Any) -> Any:
+            return self.compute(func, *args, **kwargs)
+        cached.__name__ = getattr(func, "__name__", "cached")
+        cached.__wrapped__ = func
+        return cached
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def nbytes(self) -> int:
+        return self._bytes
+
+    def clear(self, disk: bool = False) -> None:
+        self._entries.clear()
+        self._bytes = 0
+        if disk and self.cacheDir is not None and os.path.isdir(self.cacheDir):
+            for name in os.listdir(self.cacheDir):
+                if name.endswith(".pkl"):
+                    os.remove(os.path.join(self.cacheDir, name))
+
+
+_defaultCache: IndicatorCache = IndicatorCache()
+
+
+def getDefaultIndicatorCache() -> IndicatorCache:
+    return _defaultCache
+
+
+def setDefaultIndicatorCache(cache: IndicatorCache) -> None:
+    global _defaultCache
+    _defaultCache = cache
@@ -0,0 +1,210 @@
+import math
+from abc import ABC, abstractmethod
+from typing import Any, List, Mapping, Optional, Tuple, Union
+
+Bar = Union[float, Mapping[str, Any]]
+
+
+class OnlineIndicator(ABC):
+    def __init__(self, field: str = "Close") -> None:
+        self.field = field
+        self.count = 0
+        self._value = math.nan
+
+    def _price(self, bar: Bar) -> float:
+        if isinstance(bar, (int, float)):
+            return float(bar)
+        return float(bar[self.field])
+
+    def update(self, bar: Bar) -> float:
+        self.count += 1
+        self._value = self._update(self._price(bar))
+        return self._value
+
+    @abstractmethod
+    def _update(self, price: float) -> float:
+        pass
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    @property
+    def ready(self) -> bool:
+        return not math.isnan(self._value)
+
+
+class SMA(OnlineIndicator):
+    def __init__(self, period: int, field: str = "Close") -> None:
+        super().__init__(field)
+        self.period = period
+        self._buffer: List[float] = [0.0] * period
+        self._head = 0
+        self._sum = 0.0
+        self._compensation = 0.0
+
+    def _add(self, x: float) -> None:
+        # Kahan summation keeps the running sum from drifting away from a fresh rolling mean
+        y = x - self._compensation
+        total = self._sum + y
+        self._compensation = (total - self._sum) - y
+        self._sum = total
+
+    def _update(self, price: float) -> float:
+        old = self._buffer[self._head]
+        self._buffer[self._head] = price
+        self._head = (self._head + 1) % self.period
+        self._add(price)
+        if self.count > self.period:
+            self._add(-old)
+        return self._sum / self.period if self.count >= self.period else math.nan
+
+
+class EMA(OnlineIndicator):
+    def __init__(self, period: int, field: str = "Close", alpha: Optional[float] = None) -> None:
+        super().__init__(field)
+        self.period = period
+        self.alpha = alpha if alpha is not None else 2.0 / (period + 1)
+
+    def _update(self, price: float) -> float:
+        if self.count == 1:
+            return price
+        return self._value + self.alpha * (price - self._value)
+
+
+class RollingStd(OnlineIndicator):
+    def __init__(self, period: int, field: str = "Close", ddof: int = 1) -> None:
+        super().__init__(field)
+        self.period = period
+        self.ddof = ddof
+        self._buffer: List[float] = [0.0] * period
+        self._head = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def _update(self, price: float) -> float:
+        old = self._buffer[self._head]
+        self._buffer[self._head] = price
+        self._head = (self._head + 1) % self.period
+        if self.count <= self.period:
+            # Welford's running update while the window fills
+            delta = price - self.mean
+            self.mean += delta / self.count
+            self._m2 += delta * (price - self.mean)
+        else:
+            # Sliding window: swap the oldest observation for the new one in a single step
+            oldMean = self.mean
+            self.mean += (price - old) / self.period
+            self._m2 += (price - old) * (price - self.mean + old - oldMean)
+            self._m2 = max(self._m2, 0.0)
+        if self.count < self.period or self.period <= self.ddof:
+            return math.nan
+        return math.sqrt(self._m2 / (self.period - self.ddof))
+
+
+class BollingerBands(OnlineIndicator):
+    def __init__(self, period: int = 20, stdDev: float = 2, field: str = "Close") -> None:
+        super().__init__(field)
+        self.stdDev = stdDev
+        self.sma = SMA(period, field)
+        self.std = RollingStd(period, field)
+        self.upper = math.nan
+        self.lower = math.nan
+
+    def _update(self, price: float) -> float:
+        middle = self.sma.update(price)
+        std = self.std.update(price)
+        self.upper = middle + std * self.stdDev
+        self.lower = middle - std * self.stdDev
+        return middle
+
+    @property
+    def bands(self) -> Tuple[float, float, float]:
+        return self.upper, self._value, self.lower
+
+
+class RSI(OnlineIndicator):
+    def __init__(self, period: int = 14, field: str = "Close", method: str = "simple") -> None:
+        if method not in ("wilder", "simple"):
+            raise ValueError(f"Invalid RSI method: {method}, accepted methods are wilder and simple")
+        super().__init__(field)
+        self.period = period
+        self.method = method
+        self._previous = math.nan
+        if method == "wilder":
+            self._gain = EMA(period, alpha=1.0 / period)
+            self._loss = EMA(period, alpha=1.0 / period)
+        else:
+            self._gain = SMA(period)
+            self._loss = SMA(period)
+
+    def _update(self, price: float) -> float:
+        # The first bar has no change and counts as zero gain and zero loss, as in calculateRSI
+        delta = 0.0 if math.isnan(self._previous) else price - self._previous
+        self._previous = price
+        gain = self._gain.update(delta if delta > 0 else 0.0)
+        loss = self._loss.update(-delta if delta < 0 else 0.0)
+        if self.count < self.period:
+            return math.nan
+        if loss == 0:
+            return 100.0 if gain > 0 else math.nan
+        return 100 - (100 / (1 + gain / loss))
+
+
+class MACD(OnlineIndicator):
+    def __init__(self, fastPeriod: int = 12, slowPeriod: int = 26, signalPeriod: int = 9, field: str = "Close") -> None:
+        super().__init__(field)
+        self.fast = EMA(fastPeriod)
+        self.slow = EMA(slowPeriod)
+        self.signalLine = EMA(signalPeriod)
+        self.signal = math.nan
+        self.histogram = math.nan
+
+    def _update(self, price: float) -> float:
+        macd = self.fast.update(price) - self.slow.update(price)
+        self.signal = self.signalLine.update(macd)
+        self.histogram = macd - self.signal
+        return macd
+
+
+class ATR(OnlineIndicator):
+    def __init__(self, period: int = 14) -> None:
+        super().__init__("Close")
+        self.period = period
+        self._previousClose = math.nan
+        self._average = EMA(period, alpha=1.0 / period)
+
+    def update(self, bar: Mapping[str, Any]) -> float:
+        high, low, close = float(bar["High"]), float(bar["Low"]), float(bar["Close"])
+        trueRange = high - low
+        if not math.isnan(self._previousClose):
+            trueRange = max(trueRange, abs(high - self._previousClose), abs(low - self._previousClose))
+        self._previousClose = close
+        return super().update(trueRange)
+
+    def _update(self, trueRange: float) -> float:
+        average = self._average.update(trueRange)
+        return average if self.count >= self.period else math.nan
+
+
+class VWAP(OnlineIndicator):
+    def __init__(self) -> None:
+        super().__init__("Close")
+        self._priceVolume = 0.0
+        self._volume = 0.0
+
+    def update(self, bar: Mapping[str, Any]) -> float:
+        typical = (float(bar["High"]) + float(bar["Low"]) + float(bar["Close"])) / 3
+        volume = float(bar["Volume"])
+        self._priceVolume += typical * volume
+        self._volume += volume
+        return super().update(typical)
+
+    def _update(self, typical: float) -> float:
+        return self._priceVolume / self._volume if self._volume else math.nan
+
+    def reset(self) -> None:
+        self._priceVolume = 0.0
+        self._volume = 0.0
+        self.count = 0
+        self._value = math.nan
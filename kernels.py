@@ -0,0 +1,342 @@
+import importlib.util
+import math
+from typing import Callable, Dict, Optional, Tuple, Union
+import numpy as np
+import pandas as pd
+
+# Looked up without importing, numba itself is only loaded once its backend is chosen
+HAS_NUMBA = importlib.util.find_spec("numba") is not None
+
+BACKENDS = ("pandas", "numpy", "numba")
+CHUNK_ROWS = 1 << 16
+STD_CHUNK_ROWS = 1 << 12
+
+_backend = "pandas"
+_loops: Dict[str, Callable] = {}
+_compiled: Dict[str, Callable] = {}
+
+
+def _compile() -> None:
+    if _compiled:
+        return
+    try:
+        import numba
+    except ImportError:
+        raise ImportError("The numba backend needs numba installed") from None
+    for name, func in _loops.items():
+        _compiled[name] = numba.njit(cache=True, nogil=True)(func)
+
+
+def setBackend(name: str) -> None:
+    global _backend
+    if name == "auto":
+        name = "numba" if HAS_NUMBA else "numpy"
+    if name not in BACKENDS:
+        raise ValueError(f"Invalid backend: {name}, accepted backends are pandas, numpy, numba and auto")
+    if name == "numba":
+        _compile()
+    _backend = name
+
+
+def getBackend() -> str:
+    return _backend
+
+
+def _loop(func: Callable) -> Callable:
+    _loops[func.__name__] = func
+    return func
+
+
+def _kernel(name: str) -> Callable:
+    _compile()
+    return _compiled[name]
+
+
+def values(data: Union[pd.Series, np.ndarray]) -> np.ndarray:
+    if isinstance(data, pd.Series):
+        return data.to_numpy(dtype=np.float64)
+    return np.asarray(data, dtype=np.float64)
+
+
+def wrap(data: Union[pd.Series, np.ndarray], result: np.ndarray) -> Union[pd.Series, np.ndarray]:
+    if isinstance(data, pd.Series):
+        return pd.Series(result, index=data.index, name=data.name, copy=False)
+    return result
+
+
+# Loop kernels: compiled by numba for its backend, otherwise only used as a reference
+
+@_loop
+def _rollingMeanLoop(x, period):
+    n = x.shape[0]
+    out = np.empty(n)
+    total = 0.0
+    compensation = 0.0
+    valid = 0
+    for i in range(n):
+        v = x[i]
+        if v == v:
+            y = v - compensation
+            t = total + y
+            compensation = (t - total) - y
+            total = t
+            valid += 1
+        if i >= period:
+            old = x[i - period]
+            if old == old:
+                y = -old - compensation
+                t = total + y
+                compensation = (t - total) - y
+                total = t
+                valid -= 1
+        out[i] = total / period if valid == period else np.nan
+    return out
+
+
+@_loop
+def _rollingStdLoop(x, period, ddof):
+    n = x.shape[0]
+    out = np.empty(n)
+    mean = 0.0
+    m2 = 0.0
+    for i in range(n):
+        v = x[i]
+        if i < period:
+            delta = v - mean
+            mean += delta / (i + 1)
+            m2 += delta * (v - mean)
+        else:
+            old = x[i - period]
+            oldMean = mean
+            mean += (v - old) / period
+            m2 += (v - old) * (v - mean + old - oldMean)
+            if m2 < 0.0:
+                m2 = 0.0
+        if i + 1 < period or period <= ddof:
+            out[i] = np.nan
+        else:
+            out[i] = math.sqrt(m2 / (period - ddof))
+    return out
+
+
+@_loop
+def _emaLoop(x, alpha, minPeriods):
+    n = x.shape[0]
+    out = np.empty(n)
+    y = x[0] if n else 0.0
+    for i in range(n):
+        y += alpha * (x[i] - y)
+        out[i] = y if i + 1 >= minPeriods else np.nan
+    return out
+
+
+@_loop
+def _rsiLoop(x, period, wilder):
+    n = x.shape[0]
+    out = np.empty(n)
+    gains = np.zeros(period)
+    losses = np.zeros(period)
+    gain = 0.0
+    loss = 0.0
+    alpha = 1.0 / period
+    for i in range(n):
+        delta = x[i] - x[i - 1] if i > 0 else 0.0
+        g = delta if delta > 0.0 else 0.0
+        l = -delta if delta < 0.0 else 0.0
+        if wilder:
+            if i == 0:
+                gain = g
+                loss = l
+            else:
+                gain += alpha * (g - gain)
+                loss += alpha * (l - loss)
+            averageGain = gain
+            averageLoss = loss
+        else:
+            slot = i % period
+            gain += g - gains[slot]
+            loss += l - losses[slot]
+            gains[slot] = g
+            losses[slot] = l
+            averageGain = gain / period
+            averageLoss = loss / period
+        if i + 1 < period:
+            out[i] = np.nan
+        elif averageLoss == 0.0:
+            out[i] = 100.0 if averageGain > 0.0 else np.nan
+        else:
+            out[i] = 100.0 - 100.0 / (1.0 + averageGain / averageLoss)
+    return out
+
+
+@_loop
+def _drawdownLoop(x):
+    peak = -np.inf
+    worst = np.nan
+    current = np.nan
+    for i in range(x.shape[0]):
+        v = x[i]
+        if v != v:
+            current = np.nan
+            continue
+        if v > peak:
+            peak = v
+        current = v / peak - 1.0
+        if worst != worst or current < worst:
+            worst = current
+    return worst, current
+
+
+@_loop
+def _meanStdLoop(x, negativeOnly):
+    count = 0
+    mean = 0.0
+    m2 = 0.0
+    for i in range(x.shape[0]):
+        v = x[i]
+        if v != v or (negativeOnly and not v < 0.0):
+            continue
+        count += 1
+        delta = v - mean
+        mean += delta / count
+        m2 += delta * (v - mean)
+    std = math.sqrt(m2 / (count - 1)) if count > 1 else np.nan
+    return (mean if count else np.nan), std
+
+
+# NumPy fallbacks: vectorized, with chunking wherever a full-length temporary would be quadratic or lose precision
+
+def _rollingMeanNumpy(x: np.ndarray, period: int) -> np.ndarray:
+    n = len(x)
+    out = np.full(n, np.nan)
+    if n < period:
+        return out
+    finite = np.isfinite(x)
+    clean = np.where(finite, x, 0.0)
+    # The running sum restarts every chunk so cancellation error stays bounded by the chunk length
+    for lo in range(period - 1, n, CHUNK_ROWS):
+        hi = min(lo + CHUNK_ROWS, n)
+        start = lo - period + 1
+        sums = np.cumsum(clean[start:hi])
+        counts = np.cumsum(finite[start:hi])
+        windowSums = sums[period - 1:].copy()
+        windowSums[1:] -= sums[:-period]
+        windowCounts = counts[period - 1:].copy()
+        windowCounts[1:] -= counts[:-period]
+        out[lo:hi] = np.where(windowCounts == period, windowSums / period, np.nan)
+    return out
+
+
+def _rollingStdNumpy(x: np.ndarray, period: int, ddof: int) -> np.ndarray:
+    n = len(x)
+    out = np.full(n, np.nan)
+    if n < period or period <= ddof:
+        return out
+    finite = np.isfinite(x)
+    # Running sums of x and x^2, taken about each chunk's own mean so the one-pass variance keeps its precision;
+    # short chunks keep the remaining drift within a chunk small next to a window's spread
+    for lo in range(period - 1, n, STD_CHUNK_ROWS):
+        hi = min(lo + STD_CHUNK_ROWS, n)
+        start = lo - period + 1
+        ok = finite[start:hi]
+        chunk = x[start:hi]
+        centered = np.where(ok, chunk - (chunk[ok].mean() if ok.any() else 0.0), 0.0)
+        sums = np.concatenate(([0.0], np.cumsum(centered)))
+        squares = np.concatenate(([0.0], np.cumsum(centered * centered)))
+        counts = np.concatenate(([0], np.cumsum(ok)))
+        windowSums = sums[period:] - sums[:-period]
+        m2 = np.maximum(squares[period:] - squares[:-period] - windowSums * windowSums / period, 0.0)
+        out[lo:hi] = np.where(counts[period:] - counts[:-period] == period, np.sqrt(m2 / (period - ddof)), np.nan)
+    return out
+
+
+def _emaNumpy(x: np.ndarray, alpha: float, minPeriods: int) -> np.ndarray:
+    n = len(x)
+    out = np.empty(n)
+    if not n:
+        return out
+    decay = 1.0 - alpha
+    if decay <= 0.0:
+        out[:] = x
+    else:
+        # Closed form within a block, y_t = d^t * (y_0 + sum a*x_k*d^-k); blocks are short enough that d^-k cannot overflow
+        block = int(min(4096, max(1, 600.0 / -math.log(decay)))) if decay < 1.0 else 4096
+        powers = decay ** np.arange(1, block + 1)
+        previous = x[0]
+        for lo in range(0, n, block):
+            hi = min(lo + block, n)
+            p = powers[:hi - lo]
+            out[lo:hi] = p * (previous + np.cumsum(alpha * x[lo:hi] / p))
+            previous = out[hi - 1]
+    if minPeriods > 1:
+        out[:minPeriods - 1] = np.nan
+    return out
+
+
+def _rsiNumpy(x: np.ndarray, period: int, wilder: bool) -> np.ndarray:
+    delta = np.empty_like(x)
+    delta[0] = 0.0
+    np.subtract(x[1:], x[:-1], out=delta[1:])
+    gains = np.where(delta > 0.0, delta, 0.0)
+    losses = np.where(delta < 0.0, -delta, 0.0)
+    if wilder:
+        averageGain = _emaNumpy(gains, 1.0 / period, period)
+        averageLoss = _emaNumpy(losses, 1.0 / period, period)
+    else:
+        averageGain = _rollingMeanNumpy(gains, period)
+        averageLoss = _rollingMeanNumpy(losses, period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 100.0 - 100.0 / (1.0 + averageGain / averageLoss)
+
+
+def _drawdownNumpy(x: np.ndarray) -> Tuple[float, float]:
+    peaks = np.fmax.accumulate(x)
+    drawdown = x / peaks - 1.0
+    return float(np.nanmin(drawdown)) if np.isfinite(drawdown).any() else np.nan, float(drawdown[-1])
+
+
+def _meanStdNumpy(x: np.ndarray, negativeOnly: bool) -> Tuple[float, float]:
+    x = x[x < 0] if negativeOnly else x[~np.isnan(x)]
+    mean = float(x.mean()) if len(x) else np.nan
+    std = float(x.std(ddof=1)) if len(x) > 1 else np.nan
+    return mean, std
+
+
+def _useLoop(backend: Optional[str]) -> bool:
+    return (backend or _backend) == "numba"
+
+
+def rollingMean(x: np.ndarray, period: int, backend: Optional[str] = None) -> np.ndarray:
+    return _kernel("_rollingMeanLoop")(x, period) if _useLoop(backend) else _rollingMeanNumpy(x, period)
+
+
+def rollingStd(x: np.ndarray, period: int, ddof: int = 1, backend: Optional[str] = None) -> np.ndarray:
+    return _kernel("_rollingStdLoop")(x, period, ddof) if _useLoop(backend) else _rollingStdNumpy(x, period, ddof)
+
+
+def ema(x: np.ndarray, alpha: float, minPeriods: int = 0, backend: Optional[str] = None) -> np.ndarray:
+    return _kernel("_emaLoop")(x, alpha, minPeriods) if _useLoop(backend) else _emaNumpy(x, alpha, minPeriods)
+
+
+def rsi(x: np.ndarray, period: int, wilder: bool = False, backend: Optional[str] = None) -> np.ndarray:
+    if not len(x):
+        return np.empty(0)
+    return _kernel("_rsiLoop")(x, period, wilder) if _useLoop(backend) else _rsiNumpy(x, period, wilder)
+
+
+def drawdown(x: np.ndarray, backend: Optional[str] = None) -> Tuple[float, float]:
+    return _kernel("_drawdownLoop")(x) if _useLoop(backend) else _drawdownNumpy(x)
+
+
+def meanStd(x: np.ndarray, negativeOnly: bool = False, backend: Optional[str] = None) -> Tuple[float, float]:
+    return _kernel("_meanStdLoop")(x, negativeOnly) if _useLoop(backend) else _meanStdNumpy(x, negativeOnly)
+
+
+def accelerated(data: Union[pd.Series, np.ndarray], finite: bool = False) -> Optional[np.ndarray]:
+    # Float values of the input when a kernel backend is active; None sends the caller down the pandas path
+    if _backend == "pandas":
+        return None
+    x = values(data)
+    if finite and not np.isfinite(x).all():
+        return None
+    return x
@@ -0,0 +1,26 @@
+import importlib
+from types import ModuleType
+from typing import Any, Optional
+
+
+class LazyModule:
+    def __init__(self, name: str, extra: Optional[str] = None) -> None:
+        self._name = name
+        self._extra = extra
+        self._module: Optional[ModuleType] = None
+
+    def load(self) -> ModuleType:
+        if self._module is None:
+            try:
+                self._module = importlib.import_module(self._name)
+            except ImportError as e:
+                hint = f", install it with pip install pyBacktest[{self._extra}]" if self._extra else ""
+                raise ImportError(f"{self._name} is required for this feature{hint}") from e
+        return self._module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self.load(), attr)
+
+
+def lazyImport(name: str, extra: Optional[str] = None) -> LazyModule:
+    return LazyModule(name, extra)
@@ -0,0 +1,82 @@
+from collections import deque
+from dataclasses import replace
+from typing import Deque, List
+from pyBacktest.tradeTypes import Holding, InsufficientSharesError
+
+LOT_POLICIES = ("FIFO", "LIFO", "AVERAGE")
+
+
+class PositionLedger:
+    def __init__(self, policy: str = "FIFO") -> None:
+        if policy not in LOT_POLICIES:
+            raise ValueError(f"Invalid lot matching policy: {policy}, accepted policies are FIFO, LIFO, and AVERAGE")
+        self.policy = policy
+        self.longLots: Deque[Holding] = deque()
+        self.shortLots: Deque[Holding] = deque()
+        self.longShares: int = 0
+        self.shortShares: int = 0
+        self.longCost: float = 0.0
+        self.shortCost: float = 0.0
+
+    @property
+    def netPosition(self) -> int:
+        return self.longShares - self.shortShares
+
+    def holdings(self) -> List[Holding]:
+        return list(self.longLots) + list(self.shortLots)
+
+    def _add(self, lots: Deque[Holding], holding: Holding) -> None:
+        if self.policy == "AVERAGE" and lots:
+            # Average cost only needs one running lot per side; it is replaced, never edited, since callers may hold it
+            lot = lots[0]
+            numShares = lot.numShares + holding.numShares
+            totalCost = lot.totalCost + holding.totalCost
+            lots[0] = replace(lot, numShares=numShares, totalCost=totalCost, commission=lot.commission + holding.commission, entryPrice=totalCost / numShares)
+        else:
+            lots.append(holding)
+
+    def _close(self, lots: Deque[Holding], numShares: int) -> float:
+        # Returns the cost basis of the shares taken out of the lots
+        remaining = numShares
+        basis = 0.0
+        end = -1 if self.policy == "LIFO" else 0
+        while remaining > 0:
+            lot = lots[end]
+            taken = min(lot.numShares, remaining)
+            perShare = lot.totalCost / lot.numShares
+            basis += taken * perShare
+            remaining -= taken
+            if taken == lot.numShares:
+                if self.policy == "LIFO":
+                    lots.pop()
+                else:
+                    lots.popleft()
+            else:
+                lots[end] = replace(lot, numShares=lot.numShares - taken, totalCost=lot.totalCost - taken * perShare)
+        return basis
+
+    def addLong(self, holding: Holding) -> None:
+        self._add(self.longLots, holding)
+        self.longShares += holding.numShares
+        self.longCost += holding.totalCost
+
+    def addShort(self, holding: Holding) -> None:
+        self._add(self.shortLots, holding)
+        self.shortShares += holding.numShares
+        self.shortCost += holding.totalCost
+
+    def closeLong(self, numShares: int, price: float) -> float:
+        if numShares > self.longShares:
+            raise InsufficientSharesError("Not enough shares to sell")
+        basis = self._close(self.longLots, numShares)
+        self.longShares -= numShares
+        self.longCost = self.longCost - basis if self.longShares else 0.0
+        return numShares * price - basis
+
+    def closeShort(self, numShares: int, price: float) -> float:
+        if numShares > self.shortShares:
+            raise InsufficientSharesError("Not enough short positions to cover")
+        basis = self._close(self.shortLots, numShares)
+        self.shortShares -= numShares
+        self.shortCost = self.shortCost - basis if self.shortShares else 0.0
+        return basis - numShares * price
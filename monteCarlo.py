@@ -0,0 +1,155 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+from pyBacktest.tradeTypes import TradeType
+from pyBacktest.transactionLog import TransactionLog
+from pyBacktest.utils import calculateBatchDrawdown, calculateBatchSharpeRatio, calculateBatchVolatility
+
+# Budget for one chunk's paths x time working arrays
+DEFAULT_CHUNK_BYTES = 64 * 1024 * 1024
+
+
+def bootstrapPaths(returns: np.ndarray, numPaths: int, blockSize: int = 1, length: Optional[int] = None, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    # Circular block bootstrap, time x paths; blocks keep the autocorrelation and volatility clustering within them
+    rng = rng if rng is not None else np.random.default_rng()
+    returns = np.asarray(returns, dtype=np.float64)
+    length = length or len(returns)
+    numBlocks = -(-length // blockSize)
+    starts = rng.integers(0, len(returns), size=(numBlocks, 1, numPaths))
+    offsets = np.arange(blockSize)[None, :, None]
+    indices = ((starts + offsets) % len(returns)).reshape(numBlocks * blockSize, numPaths)[:length]
+    return returns[indices]
+
+
+def shuffleTrades(pnl: np.ndarray, numPaths: int, replace: bool = False, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    # Trade order x paths; a permutation keeps the terminal P&L and only reorders it, resampling also changes the total
+    rng = rng if rng is not None else np.random.default_rng()
+    pnl = np.asarray(pnl, dtype=np.float64)
+    if replace:
+        return pnl[rng.integers(0, len(pnl), size=(len(pnl), numPaths))]
+    return rng.permuted(np.repeat(pnl[:, None], numPaths, axis=1), axis=0)
+
+
+def tradePnL(transactions: Union[TransactionLog, Sequence[Any]]) -> np.ndarray:
+    # Realized P&L net of commission, one value per executed transaction in the order they happened
+    if isinstance(transactions, TransactionLog):
+        columns = transactions.to_numpy()
+        keep = columns["executedSuccessfully"] & (columns["tradeType"] != TradeType.Cancel.value)
+        return (columns["profitLoss"] - columns["commission"])[keep]
+    return np.array([
+        t.profitLoss - t.commission for t in transactions
+        if t.executedSuccessfully and t.tradeType != TradeType.Cancel
+    ], dtype=np.float64)
+
+
+def _pathMetrics(equity: np.ndarray, returns: np.ndarray) -> Dict[str, np.ndarray]:
+    return {
+        "terminalValue": equity[-1],
+        "totalReturn": equity[-1] / equity[0] - 1,
+        "maxDrawdown": np.asarray(calculateBatchDrawdown(equity)[0]),
+        "sharpeRatio": np.asarray(calculateBatchSharpeRatio(returns)),
+        "volatility": np.asarray(calculateBatchVolatility(returns)),
+    }
+
+
+def _simulateChunk(task: Tuple[str, np.ndarray, int, np.random.SeedSequence, Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    kind, data, numPaths, seed, options = task
+    rng = np.random.default_rng(seed)
+    initialValue = options["initialValue"]
+    if kind == "returns":
+        returns = bootstrapPaths(data, numPaths, options["blockSize"], options["length"], rng)
+        equity = np.empty((len(returns) + 1, numPaths))
+        equity[0] = initialValue
+        np.cumprod(1 + returns, axis=0, out=equity[1:])
+        equity[1:] *= initialValue
+    else:
+        pnl = shuffleTrades(data, numPaths, options["replace"], rng)
+        equity = np.empty((len(pnl) + 1, numPaths))
+        equity[0] = initialValue
+        np.cumsum(pnl, axis=0, out=equity[1:])
+        equity[1:] += initialValue
+        # A path that runs out of equity is ruined and stays at zero rather than trading on with negative capital
+        equity[np.maximum.accumulate(equity <= 0, axis=0)] = 0.0
+        returns = np.divide(equity[1:] - equity[:-1], equity[:-1], out=np.zeros_like(pnl), where=equity[:-1] > 0)
+    return _pathMetrics(equity, returns)
+
+
+@dataclass
+class MonteCarloResult:
+    paths: DataFrame
+    initialValue: float
+    method: str
+
+    def quantiles(self, q: Sequence[float] = (0.05, 0.25, 0.5, 0.75, 0.95)) -> DataFrame:
+        return self.paths.quantile(list(q))
+
+    def probabilityOfLoss(self) -> float:
+        return float(np.mean(self.paths["terminalValue"].to_numpy() < self.initialValue))
+
+    def probabilityOfRuin(self) -> float:
+        # Ruined paths stay at zero, so they are the ones that end there
+        return float(np.mean(self.paths["terminalValue"].to_numpy() <= 0))
+
+    def valueAtRisk(self, confidence_level: float = 0.95) -> float:
+        # Loss in terminal return not exceeded on confidence_level of the paths, positive for a loss
+        return float(-np.percentile(self.paths["totalReturn"].to_numpy(), (1 - confidence_level) * 100))
+
+    def summary(self) -> DataFrame:
+        return self.paths.describe(percentiles=[0.05, 0.5, 0.95]).T
+
+
+def _run(kind: str, data: np.ndarray, rows: int, numPaths: int, seed: Optional[int], chunkSize: Optional[int], maxWorkers: Optional[int], options: Dict[str, Any]) -> DataFrame:
+    if chunkSize is None:
+        # A few float64 arrays of rows x paths are alive at once inside a chunk
+        chunkSize = max(1, DEFAULT_CHUNK_BYTES // (4 * 8 * max(rows, 1)))
+    sizes = [min(chunkSize, numPaths - start) for start in range(0, numPaths, chunkSize)]
+    # One child seed per chunk, so results do not depend on the worker count
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(kind, data, size, childSeed, options) for size, childSeed in zip(sizes, seeds)]
+    workers = min(maxWorkers or 1, len(tasks))
+    if workers == 1:
+        chunks: List[Dict[str, np.ndarray]] = [_simulateChunk(task) for task in tasks]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunks = list(executor.map(_simulateChunk, tasks))
+    return DataFrame({name: np.concatenate([chunk[name] for chunk in chunks]) for name in chunks[0]}, copy=False)
+
+
+def monteCarloReturns(
+    returns: Union[pd.Series, np.ndarray],
+    numPaths: int = 10_000,
+    blockSize: int = 20,
+    length: Optional[int] = None,
+    initialValue: float = 1.0,
+    seed: Optional[int] = None,
+    chunkSize: Optional[int] = None,
+    maxWorkers: Optional[int] = 1,
+) -> MonteCarloResult:
+    values = np.asarray(returns, dtype=np.float64)
+    values = values[~np.isnan(values)]
+    if not len(values):
+        raise ValueError("No returns to resample")
+    length = length or len(values)
+    options = {"blockSize": max(1, min(blockSize, len(values))), "length": length, "initialValue": initialValue}
+    paths = _run("returns", values, length, numPaths, seed, chunkSize, maxWorkers, options)
+    return MonteCarloResult(paths=paths, initialValue=initialValue, method="bootstrap")
+
+
+def monteCarloTrades(
+    transactions: Union[TransactionLog, Sequence[Any], np.ndarray],
+    cash: float,
+    numPaths: int = 10_000,
+    replace: bool = False,
+    seed: Optional[int] = None,
+    chunkSize: Optional[int] = None,
+    maxWorkers: Optional[int] = 1,
+) -> MonteCarloResult:
+    pnl = np.asarray(transactions, dtype=np.float64) if isinstance(transactions, np.ndarray) else tradePnL(transactions)
+    if not len(pnl):
+        raise ValueError("No executed transactions to shuffle")
+    options = {"replace": replace, "initialValue": cash}
+    paths = _run("trades", pnl, len(pnl), numPaths, seed, chunkSize, maxWorkers, options)
+    return MonteCarloResult(paths=paths, initialValue=cash, method="resample" if replace else "shuffle")
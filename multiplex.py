@@ -0,0 +1,372 @@
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Sequence, Union
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+from pyBacktest.backtest import TradingAccount
+from pyBacktest.bars import BarArrays
+from pyBacktest.data import DataSource, getDefaultDataSource, _toTimestamp
+from pyBacktest.fillModels import FillModel
+from pyBacktest.ledger import PositionLedger
+from pyBacktest.resampling import MultiTimeframe, parseInterval
+from pyBacktest.results import BacktestResult
+from pyBacktest.strategy import Strategy
+from pyBacktest.tradeTypes import TradeType, Order, InvalidOrderError
+from pyBacktest.transactionLog import TransactionLog
+
+
+class SlotLedger(PositionLedger):
+    # Lots stay per strategy; the share and cost totals live in the multiplexer's arrays
+    def __init__(self, multiplex: 'MultiplexBacktest', slot: int, policy: str = "FIFO") -> None:
+        self._multiplex = multiplex
+        self._slot = slot
+        super().__init__(policy)
+
+    @property
+    def longShares(self) -> int:
+        return int(self._multiplex.longShares[self._slot])
+
+    @longShares.setter
+    def longShares(self, value: int) -> None:
+        self._multiplex.longShares[self._slot] = value
+
+    @property
+    def shortShares(self) -> int:
+        return int(self._multiplex.shortShares[self._slot])
+
+    @shortShares.setter
+    def shortShares(self, value: int) -> None:
+        self._multiplex.shortShares[self._slot] = value
+
+    @property
+    def longCost(self) -> float:
+        return float(self._multiplex.longCost[self._slot])
+
+    @longCost.setter
+    def longCost(self, value: float) -> None:
+        self._multiplex.longCost[self._slot] = value
+
+    @property
+    def shortCost(self) -> float:
+        return float(self._multiplex.shortCost[self._slot])
+
+    @shortCost.setter
+    def shortCost(self, value: float) -> None:
+        self._multiplex.shortCost[self._slot] = value
+
+
+class SlotOrderBook:
+    # One strategy's view of the shared order arrays; orders are matched by the multiplexer, never here
+    def __init__(self, multiplex: 'MultiplexBacktest', slot: int) -> None:
+        self._multiplex = multiplex
+        self._slot = slot
+        self._orders: Dict[int, Order] = {}
+        self._nextId = 0
+
+    def add(self, order: Order) -> Order:
+        if order.tradeType not in (TradeType.LIMIT_BUY, TradeType.LIMIT_SELL):
+            raise InvalidOrderError(f"Unsupported pending order type: {order.tradeType}")
+        order.orderId = self._nextId
+        self._nextId += 1
+        self._orders[order.orderId] = order
+        self._multiplex._newOrders.append((self._slot, order))
+        return order
+
+    def requeue(self, order: Order) -> Order:
+        self._orders[order.orderId] = order
+        return order
+
+    def get(self, orderId: int) -> Optional[Order]:
+        return self._orders.get(orderId)
+
+    def cancel(self, orderId: int) -> Optional[Order]:
+        order = self._orders.pop(orderId, None)
+        if order is not None:
+            self._multiplex._cancelled += 1
+        return order
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    def __iter__(self) -> Iterator[Order]:
+        return iter(list(self._orders.values()))
+
+    def __contains__(self, orderId: int) -> bool:
+        return orderId in self._orders
+
+
+class StrategySlot(TradingAccount):
+    # One multiplexed strategy's self.backtest: the trading API only, since bars are stepped by the multiplexer.
+    # Bars, dates and the cursor are shared; cash and position totals live in the multiplexer's arrays.
+    def __init__(self, multiplex: 'MultiplexBacktest', slot: int, strategy: Strategy, lotMatching: str = "FIFO") -> None:
+        self.multiplex = multiplex
+        self.slot = slot
+        self.ticker: str = multiplex.ticker
+        self.commision: float = multiplex.commision
+        self.commisionType: str = multiplex.commisionType
+        self.interval = multiplex.interval
+        self.endDate = multiplex.endDate
+        self.engine: str = "multiplex"
+        self._data = None
+        self.hist = multiplex.hist
+        self.bars = multiplex.bars
+        self.transactions: TransactionLog = TransactionLog()
+        self.ledger: SlotLedger = SlotLedger(multiplex, slot, lotMatching)
+        self.orderBook: SlotOrderBook = SlotOrderBook(multiplex, slot)
+        self.fillModel: FillModel = multiplex.fillModel
+        self.strategy = strategy
+
+    @property
+    def cash(self) -> float:
+        return float(self.multiplex.cash[self.slot])
+
+    @cash.setter
+    def cash(self, value: float) -> None:
+        self.multiplex.cash[self.slot] = value
+
+    @property
+    def volumeFilled(self) -> float:
+        return float(self.multiplex.volumeFilled[self.slot])
+
+    @volumeFilled.setter
+    def volumeFilled(self, value: float) -> None:
+        self.multiplex.volumeFilled[self.slot] = value
+
+    @property
+    def cursor(self) -> int:
+        return self.multiplex.cursor
+
+    @property
+    def date(self) -> pd.Timestamp:
+        return self.multiplex.date
+
+    @property
+    def barDate(self) -> Optional[pd.Timestamp]:
+        return self.multiplex.barDate
+
+    @property
+    def timeframes(self) -> MultiTimeframe:
+        return self.multiplex.timeframes
+
+
+class MultiplexBacktest:
+    def __init__(
+        self,
+        ticker: str,
+        cash: Union[float, Sequence[float]],
+        strategies: Sequence[Strategy],
+        commision: float = 0.0,
+        commisionType: str = "FLAT",
+        interval: str = "1d",
+        startDate: datetime = datetime(2024, 1, 1),
+        endDate: datetime = datetime(2024, 2, 1),
+        dataSource: Optional[DataSource] = None,
+        lotMatching: str = "FIFO",
+        fillModel: Optional[FillModel] = None,
+    ) -> None:
+        if not strategies:
+            raise ValueError("At least one strategy is required")
+        self.ticker: str = ticker.upper()
+        self.commision = commision
+        self.commisionType = commisionType
+        self.interval = parseInterval(interval)
+        self.date = _toTimestamp(startDate).tz_convert("America/New_York")
+        self.endDate = _toTimestamp(endDate).tz_convert("America/New_York")
+
+        # One fetch, one set of bar arrays and one cursor for every strategy
+        self.dataSource: DataSource = dataSource if dataSource is not None else getDefaultDataSource()
+        self.hist: DataFrame = self.dataSource.history(self.ticker, self.date, self.endDate, interval)
+        self.bars: BarArrays = BarArrays.fromFrame(self.hist)
+        self.cursor: int = 0
+        if len(self.hist):
+            self.cursor = int(self.hist.index.get_indexer([self.date], method="nearest")[0])
+        self.barDate: Optional[pd.Timestamp] = self.bars.index[self.cursor] if len(self.hist) else None
+        self.fillModel: FillModel = fillModel if fillModel is not None else FillModel()
+        self._timeframes: Optional[MultiTimeframe] = None
+
+        # Per-strategy state as struct-of-arrays, indexed by slot
+        numSlots = len(strategies)
+        self.initialCash = np.broadcast_to(np.asarray(cash, dtype=np.float64), (numSlots,)).copy()
+        self.cash = self.initialCash.copy()
+        self.longShares = np.zeros(numSlots, dtype=np.int64)
+        self.shortShares = np.zeros(numSlots, dtype=np.int64)
+        self.longCost = np.zeros(numSlots, dtype=np.float64)
+        self.shortCost = np.zeros(numSlots, dtype=np.float64)
+        self.volumeFilled = np.zeros(numSlots, dtype=np.float64)
+
+        # Equity curves, bars x strategies
+        numBars = len(self.bars)
+        self.recordedCash = np.zeros((numBars, numSlots), dtype=np.float64)
+        self.recordedPosition = np.zeros((numBars, numSlots), dtype=np.int64)
+        self.recorded = np.zeros(numBars, dtype=bool)
+
+        # Resting limit orders of every strategy as parallel arrays in submission order
+        self._orderSlot = np.zeros(0, dtype=np.int64)
+        self._orderSign = np.zeros(0, dtype=np.int64)
+        self._orderShares = np.zeros(0, dtype=np.int64)
+        self._orderPrice = np.zeros(0, dtype=np.float64)
+        self._orderDate = np.zeros(0, dtype=np.int64)
+        self._orderGTC = np.zeros(0, dtype=bool)
+        self._orders = np.zeros(0, dtype=object)
+        self._newOrders: List[tuple] = []
+        self._cancelled = 0
+
+        self.slots: List[StrategySlot] = [StrategySlot(self, slot, strategy, lotMatching) for slot, strategy in enumerate(strategies)]
+        if numBars:
+            self._record()
+        for slot in self.slots:
+            slot.strategy.initialize(slot)
+            if slot.strategy.indicators and numBars:
+                slot.strategy.updateIndicators(self.hist.iloc[self.cursor])
+
+    @property
+    def strategies(self) -> List[Strategy]:
+        return [slot.strategy for slot in self.slots]
+
+    @property
+    def timeframes(self) -> MultiTimeframe:
+        if self._timeframes is None:
+            self._timeframes = MultiTimeframe(self.hist)
+        return self._timeframes
+
+    @property
+    def positions(self) -> np.ndarray:
+        return self.longShares - self.shortShares
+
+    def totalValues(self) -> np.ndarray:
+        return self.cash + self.positions * self.bars.close[self.cursor]
+
+    def _record(self) -> None:
+        self.recordedCash[self.cursor] = self.cash
+        self.recordedPosition[self.cursor] = self.positions
+        self.recorded[self.cursor] = True
+
+    def _flushOrders(self) -> None:
+        # Orders placed since the last bar join the arrays in one concatenation
+        if not self._newOrders:
+            return
+        pending = [(slot, order) for slot, order in self._newOrders if order.active]
+        self._newOrders = []
+        if not pending:
+            return
+        orders = np.empty(len(pending), dtype=object)
+        orders[:] = [order for _, order in pending]
+        self._orderSlot = np.concatenate([self._orderSlot, [slot for slot, _ in pending]])
+        self._orderSign = np.concatenate([self._orderSign, [1 if order.tradeType == TradeType.LIMIT_BUY else -1 for order in orders]])
+        self._orderShares = np.concatenate([self._orderShares, [order.numShares for order in orders]])
+        self._orderPrice = np.concatenate([self._orderPrice, [order.targetPrice for order in orders]])
+        self._orderDate = np.concatenate([self._orderDate, [pd.Timestamp(order.orderDate).value for order in orders]])
+        self._orderGTC = np.concatenate([self._orderGTC, [order.duration == 'GTC' for order in orders]])
+        self._orders = np.concatenate([self._orders, orders])
+
+    def _keepOrders(self, keep: np.ndarray) -> None:
+        self._orderSlot = self._orderSlot[keep]
+        self._orderSign = self._orderSign[keep]
+        self._orderShares = self._orderShares[keep]
+        self._orderPrice = self._orderPrice[keep]
+        self._orderDate = self._orderDate[keep]
+        self._orderGTC = self._orderGTC[keep]
+        self._orders = self._orders[keep]
+
+    def _check_pending_orders(self) -> None:
+        self.volumeFilled[:] = 0.0
+        self._flushOrders()
+        if not len(self._orders):
+            return
+        if self._cancelled:
+            self._keepOrders(np.fromiter((order.active for order in self._orders), dtype=bool, count=len(self._orders)))
+            self._cancelled = 0
+
+        # Expired DAY orders are cancelled oldest first, as the single-strategy order book does
+        remove = ~self._orderGTC & (self._orderDate < self.date.value)
+        if remove.any():
+            expired = np.flatnonzero(remove)
+            for i in expired[np.argsort(self._orderDate[expired], kind="stable")].tolist():
+                self.slots[self._orderSlot[i]].cancelOrder(self._orders[i].orderId)
+
+        bars, cursor = self.bars, self.cursor
+        bar = (bars.open[cursor], bars.high[cursor], bars.low[cursor], bars.close[cursor])
+        triggered = ~remove & self.fillModel.triggered(self._orderSign, self._orderPrice, *bar)
+        if triggered.any():
+            fills = np.flatnonzero(triggered)
+            owners = self._orderSlot[fills]
+            prices = self.fillModel.limitPrices(self._orderSign[fills], self._orderPrice[fills], *bar)
+            # Every strategy gets the whole bar's volume to itself, as if it ran alone
+            capacity = self.fillModel.capacity(bars.volume[cursor]) - self.volumeFilled[owners]
+            shares = self.fillModel.allocate(self._orderShares[fills], capacity, owners)
+            for i, owner, price, numShares in zip(fills.tolist(), owners.tolist(), prices.tolist(), shares.tolist()):
+                if numShares == 0:
+                    continue
+                order, slot = self._orders[i], self.slots[owner]
+                try:
+                    if order.tradeType == TradeType.LIMIT_BUY:
+                        slot._execute_buy(price, numShares, self.date, TradeType.LIMIT_BUY)
+                    else:
+                        slot._execute_sell(price, numShares, self.date, TradeType.LIMIT_SELL)
+                    self.volumeFilled[owner] += numShares
+                    if numShares < order.numShares:
+                        order.numShares -= numShares
+                        self._orderShares[i] = order.numShares
+                        continue
+                    order.active = False
+                    remove[i] = True
+                    slot.orderBook._orders.pop(order.orderId, None)
+                    if hasattr(slot.strategy, 'on_order_filled'):
+                        slot.strategy.on_order_filled(order)
+                except Exception as e:
+                    # A rejected fill is logged against its strategy and the order dropped, without stopping the others
+                    slot.transactions.record(
+                        tradeType=order.tradeType, ticker=order.ticker, commission=0, executedSuccessfully=False,
+                        numShares=numShares, pricePerShare=price, totalCost=0, date=self.date, notes=f"Order execution error: {e}",
+                    )
+                    order.active = False
+                    remove[i] = True
+                    slot.orderBook._orders.pop(order.orderId, None)
+        if remove.any():
+            self._keepOrders(~remove)
+
+    def next(self) -> pd.Series:
+        self.cursor += 1
+        self.barDate = self.bars.index[self.cursor]
+        self.date = self.barDate
+        self._check_pending_orders()
+        row = self.hist.iloc[self.cursor]
+        for slot in self.slots:
+            strategy = slot.strategy
+            if strategy.indicators:
+                strategy.updateIndicators(row)
+            strategy.step(row)
+        self._record()
+        return row
+
+    def run(self) -> List[BacktestResult]:
+        lastBar = len(self.bars) - 1
+        while self.cursor < lastBar:
+            self.next()
+        return self.results()
+
+    def results(self) -> List[BacktestResult]:
+        mask = self.recorded
+        index = self.bars.index[mask]
+        cash = self.recordedCash[mask]
+        position = self.recordedPosition[mask]
+        equity = cash + position * self.bars.close[mask][:, None]
+        finalValues = self.totalValues()
+        return [
+            BacktestResult(
+                final_value=float(finalValues[i]),
+                transactions=slot.transactions,
+                strategy=slot.strategy,
+                equity=DataFrame({"cash": cash[:, i], "position": position[:, i], "equity": equity[:, i]}, index=index),
+            )
+            for i, slot in enumerate(self.slots)
+        ]
+
+    def summary(self) -> DataFrame:
+        values = self.totalValues()
+        return DataFrame({
+            "final_value": values,
+            "total_return": values / self.initialCash - 1,
+            "position": self.positions,
+            "num_transactions": [len(slot.transactions) for slot in self.slots],
+        })
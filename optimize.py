@@ -0,0 +1,218 @@
+import itertools
+import os
+import random
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Sequence, Type, Union
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+from pyBacktest.data import DataSource, DataFrameSource, MemoryMappedStore, getDefaultDataSource, _toTimestamp
+from pyBacktest.fillModels import FillModel
+from pyBacktest.strategy import Strategy
+from pyBacktest.indicatorCache import IndicatorCache, setDefaultIndicatorCache
+from pyBacktest.utils import calculateDrawdown, calculateSharpeRatio
+
+if TYPE_CHECKING:
+    from multiprocessing.shared_memory import SharedMemory
+
+SearchSpace = Dict[str, Union[Sequence[Any], Callable[[random.Random], Any]]]
+
+
+class SharedHistory:
+    def __init__(self, values: 'SharedMemory', index: 'SharedMemory', spec: dict) -> None:
+        self._values = values
+        self._index = index
+        self.spec = spec
+
+    @classmethod
+    def create(cls, hist: DataFrame) -> 'SharedHistory':
+        from multiprocessing import shared_memory
+        numeric = hist.select_dtypes(include="number")
+        values = np.ascontiguousarray(numeric.to_numpy(dtype=np.float64).T)
+        timestamps = np.asarray(hist.index.values.astype("datetime64[ns]").view(np.int64))
+        valuesBlock = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+        indexBlock = shared_memory.SharedMemory(create=True, size=max(timestamps.nbytes, 1))
+        np.ndarray(values.shape, np.float64, buffer=valuesBlock.buf)[:] = values
+        np.ndarray(timestamps.shape, np.int64, buffer=indexBlock.buf)[:] = timestamps
+        spec = {
+            "values": valuesBlock.name,
+            "index": indexBlock.name,
+            "shape": values.shape,
+            "columns": list(numeric.columns),
+            "tz": str(hist.index.tz) if getattr(hist.index, "tz", None) is not None else None,
+            "indexName": hist.index.name,
+        }
+        return cls(valuesBlock, indexBlock, spec)
+
+    @classmethod
+    def attach(cls, spec: dict) -> 'SharedHistory':
+        from multiprocessing import shared_memory
+        return cls(
+            shared_memory.SharedMemory(name=spec["values"]),
+            shared_memory.SharedMemory(name=spec["index"]),
+            spec,
+        )
+
+    def frame(self) -> DataFrame:
+        shape = tuple(self.spec["shape"])
+        values = np.ndarray(shape, np.float64, buffer=self._values.buf)
+        timestamps = np.ndarray((shape[1],), np.int64, buffer=self._index.buf)
+        index = pd.DatetimeIndex(timestamps.view("datetime64[ns]"), name=self.spec["indexName"])
+        if self.spec["tz"] is not None:
+            index = index.tz_localize("UTC").tz_convert(self.spec["tz"])
+        return DataFrame(dict(zip(self.spec["columns"], values)), index=index, copy=False)
+
+    def close(self) -> None:
+        self._values.close()
+        self._index.close()
+
+    def unlink(self) -> None:
+        self._values.unlink()
+        self._index.unlink()
+
+
+def gridSearch(params: Dict[str, Iterable[Any]]) -> List[Dict[str, Any]]:
+    names = list(params)
+    return [dict(zip(names, values)) for values in itertools.product(*(list(params[name]) for name in names))]
+
+
+def randomSearch(params: SearchSpace, numSamples: int, seed: Optional[int] = None) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    trials = []
+    for _ in range(numSamples):
+        trials.append({
+            name: space(rng) if callable(space) else rng.choice(list(space))
+            for name, space in params.items()
+        })
+    return trials
+
+
+_worker: Dict[str, Any] = {}
+
+
+def _initWorker(spec: Optional[dict], settings: dict) -> None:
+    if spec is None:
+        # Memory-mapped histories are reopened from disk and share the page cache with every other worker
+        _worker["source"] = MemoryMappedStore(settings["storeRoot"])
+    else:
+        shared = SharedHistory.attach(spec)
+        _worker["shared"] = shared
+        _worker["source"] = DataFrameSource(shared.frame())
+    _worker["settings"] = settings
+    if settings["indicatorCacheDir"] is not None:
+        setDefaultIndicatorCache(IndicatorCache(cacheDir=settings["indicatorCacheDir"]))
+
+
+def _runTrial(params: Dict[str, Any]) -> Dict[str, Any]:
+    from pyBacktest.backtest import Backtest
+
+    settings = _worker["settings"]
+    row: Dict[str, Any] = dict(params)
+    try:
+        strategy = settings["strategyClass"]().setParams(**params)
+        backtest = Backtest(
+            ticker=settings["ticker"],
+            cash=settings["cash"],
+            strategy=strategy,
+            commision=settings["commision"],
+            commisionType=settings["commisionType"],
+            interval=settings["interval"],
+            startDate=settings["startDate"],
+            endDate=settings["endDate"],
+            dataSource=_worker["source"],
+            fillModel=settings["fillModel"],
+            engine=settings["engine"],
+        )
+        result = backtest.run()
+        row["final_value"] = float(result.final_value)
+        row["total_return"] = float(result.final_value) / settings["cash"] - 1
+        row["num_transactions"] = len(result.transactions)
+        returns = result.returns()
+        row["sharpe_ratio"] = float(calculateSharpeRatio(returns)) if len(returns) > 1 else np.nan
+        row["max_drawdown"] = float(calculateDrawdown(result.equity["equity"])[0])
+        row["error"] = None
+    except Exception as e:
+        row["final_value"] = np.nan
+        row["total_return"] = np.nan
+        row["num_transactions"] = 0
+        row["sharpe_ratio"] = np.nan
+        row["max_drawdown"] = np.nan
+        row["error"] = f"{type(e).__name__}: {e}"
+    return row
+
+
+def optimize(
+    strategyClass: Type[Strategy],
+    params: SearchSpace,
+    ticker: str,
+    cash: float,
+    startDate: datetime,
+    endDate: datetime,
+    dataSource: Optional[DataSource] = None,
+    interval: str = "1d",
+    commision: float = 0.0,
+    commisionType: str = "FLAT",
+    method: str = "grid",
+    numSamples: int = 100,
+    seed: Optional[int] = None,
+    maxWorkers: Optional[int] = None,
+    rankBy: str = "final_value",
+    ascending: bool = False,
+    indicatorCacheDir: Optional[str] = None,
+    fillModel: Optional[FillModel] = None,
+    engine: str = "pandas",
+) -> DataFrame:
+    if method == "grid":
+        trials = gridSearch(params)
+    elif method == "random":
+        trials = randomSearch(params, numSamples, seed)
+    else:
+        raise ValueError(f"Invalid search method: {method}, accepted methods are grid and random")
+
+    source = dataSource if dataSource is not None else getDefaultDataSource()
+    start = _toTimestamp(startDate).tz_convert("America/New_York")
+    end = _toTimestamp(endDate).tz_convert("America/New_York")
+    hist = source.history(ticker.upper(), start, end, interval)
+
+    settings = {
+        "strategyClass": strategyClass,
+        "ticker": ticker,
+        "cash": cash,
+        "commision": commision,
+        "commisionType": commisionType,
+        "interval": interval,
+        "startDate": startDate,
+        "endDate": endDate,
+        "indicatorCacheDir": indicatorCacheDir,
+        "fillModel": fillModel,
+        "engine": engine,
+    }
+    workers = min(maxWorkers or os.cpu_count() or 1, max(len(trials), 1))
+    mapped = isinstance(source, MemoryMappedStore)
+    if mapped:
+        settings["storeRoot"] = source.root
+
+    if workers == 1:
+        _worker["source"] = source if mapped else DataFrameSource(hist)
+        _worker["settings"] = settings
+        try:
+            rows = [_runTrial(trial) for trial in trials]
+        finally:
+            _worker.clear()
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        # History goes into shared memory once; tasks only carry their parameter dict
+        shared = None if mapped else SharedHistory.create(hist)
+        try:
+            chunksize = max(1, len(trials) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers, initializer=_initWorker, initargs=(shared.spec if shared is not None else None, settings)) as executor:
+                rows = list(executor.map(_runTrial, trials, chunksize=chunksize))
+        finally:
+            if shared is not None:
+                shared.close()
+                shared.unlink()
+
+    results = DataFrame(rows)
+    if results.empty:
+        return results
+    return results.sort_values(rankBy, ascending=ascending, na_position="last").reset_index(drop=True)
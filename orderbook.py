@@ -0,0 +1,93 @@
+import heapq
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+from pyBacktest.tradeTypes import TradeType, Order, InvalidOrderError
+
+
+class OrderBook:
+    def __init__(self) -> None:
+        self._orders: Dict[int, Order] = {}
+        # Heaps hold (key, orderId); cancelled ids are skipped lazily when they reach the top
+        self._buys: List[Tuple[float, int]] = []
+        self._sells: List[Tuple[float, int]] = []
+        self._expiries: List[Tuple[datetime, int]] = []
+        self._nextId = 0
+        self._stale = 0
+
+    def add(self, order: Order) -> Order:
+        if order.tradeType == TradeType.LIMIT_BUY:
+            heap, key = self._buys, -order.targetPrice
+        elif order.tradeType == TradeType.LIMIT_SELL:
+            heap, key = self._sells, order.targetPrice
+        else:
+            raise InvalidOrderError(f"Unsupported pending order type: {order.tradeType}")
+        order.orderId = self._nextId
+        self._nextId += 1
+        self._orders[order.orderId] = order
+        heapq.heappush(heap, (key, order.orderId))
+        if order.duration == 'DAY':
+            heapq.heappush(self._expiries, (order.orderDate, order.orderId))
+        return order
+
+    def requeue(self, order: Order) -> Order:
+        # Puts a matched but unfilled or partially filled order back under its original id and priority
+        heap, key = (self._buys, -order.targetPrice) if order.tradeType == TradeType.LIMIT_BUY else (self._sells, order.targetPrice)
+        self._orders[order.orderId] = order
+        heapq.heappush(heap, (key, order.orderId))
+        if order.duration == 'DAY':
+            # A compaction while the order was out of the book may have dropped its expiry entry
+            heapq.heappush(self._expiries, (order.orderDate, order.orderId))
+        return order
+
+    def get(self, orderId: int) -> Optional[Order]:
+        return self._orders.get(orderId)
+
+    def cancel(self, orderId: int) -> Optional[Order]:
+        order = self._orders.pop(orderId, None)
+        if order is not None:
+            self._stale += 1
+            if self._stale > len(self._orders) + 64:
+                self._compact()
+        return order
+
+    def _compact(self) -> None:
+        self._buys = [entry for entry in self._buys if entry[1] in self._orders]
+        self._sells = [entry for entry in self._sells if entry[1] in self._orders]
+        self._expiries = [entry for entry in self._expiries if entry[1] in self._orders]
+        heapq.heapify(self._buys)
+        heapq.heapify(self._sells)
+        heapq.heapify(self._expiries)
+        self._stale = 0
+
+    def expired(self, date: datetime) -> List[Order]:
+        expired = {}
+        while self._expiries and self._expiries[0][0] < date:
+            _, orderId = heapq.heappop(self._expiries)
+            order = self._orders.get(orderId)
+            if order is not None:
+                expired[orderId] = order
+        return list(expired.values())
+
+    def _popCrossed(self, heap: List[Tuple[float, int]], limit: float) -> List[Order]:
+        crossed = []
+        while heap and heap[0][0] <= limit:
+            _, orderId = heapq.heappop(heap)
+            order = self._orders.pop(orderId, None)
+            if order is not None and order.active:
+                crossed.append(order)
+        return crossed
+
+    def match(self, low: float, high: float) -> List[Order]:
+        # Buys trigger once the bar trades at or below their target, sells at or above
+        triggered = self._popCrossed(self._buys, -low) + self._popCrossed(self._sells, high)
+        triggered.sort(key=lambda order: order.orderId)
+        return triggered
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    def __iter__(self) -> Iterator[Order]:
+        return iter(list(self._orders.values()))
+
+    def __contains__(self, orderId: int) -> bool:
+        return orderId in self._orders
@@ -1,22 +1,20 @@
-from pyBacktest.tradeTypes import TradeType, Order, Transaction
+from pyBacktest.tradeTypes import TradeType, Order
 from datetime import datetime
 
-def cancel_order(backtest, order_index: int) -> bool:
-    if 0 <= order_index < len(backtest.pending_orders):
-        order = backtest.pending_orders[order_index]
+def cancel_order(backtest, orderId: int) -> bool:
+    order = backtest.orderBook.cancel(orderId)
+    if order is not None:
         order.active = False
-        backtest.transactions.append(
-            Transaction(
-                tradeType=TradeType.Cancel,
-                ticker=order.ticker,
-                commission=0,
-                executedSuccessfully=True,
-                numShares=order.numShares,
-                pricePerShare=order.targetPrice,
-                totalCost=0,
-                date=backtest.date,
-                notes="Order canceled"
-            )
+        backtest.transactions.record(
+            tradeType=TradeType.Cancel,
+            ticker=order.ticker,
+            commission=0,
+            executedSuccessfully=True,
+            numShares=order.numShares,
+            pricePerShare=order.targetPrice,
+            totalCost=0,
+            date=backtest.date,
+            notes="Order canceled"
         )
         return True
     return False
@@ -30,5 +28,4 @@ def submit_gtc_order(backtest, tradeType: TradeType, numShares: int, targetPrice
         duration='GTC',
         orderDate=backtest.date
     )
-    backtest.pending_orders.append(order)
-    return order
\ No newline at end of file
+    return backtest.orderBook.add(order)
@@ -0,0 +1,365 @@
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+from pyBacktest.commissions import calculate_commission_array
+from pyBacktest.data import DataSource, getDefaultDataSource, _toTimestamp
+from pyBacktest.fillModels import FillModel
+from pyBacktest.results import BacktestResult
+from pyBacktest.strategy import Strategy
+from pyBacktest.transactionLog import TransactionLog
+from pyBacktest.tradeTypes import TradeType, InsufficientFundsError, InsufficientSharesError, InvalidOrderError, InsufficientLiquidityError
+
+BUY_TYPES = (TradeType.BUY, TradeType.MARKET_BUY, TradeType.LIMIT_BUY, TradeType.SHORT_COVER)
+SELL_TYPES = (TradeType.SELL, TradeType.MARKET_SELL, TradeType.LIMIT_SELL, TradeType.SHORT_SELL)
+
+
+def _rounds(assets: np.ndarray) -> List[np.ndarray]:
+    # Splits a batch into rounds that touch each asset at most once, keeping batch order within an asset
+    if len(np.unique(assets)) == len(assets):
+        return [np.arange(len(assets))]
+    order = np.argsort(assets, kind="stable")
+    sortedAssets = assets[order]
+    starts = np.r_[True, sortedAssets[1:] != sortedAssets[:-1]]
+    groupStart = np.maximum.accumulate(np.where(starts, np.arange(len(assets)), 0))
+    occurrence = np.empty(len(assets), dtype=np.int64)
+    occurrence[order] = np.arange(len(assets)) - groupStart
+    return [np.flatnonzero(occurrence == r) for r in range(occurrence.max() + 1)]
+
+
+class PanelData:
+    FIELDS = ("Open", "High", "Low", "Close", "Volume")
+
+    def __init__(self, index: pd.DatetimeIndex, tickers: List[str], fields: Dict[str, np.ndarray], valid: np.ndarray) -> None:
+        self.index = index
+        self.tickers = tickers
+        self.open = fields["Open"]
+        self.high = fields["High"]
+        self.low = fields["Low"]
+        self.close = fields["Close"]
+        self.volume = fields["Volume"]
+        self.valid = valid
+
+    @classmethod
+    def fromFrames(cls, frames: Dict[str, DataFrame]) -> 'PanelData':
+        tickers = [ticker.upper() for ticker in frames]
+        index = None
+        for frame in frames.values():
+            index = frame.index if index is None else index.union(frame.index)
+        if index is None:
+            index = pd.DatetimeIndex([])
+        numBars, numAssets = len(index), len(tickers)
+
+        fields = {name: np.full((numBars, numAssets), np.nan) for name in cls.FIELDS}
+        for column, frame in enumerate(frames.values()):
+            rows = index.get_indexer(frame.index)
+            for name in cls.FIELDS:
+                if name in frame.columns:
+                    fields[name][rows, column] = frame[name].to_numpy(dtype=np.float64)
+        valid = ~np.isnan(fields["Close"])
+
+        # Assets without a bar keep their last close for valuation and cannot trade
+        close = DataFrame(fields["Close"]).ffill().to_numpy()
+        for name in ("Open", "High", "Low"):
+            fields[name] = np.where(np.isnan(fields[name]), close, fields[name])
+        fields["Close"] = close
+        fields["Volume"] = np.nan_to_num(fields["Volume"])
+        return cls(index, tickers, {k: np.ascontiguousarray(v) for k, v in fields.items()}, valid)
+
+    def field(self, name: str) -> np.ndarray:
+        return getattr(self, name.lower())
+
+    def frame(self, name: str = "Close") -> DataFrame:
+        return DataFrame(self.field(name), index=self.index, columns=self.tickers)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+
+class PanelBar:
+    def __init__(self, panel: PanelData, cursor: int) -> None:
+        self.name = panel.index[cursor]
+        self.tickers = panel.tickers
+        self.open = panel.open[cursor]
+        self.high = panel.high[cursor]
+        self.low = panel.low[cursor]
+        self.close = panel.close[cursor]
+        self.volume = panel.volume[cursor]
+        self.valid = panel.valid[cursor]
+
+    def __getitem__(self, field: str) -> np.ndarray:
+        return getattr(self, field.lower())
+
+
+class PortfolioStrategy(Strategy):
+    def initialize(self, backtest: 'PortfolioBacktest') -> None:
+        self.backtest = backtest
+        self.data = backtest.panel
+        self.setup()
+
+    def get_position(self, ticker: Optional[str] = None) -> Union[int, np.ndarray]:
+        if ticker is None:
+            return self.backtest.positions.copy()
+        return int(self.backtest.positions[self.backtest.tickerIndex[ticker.upper()]])
+
+    def get_market_state(self) -> Dict[str, object]:
+        return {
+            'cash': self.backtest.cash,
+            'positions': self.backtest.positions.copy(),
+            'total_value': self.backtest.totalValue()
+        }
+
+
+class PortfolioBacktest:
+    def __init__(
+        self,
+        tickers: Sequence[str],
+        cash: float,
+        strategy: PortfolioStrategy,
+        commision: float = 0.0,
+        commisionType: str = "FLAT",
+        interval: str = "1d",
+        startDate: datetime = datetime(2024, 1, 1),
+        endDate: datetime = datetime(2024, 2, 1),
+        dataSource: Optional[DataSource] = None,
+        fillModel: Optional[FillModel] = None,
+    ) -> None:
+        self.tickers: List[str] = [ticker.upper() for ticker in tickers]
+        self.tickerIndex: Dict[str, int] = {ticker: i for i, ticker in enumerate(self.tickers)}
+        self.commision = commision
+        self.commisionType = commisionType
+        self.date = _toTimestamp(startDate).tz_convert("America/New_York")
+        self.endDate = _toTimestamp(endDate).tz_convert("America/New_York")
+
+        self.dataSource = dataSource if dataSource is not None else getDefaultDataSource()
+        self.panel = PanelData.fromFrames({
+            ticker: self.dataSource.history(ticker, self.date, self.endDate, interval)
+            for ticker in self.tickers
+        })
+        self.cursor = 0
+
+        numAssets = len(self.tickers)
+        self.cash: float = cash
+        self.positions = np.zeros(numAssets, dtype=np.int64)
+        self.costBasis = np.zeros(numAssets, dtype=np.float64)
+        self.transactions: TransactionLog = TransactionLog()
+        self.fillModel: FillModel = fillModel if fillModel is not None else FillModel()
+        self.volumeFilled = np.zeros(numAssets, dtype=np.float64)
+
+        # Resting limit orders for every asset, kept as parallel arrays so a bar checks them all at once
+        self._orderAsset = np.zeros(0, dtype=np.int64)
+        self._orderSign = np.zeros(0, dtype=np.int64)
+        self._orderShares = np.zeros(0, dtype=np.int64)
+        self._orderPrice = np.zeros(0, dtype=np.float64)
+        self._orderBar = np.zeros(0, dtype=np.int64)
+        self._orderGTC = np.zeros(0, dtype=bool)
+
+        self.strategy = strategy
+        self.strategy.initialize(self)
+
+    def calculateCommisions(self, prices: np.ndarray, numShares: np.ndarray) -> np.ndarray:
+        return calculate_commission_array(self.commisionType, self.commision, prices, numShares)
+
+    def _marks(self) -> np.ndarray:
+        # Assets that have not listed yet have no close to carry forward and are valued at 0
+        close = self.panel.close[self.cursor]
+        return np.where(np.isnan(close), 0.0, close)
+
+    def totalValue(self) -> float:
+        return float(self.cash + self.positions @ self._marks())
+
+    def getPosition(self, ticker: str) -> int:
+        return int(self.positions[self.tickerIndex[ticker.upper()]])
+
+    def weights(self) -> np.ndarray:
+        values = self.positions * self._marks()
+        total = self.totalValue()
+        return values / total if total else np.zeros_like(values)
+
+    def _fill(self, assets: np.ndarray, deltas: np.ndarray, prices: np.ndarray, tradeTypes: Optional[Sequence[TradeType]] = None, notes: str = "") -> None:
+        traded = deltas != 0
+        assets, deltas, prices = assets[traded], deltas[traded], prices[traded]
+        if not len(assets):
+            return
+        shares = np.abs(deltas)
+        commissions = self.calculateCommisions(prices, shares)
+        cashAfter = self.cash - np.sum(deltas * prices) - np.sum(commissions)
+        if cashAfter < 0:
+            raise InsufficientFundsError(f"Need ${self.cash - cashAfter:,.2f}, have ${self.cash:,.2f}")
+
+        before = np.empty(len(assets), dtype=np.int64)
+        profitLoss = np.empty(len(assets), dtype=np.float64)
+        # Repeated fills on one asset apply in batch order, each against the position the previous one left
+        for rows in _rounds(assets):
+            asset, delta, price, numShares = assets[rows], deltas[rows], prices[rows], shares[rows]
+            position = self.positions[asset]
+            after = position + delta
+            # Average cost per asset; a position that shrinks or flips realizes P&L on the closed shares
+            closing = np.where(np.sign(position) != np.sign(delta), np.minimum(np.abs(position), numShares), 0)
+            avgCost = np.divide(self.costBasis[asset], np.abs(position), out=np.zeros(len(asset)), where=position != 0)
+            opened = numShares - closing
+            basis = np.where(np.sign(after) == np.sign(position), self.costBasis[asset] - closing * avgCost, 0.0)
+            basis = basis + opened * price
+
+            self.positions[asset] = after
+            self.costBasis[asset] = np.where(after != 0, basis, 0.0)
+            before[rows] = position
+            profitLoss[rows] = closing * (price - avgCost) * np.sign(position)
+        self.cash = float(cashAfter)
+
+        if tradeTypes is None:
+            tradeTypes = np.where(
+                deltas > 0,
+                np.where(before < 0, TradeType.SHORT_COVER.value, TradeType.BUY.value),
+                np.where(before > 0, TradeType.SELL.value, TradeType.SHORT_SELL.value),
+            )
+        else:
+            tradeTypes = np.array([t.value for t in tradeTypes])
+        self.transactions.recordBatch(
+            tradeType=tradeTypes,
+            ticker=[self.tickers[asset] for asset in assets],
+            commission=commissions,
+            numShares=shares,
+            pricePerShare=prices,
+            totalCost=shares * prices,
+            date=self.panel.index[np.full(len(assets), self.cursor)],
+            profitLoss=profitLoss,
+            notes=notes,
+        )
+
+    def trade(self, ticker: str, tradeType: TradeType, numShares: int, price: float = None, duration: str = 'DAY') -> None:
+        asset = self.tickerIndex[ticker.upper()]
+        if tradeType in (TradeType.LIMIT_BUY, TradeType.LIMIT_SELL):
+            if price is None:
+                raise ValueError("Price must be specified for limit orders")
+            self._orderAsset = np.append(self._orderAsset, asset)
+            self._orderSign = np.append(self._orderSign, 1 if tradeType == TradeType.LIMIT_BUY else -1)
+            self._orderShares = np.append(self._orderShares, numShares)
+            self._orderPrice = np.append(self._orderPrice, price)
+            self._orderBar = np.append(self._orderBar, self.cursor)
+            self._orderGTC = np.append(self._orderGTC, duration == 'GTC')
+            return
+        if tradeType in (TradeType.MARKET_BUY, TradeType.MARKET_SELL):
+            sign = 1 if tradeType == TradeType.MARKET_BUY else -1
+            price = float(self.fillModel.marketPrices(sign, *self._barFields(self.cursor, asset)))
+            if self.fillModel.participation is not None:
+                numShares = min(numShares, int(max(self.fillCapacity(np.array([asset]))[0], 0)))
+                if numShares == 0:
+                    raise InsufficientLiquidityError(f"No volume left to fill a market order for {ticker.upper()} on {self.date}")
+        elif price is None:
+            price = self.panel.close[self.cursor, asset]
+
+        position = self.positions[asset]
+        if tradeType in (TradeType.SELL, TradeType.MARKET_SELL) and numShares > max(position, 0):
+            raise InsufficientSharesError("Not enough shares to sell")
+        if tradeType == TradeType.SHORT_COVER and numShares > max(-position, 0):
+            raise InsufficientSharesError("Not enough short positions to cover")
+        if tradeType in BUY_TYPES:
+            delta = numShares
+        elif tradeType in SELL_TYPES:
+            delta = -numShares
+        else:
+            raise InvalidOrderError(f"Unsupported trade type: {tradeType}")
+        self._fill(np.array([asset]), np.array([delta]), np.array([price], dtype=np.float64), [tradeType])
+        self.volumeFilled[asset] += numShares
+
+    def rebalancePortfolio(self, target_allocations: Union[Dict[str, float], np.ndarray]) -> None:
+        if isinstance(target_allocations, dict):
+            # Assets missing from the dict keep their current position
+            weights = np.full(len(self.tickers), np.nan)
+            for ticker, weight in target_allocations.items():
+                weights[self.tickerIndex[ticker.upper()]] = weight
+        else:
+            weights = np.asarray(target_allocations, dtype=np.float64)
+        prices = self.panel.close[self.cursor]
+        tradable = self.panel.valid[self.cursor] & ~np.isnan(prices) & (prices > 0) & ~np.isnan(weights)
+        safePrices = np.where(tradable, prices, 1.0)
+        shares = np.trunc(np.where(tradable, weights, 0.0) * self.totalValue() / safePrices)
+        target = np.where(tradable, shares, self.positions)
+        deltas = target.astype(np.int64) - self.positions
+        # Sells first so their proceeds fund the buys
+        order = np.argsort(deltas > 0, kind="stable")
+        self._fill(order, deltas[order], prices[order], notes="Rebalance")
+
+    def cancelOrders(self, ticker: Optional[str] = None) -> int:
+        if ticker is None:
+            keep = np.zeros(len(self._orderAsset), dtype=bool)
+        else:
+            keep = self._orderAsset != self.tickerIndex[ticker.upper()]
+        cancelled = int((~keep).sum())
+        self._keepOrders(keep)
+        return cancelled
+
+    def _keepOrders(self, keep: np.ndarray) -> None:
+        self._orderAsset = self._orderAsset[keep]
+        self._orderSign = self._orderSign[keep]
+        self._orderShares = self._orderShares[keep]
+        self._orderPrice = self._orderPrice[keep]
+        self._orderBar = self._orderBar[keep]
+        self._orderGTC = self._orderGTC[keep]
+
+    def _barFields(self, cursor: int, assets: Union[int, np.ndarray]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        panel = self.panel
+        return panel.open[cursor, assets], panel.high[cursor, assets], panel.low[cursor, assets], panel.close[cursor, assets]
+
+    def fillCapacity(self, assets: np.ndarray) -> np.ndarray:
+        return self.fillModel.capacity(self.panel.volume[self.cursor, assets]) - self.volumeFilled[assets]
+
+    def _check_pending_orders(self) -> None:
+        self.volumeFilled[:] = 0.0
+        if not len(self._orderAsset):
+            return
+        expired = ~self._orderGTC & (self._orderBar < self.cursor)
+        bar = self._barFields(self.cursor, self._orderAsset)
+        valid = self.panel.valid[self.cursor, self._orderAsset]
+        triggered = ~expired & valid & self.fillModel.triggered(self._orderSign, self._orderPrice, *bar)
+        remaining = self._orderShares.copy()
+        if triggered.any():
+            fills = np.flatnonzero(triggered)
+            assets = self._orderAsset[fills]
+            prices = self.fillModel.limitPrices(self._orderSign[fills], self._orderPrice[fills], *(field[fills] for field in bar))
+            shares = self.fillModel.allocate(self._orderShares[fills], self.fillCapacity(assets), assets)
+            # Orders that got no volume this bar keep resting untouched
+            allocated = shares > 0
+            triggered[fills[~allocated]] = False
+            fills, assets, prices, shares = fills[allocated], assets[allocated], prices[allocated], shares[allocated]
+            deltas = self._orderSign[fills] * shares
+            # Limit sells only close existing longs, matching the single-asset engine. Orders on one asset are
+            # checked in book order against the position the earlier fills leave
+            fillable = np.zeros(len(deltas), dtype=bool)
+            positions = self.positions.copy()
+            for rows in _rounds(assets):
+                ok = (deltas[rows] > 0) | (positions[assets[rows]] + deltas[rows] >= 0)
+                fillable[rows] = ok
+                positions[assets[rows[ok]]] += deltas[rows[ok]]
+            fills, assets, prices, deltas = fills[fillable], assets[fillable], prices[fillable], deltas[fillable]
+            flows = np.cumsum(deltas * prices + self.calculateCommisions(prices, np.abs(deltas)))
+            affordable = np.minimum.accumulate(self.cash - flows >= 0)
+            fills, assets, prices, deltas = fills[affordable], assets[affordable], prices[affordable], deltas[affordable]
+            tradeTypes = [TradeType.LIMIT_BUY if d > 0 else TradeType.LIMIT_SELL for d in deltas]
+            self._fill(assets, deltas, prices, tradeTypes)
+            np.add.at(self.volumeFilled, assets, np.abs(deltas))
+            remaining[fills] -= np.abs(deltas)
+        # Triggered orders leave the book whether they filled or were rejected, unless only partly filled
+        partial = triggered & (remaining > 0) & (remaining < self._orderShares)
+        self._orderShares = remaining
+        self._keepOrders(~(expired | triggered) | partial)
+
+    def next(self) -> PanelBar:
+        self.cursor += 1
+        self.date = self.panel.index[self.cursor]
+        self._check_pending_orders()
+        bar = PanelBar(self.panel, self.cursor)
+        self.strategy.step(bar)
+        return bar
+
+    def run(self) -> BacktestResult:
+        lastBar = len(self.panel) - 1
+        while self.cursor < lastBar:
+            self.next()
+        return BacktestResult(
+            final_value=self.totalValue(),
+            transactions=self.transactions,
+            strategy=self.strategy
+        )
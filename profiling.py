@@ -0,0 +1,131 @@
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, TextIO
+import pandas as pd
+
+# Backtest methods timed when profiling is on; trade execution is nested inside strategy.step
+BACKTEST_PHASES = (
+    "_check_pending_orders",
+    "_record",
+    "_execute_buy",
+    "_execute_sell",
+    "_execute_market_buy",
+    "_execute_market_sell",
+    "_execute_short_sell",
+    "_execute_short_cover",
+    "totalValue",
+    "getPosition",
+)
+STRATEGY_PHASES = ("step", "updateIndicators")
+
+SampleHook = Callable[[int, pd.Timestamp, Dict[str, int]], None]
+
+
+@dataclass
+class ProfileReport:
+    phases: pd.DataFrame
+    bars: int
+    wallTime: float
+    barsPerSecond: float
+    folded: Dict[str, int] = field(default_factory=dict)
+
+    def __str__(self) -> str:
+        header = f"{self.bars} bars in {self.wallTime:.3f}s ({self.barsPerSecond:,.0f} bars/s)"
+        return header + "\n" + self.phases.to_string(float_format=lambda v: f"{v:.6f}")
+
+
+class Profiler:
+    def __init__(self, sampleHook: Optional[SampleHook] = None) -> None:
+        self.sampleHook = sampleHook
+        self.totals: Dict[str, int] = {}
+        self.calls: Dict[str, int] = {}
+        self.folded: Dict[str, int] = {}
+        self.bars = 0
+        self.wallTime = 0.0
+        # Each frame is [name, startNs, childNs]
+        self._stack: List[List[Any]] = []
+        self._bar: Dict[str, int] = {}
+        self._runStart: Optional[float] = None
+
+    def start(self, name: str) -> None:
+        self._stack.append([name, time.perf_counter_ns(), 0])
+
+    def stop(self) -> None:
+        end = time.perf_counter_ns()
+        name, start, childNs = self._stack.pop()
+        elapsed = end - start
+        self.totals[name] = self.totals.get(name, 0) + elapsed
+        self.calls[name] = self.calls.get(name, 0) + 1
+        # Folded stacks carry self time, the format flame-graph tools expect
+        path = ";".join([frame[0] for frame in self._stack] + [name])
+        self._bar[path] = self._bar.get(path, 0) + elapsed - childNs
+        if self._stack:
+            self._stack[-1][2] += elapsed
+
+    def wrap(self, name: str, func: Callable) -> Callable:
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            self.start(name)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.stop()
+        timed.__wrapped__ = func
+        return timed
+
+    def attach(self, backtest: Any) -> None:
+        # Instance attributes shadow the methods, so the engine's own calls go through the timers
+        for name in BACKTEST_PHASES:
+            setattr(backtest, name, self.wrap(name.lstrip("_"), getattr(backtest, name)))
+        for name in STRATEGY_PHASES:
+            setattr(backtest.strategy, name, self.wrap(f"strategy.{name}", getattr(backtest.strategy, name)))
+
+    def endBar(self, cursor: int, date: pd.Timestamp, advanced: bool = True) -> None:
+        # A step that lands on the same bar again keeps its time but is not another bar
+        if advanced:
+            self.bars += 1
+        for path, elapsed in self._bar.items():
+            self.folded[path] = self.folded.get(path, 0) + elapsed
+        if self.sampleHook is not None:
+            self.sampleHook(cursor, date, self._bar)
+        self._bar = {}
+
+    def runStarted(self) -> None:
+        self._runStart = time.perf_counter()
+
+    def runFinished(self) -> None:
+        if self._runStart is not None:
+            self.wallTime += time.perf_counter() - self._runStart
+            self._runStart = None
+
+    def report(self) -> ProfileReport:
+        names = sorted(self.totals, key=self.totals.get, reverse=True)
+        seconds = [self.totals[name] / 1e9 for name in names]
+        calls = [self.calls[name] for name in names]
+        phases = pd.DataFrame({
+            "calls": calls,
+            "total_s": seconds,
+            "mean_us": [s / c * 1e6 for s, c in zip(seconds, calls)],
+            "share": [s / self.wallTime if self.wallTime else float("nan") for s in seconds],
+        }, index=pd.Index(names, name="phase"))
+        return ProfileReport(
+            phases=phases,
+            bars=self.bars,
+            wallTime=self.wallTime,
+            barsPerSecond=self.bars / self.wallTime if self.wallTime else float("nan"),
+            folded=dict(self.folded),
+        )
+
+
+class FoldedStackWriter:
+    def __init__(self, stream: TextIO) -> None:
+        self.stream = stream
+
+    def __call__(self, cursor: int, date: pd.Timestamp, sample: Dict[str, int]) -> None:
+        # One "frame;frame;frame nanoseconds" line per stack per bar, readable by flamegraph.pl and speedscope
+        for path, elapsed in sample.items():
+            self.stream.write(f"{path} {elapsed}\n")
+
+
+def writeFolded(report: ProfileReport, stream: TextIO) -> None:
+    for path, elapsed in sorted(report.folded.items()):
+        stream.write(f"{path} {elapsed}\n")
@@ -0,0 +1,123 @@
+import re
+from typing import Dict, Optional, Tuple
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+from pandas.tseries.frequencies import to_offset
+from pandas.tseries.offsets import Tick
+from pyBacktest.bars import BarArrays
+
+# yfinance interval units, longest first so "mo" and "wk" win over "m" and "w"
+_UNITS = (
+    ("mo", "months", "MS"),
+    ("wk", "weeks", "W-MON"),
+    ("min", "minutes", "min"),
+    ("m", "minutes", "min"),
+    ("h", "hours", "h"),
+    ("d", "days", "D"),
+    ("w", "weeks", "W-MON"),
+)
+_INTERVAL = re.compile(r"^\s*(\d+)\s*([a-zA-Z]+)\s*$")
+
+AGGREGATIONS = {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"}
+
+
+def _splitInterval(interval: str) -> Tuple[int, str, str]:
+    match = _INTERVAL.match(interval)
+    if match is not None:
+        value, unit = int(match.group(1)), match.group(2).lower()
+        for name, offsetName, rule in _UNITS:
+            if unit == name:
+                return value, offsetName, rule
+    raise ValueError(f"Invalid interval: {interval}, expected a count and one of m, h, d, wk and mo such as 5m, 1h, 1d, 1wk or 1mo")
+
+
+def parseInterval(interval: str) -> pd.DateOffset:
+    value, offsetName, _ = _splitInterval(interval)
+    return pd.DateOffset(**{offsetName: value})
+
+
+def intervalRule(interval: str) -> str:
+    value, _, rule = _splitInterval(interval)
+    return f"{value}{rule}"
+
+
+def resampleOHLCV(hist: DataFrame, interval: str) -> DataFrame:
+    # Bins are closed and labelled on the left, so a bar is stamped with the time its period opened
+    aggregations = {column: how for column, how in AGGREGATIONS.items() if column in hist.columns}
+    bars = hist.resample(intervalRule(interval), label="left", closed="left").agg(aggregations)
+    return bars[bars["Close"].notna()] if "Close" in bars.columns else bars
+
+
+class Timeframe:
+    def __init__(self, hist: DataFrame, interval: str) -> None:
+        self.interval = interval
+        self.frame: DataFrame = resampleOHLCV(hist, interval)
+        self.bars: BarArrays = BarArrays.fromFrame(self.frame)
+
+        # Coarse bar each base row falls in, and how many coarse bars have closed once that row is seen.
+        # A coarse bar closes on its last base row; the final one stays open since the history may stop mid-bin.
+        self.index = hist.index
+        self.group: np.ndarray = np.maximum(self.frame.index.searchsorted(hist.index, side="right") - 1, 0)
+        lastOfBin = np.r_[self.group[1:] != self.group[:-1], False] if len(self.group) else np.zeros(0, dtype=bool)
+        self.completed: np.ndarray = self.group + lastOfBin.astype(np.int64)
+
+        # Running aggregates of the bar still forming at each base row
+        grouped = hist.groupby(self.group, sort=False)
+        self._partial: Dict[str, np.ndarray] = {}
+        for column, how in AGGREGATIONS.items():
+            if column not in hist.columns:
+                continue
+            series = grouped[column]
+            running = {"first": series.transform("first"), "max": series.cummax(), "min": series.cummin(), "last": hist[column], "sum": series.cumsum()}[how]
+            self._partial[column] = running.to_numpy(dtype=np.float64)
+
+    def count(self, cursor: int) -> int:
+        return int(self.completed[cursor])
+
+    def history(self, cursor: int, partial: bool = False) -> DataFrame:
+        closed = self.frame.iloc[:self.completed[cursor]]
+        if not partial or self.completed[cursor] > self.group[cursor]:
+            return closed
+        forming = DataFrame({column: [values[cursor]] for column, values in self._partial.items()}, index=self.frame.index[self.group[cursor]:self.group[cursor] + 1])
+        return pd.concat([closed, forming])
+
+    def last(self, cursor: int) -> Optional[pd.Series]:
+        count = self.completed[cursor]
+        return self.frame.iloc[count - 1] if count else None
+
+    def forming(self, cursor: int) -> pd.Series:
+        return pd.Series({column: values[cursor] for column, values in self._partial.items()}, name=self.frame.index[self.group[cursor]])
+
+    def align(self, values: pd.Series) -> pd.Series:
+        # Maps a series over coarse bars back onto the base index, each row seeing only bars that had closed
+        values = np.asarray(values, dtype=np.float64)
+        out = np.full(len(self.completed), np.nan)
+        seen = self.completed > 0
+        out[seen] = values[self.completed[seen] - 1]
+        return pd.Series(out, index=self.index)
+
+
+class MultiTimeframe:
+    def __init__(self, hist: DataFrame) -> None:
+        self.hist = hist
+        self._views: Dict[Tuple[int, str], Timeframe] = {}
+
+    def _key(self, interval: str) -> Tuple[str, int]:
+        # Equal periods share one view, so "60m" and "1h" resample once
+        offset = to_offset(intervalRule(interval))
+        return (offset.nanos, "") if isinstance(offset, Tick) else (0, offset.freqstr)
+
+    def view(self, interval: str) -> Timeframe:
+        key = self._key(interval)
+        timeframe = self._views.get(key)
+        if timeframe is None:
+            timeframe = Timeframe(self.hist, interval)
+            self._views[key] = timeframe
+        return timeframe
+
+    def __contains__(self, interval: str) -> bool:
+        return self._key(interval) in self._views
+
+    def clear(self) -> None:
+        self._views.clear()
@@ -1,14 +1,100 @@
 from dataclasses import dataclass
-from typing import List
+from typing import List, Optional, Union, TYPE_CHECKING
 from pyBacktest.tradeTypes import Holding
+from pyBacktest.transactionLog import TransactionLog
+from pyBacktest.profiling import ProfileReport
+import numpy as np
 import pandas as pd
 
+if TYPE_CHECKING:
+    from pyBacktest.monteCarlo import MonteCarloResult
+    from pyBacktest.strategy import Strategy
+
+class EquityRecorder:
+    def __init__(self, index: pd.DatetimeIndex) -> None:
+        numBars = len(index)
+        self.index = index
+        self.cash = np.zeros(numBars, dtype=np.float64)
+        self.position = np.zeros(numBars, dtype=np.int64)
+        self.equity = np.zeros(numBars, dtype=np.float64)
+        self.recorded = np.zeros(numBars, dtype=bool)
+
+    def record(self, cursor: int, cash: float, position: int, price: float) -> None:
+        self.cash[cursor] = cash
+        self.position[cursor] = position
+        self.equity[cursor] = cash + position * price
+        self.recorded[cursor] = True
+
+    def frame(self) -> pd.DataFrame:
+        mask = self.recorded
+        return pd.DataFrame(
+            {"cash": self.cash[mask], "position": self.position[mask], "equity": self.equity[mask]},
+            index=self.index[mask],
+        )
+
+class StreamEquityRecorder:
+    def __init__(self, capacity: int = 1024) -> None:
+        self._size = 0
+        self._tz = None
+        self.dates = np.zeros(capacity, dtype=np.int64)
+        self.cash = np.zeros(capacity, dtype=np.float64)
+        self.position = np.zeros(capacity, dtype=np.int64)
+        self.equity = np.zeros(capacity, dtype=np.float64)
+
+    def record(self, date: pd.Timestamp, cash: float, position: int, price: float) -> None:
+        if self._size == len(self.dates):
+            for name in ("dates", "cash", "position", "equity"):
+                array = getattr(self, name)
+                setattr(self, name, np.concatenate([array, np.zeros_like(array)]))
+        if self._size == 0:
+            self._tz = date.tz
+        i = self._size
+        self.dates[i] = date.value
+        self.cash[i] = cash
+        self.position[i] = position
+        self.equity[i] = cash + position * price
+        self._size += 1
+
+    def frame(self) -> pd.DataFrame:
+        n = self._size
+        index = pd.DatetimeIndex(self.dates[:n].view("datetime64[ns]"))
+        if self._tz is not None:
+            index = index.tz_localize("UTC").tz_convert(self._tz)
+        return pd.DataFrame(
+            {"cash": self.cash[:n].copy(), "position": self.position[:n].copy(), "equity": self.equity[:n].copy()},
+            index=index,
+        )
+
 @dataclass
 class BacktestResult:
     final_value: float
-    transactions: List[Holding]
+    transactions: Union[TransactionLog, List[Holding]]
     strategy: 'Strategy'
+    equity: Optional[pd.DataFrame] = None
+    profile: Optional[ProfileReport] = None
 
     def returns(self) -> pd.Series:
-        prices = [t.pricePerShare for t in self.transactions]
-        return pd.Series(prices).pct_change().dropna()
\ No newline at end of file
+        if self.equity is not None:
+            return self.equity["equity"].pct_change().dropna()
+        if isinstance(self.transactions, TransactionLog):
+            prices = self.transactions.to_numpy()["pricePerShare"]
+        else:
+            prices = [t.pricePerShare for t in self.transactions]
+        return pd.Series(prices).pct_change().dropna()
+
+    def stats(self) -> dict:
+        from pyBacktest.utils import calculateReturnStats
+        equity = self.equity["equity"] if self.equity is not None else None
+        return calculateReturnStats(self.returns(), equity)
+
+    def monteCarlo(self, method: str = "bootstrap", cash: Optional[float] = None, **kwargs) -> 'MonteCarloResult':
+        from pyBacktest.monteCarlo import monteCarloReturns, monteCarloTrades
+        if cash is None:
+            if self.equity is None or not len(self.equity):
+                raise ValueError("cash is required when the result has no equity curve")
+            cash = float(self.equity["equity"].iloc[0])
+        if method == "bootstrap":
+            return monteCarloReturns(self.returns(), initialValue=cash, **kwargs)
+        if method in ("shuffle", "resample"):
+            return monteCarloTrades(self.transactions, cash, replace=method == "resample", **kwargs)
+        raise ValueError(f"Invalid Monte Carlo method: {method}, accepted methods are bootstrap, shuffle and resample")
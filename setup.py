@@ -15,8 +15,14 @@ setup(
     install_requires=[
         "pandas",
         "numpy",
-        "yfinance"
+        "typing-extensions"
     ],
+    extras_require={
+        "yfinance": ["yfinance"],
+        "gui": ["customtkinter", "plotly"],
+        "fast": ["numba"],
+        "all": ["yfinance", "customtkinter", "plotly", "numba"],
+    },
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: GNU Lesser General Public License v3 (LGPLv3)",
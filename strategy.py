@@ -1,27 +1,64 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, TYPE_CHECKING
+from typing import Dict, Any, Callable, List, Optional, TYPE_CHECKING
 import pandas as pd
 from pyBacktest.utils import calculateSMA
 from pyBacktest.tradeTypes import TradeType, Holding, Transaction, Order
+from pyBacktest.indicators import OnlineIndicator
+from pyBacktest.indicatorCache import getDefaultIndicatorCache
 from typing_extensions import deprecated
 
 if TYPE_CHECKING:
     from pyBacktest.backtest import Backtest
 
 class Strategy(ABC):
+    indicators: List[OnlineIndicator] = []
+
     def __init__(self) -> None:
-        self.data: Optional[pd.DataFrame] = None
+        self._data: Optional[pd.DataFrame] = None
         self.current_position: int = 0
         self.backtest: Optional['Backtest'] = None
+        self.indicators = []
 
     def initialize(self, backtest: 'Backtest') -> None:
         self.backtest = backtest
-        self.data = backtest.hist
         self.setup()
 
+    @property
+    def data(self) -> Optional[pd.DataFrame]:
+        # Read through to the backtest so a streaming run always sees its current window
+        data = getattr(self, "_data", None)
+        if data is None and getattr(self, "backtest", None) is not None:
+            return self.backtest.hist
+        return data
+
+    @data.setter
+    def data(self, value: Optional[pd.DataFrame]) -> None:
+        self._data = value
+
     def setup(self) -> None:
         pass
 
+    def addIndicator(self, indicator: OnlineIndicator) -> OnlineIndicator:
+        if "indicators" not in self.__dict__:
+            self.indicators = []
+        self.indicators.append(indicator)
+        return indicator
+
+    def indicator(self, func: Callable, *args: Any, **kwargs: Any) -> Any:
+        return getDefaultIndicatorCache().compute(func, *args, **kwargs)
+
+    def timeframe(self, interval: str, partial: bool = False) -> pd.DataFrame:
+        return self.backtest.timeframe(interval, partial)
+
+    def updateIndicators(self, row: pd.Series) -> None:
+        for indicator in self.indicators:
+            indicator.update(row)
+
+    def setParams(self, **params: Any) -> 'Strategy':
+        for name, value in params.items():
+            setattr(self, name, value)
+        return self
+
     @deprecated("Use step() instead")
     def next(self, row: pd.Series) -> None:
         pass
@@ -31,8 +68,7 @@ class Strategy(ABC):
         pass
 
     def get_position(self) -> int:
-        position = sum(h.numShares if not h.shortPosition else -h.numShares for h in self.backtest.holdings)
-        return position
+        return self.backtest.getPosition()
 
     def get_market_state(self) -> Dict[str, Any]:
         return {
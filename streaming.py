@@ -0,0 +1,330 @@
+import asyncio
+import os
+from datetime import datetime
+from numbers import Number
+from typing import Any, AsyncIterable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+from pyBacktest.backtest import Backtest
+from pyBacktest.bars import BarArrays
+from pyBacktest.checkpoint import Snapshot
+from pyBacktest.ledger import PositionLedger
+from pyBacktest.orderbook import OrderBook
+from pyBacktest.fillModels import FillModel
+from pyBacktest.profiling import Profiler
+from pyBacktest.resampling import resampleOHLCV
+from pyBacktest.results import BacktestResult, StreamEquityRecorder
+from pyBacktest.strategy import Strategy
+from pyBacktest.transactionLog import TransactionLog
+from pyBacktest.tradeTypes import CheckpointError
+
+BarItem = Union[pd.Series, Tuple[datetime, Mapping[str, Any]]]
+
+
+def unpackBar(item: BarItem) -> Tuple[pd.Timestamp, Mapping[str, Any]]:
+    if isinstance(item, pd.Series):
+        return pd.Timestamp(item.name), item
+    date, values = item
+    return pd.Timestamp(date), values
+
+
+class RollingWindow:
+    def __init__(self, maxBars: int, columns: List[str]) -> None:
+        if maxBars < 1:
+            raise ValueError("maxBars must be at least 1")
+        if "Close" not in columns:
+            raise ValueError("Streamed bars need a Close field")
+        self.maxBars = maxBars
+        self.columns = pd.Index(columns)
+        # Twice the window so the live rows only get shifted back once every maxBars appends
+        rows = 2 * maxBars
+        self._values = np.zeros((rows, len(columns)), dtype=np.float64, order="F")
+        self._dates = np.zeros(rows, dtype=np.int64)
+        self._start = 0
+        self._end = 0
+        self._tz = None
+        self._frame: Optional[DataFrame] = None
+        self.count = 0
+
+        def column(name: str, fallback: np.ndarray) -> np.ndarray:
+            return self._values[:, columns.index(name)] if name in columns else fallback
+
+        close = column("Close", None)
+        self.bars = BarArrays(
+            index=self._dates.view("datetime64[ns]"),
+            open=column("Open", close),
+            high=column("High", close),
+            low=column("Low", close),
+            close=close,
+            volume=column("Volume", np.zeros(rows, dtype=np.float64)),
+        )
+
+    @property
+    def cursor(self) -> int:
+        return self._end - 1
+
+    def append(self, date: pd.Timestamp, values: Mapping[str, Any]) -> int:
+        if self._end == len(self._dates):
+            keep = self.maxBars - 1
+            self._values[:keep] = self._values[self._end - keep:self._end]
+            self._dates[:keep] = self._dates[self._end - keep:self._end]
+            self._end = keep
+        if self.count == 0:
+            self._tz = date.tz
+        elif date.tz is None and self._tz is not None:
+            date = date.tz_localize(self._tz)
+        row = self._end
+        self._values[row] = [values[name] for name in self.columns]
+        self._dates[row] = date.value
+        self._end += 1
+        self._start = max(0, self._end - self.maxBars)
+        self._frame = None
+        self.count += 1
+        return row
+
+    def index(self) -> pd.DatetimeIndex:
+        index = pd.DatetimeIndex(self._dates[self._start:self._end].view("datetime64[ns]"))
+        return index.tz_localize("UTC").tz_convert(self._tz) if self._tz is not None else index
+
+    def frame(self) -> DataFrame:
+        # Copied so a strategy holding on to an old window is not rewritten when the buffer shifts
+        if self._frame is None:
+            self._frame = DataFrame(
+                self._values[self._start:self._end].copy(),
+                index=self.index(),
+                columns=self.columns,
+            )
+        return self._frame
+
+    def row(self) -> pd.Series:
+        return pd.Series(self._values[self.cursor], index=self.columns, name=self.date())
+
+    def date(self) -> pd.Timestamp:
+        date = pd.Timestamp(int(self._dates[self.cursor]))
+        return date.tz_localize("UTC").tz_convert(self._tz) if self._tz is not None else date
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+
+class FileReplaySource:
+    def __init__(self, path: str, chunksize: int = 10_000, dateColumn: Optional[str] = None, tz: Optional[str] = None) -> None:
+        self.path = path
+        self.chunksize = chunksize
+        self.dateColumn = dateColumn
+        self.tz = tz
+
+    def _chunks(self) -> Iterator[DataFrame]:
+        extension = os.path.splitext(self.path)[1].lower()
+        if extension == ".csv":
+            yield from pd.read_csv(self.path, chunksize=self.chunksize)
+        elif extension == ".parquet":
+            import pyarrow.parquet as pq
+            for batch in pq.ParquetFile(self.path).iter_batches(batch_size=self.chunksize):
+                yield batch.to_pandas()
+        else:
+            raise ValueError(f"Unsupported replay file: {self.path}, accepted formats are .csv and .parquet")
+
+    @staticmethod
+    def _parseDates(values: pd.Series) -> pd.DatetimeIndex:
+        try:
+            return pd.DatetimeIndex(pd.to_datetime(values))
+        except ValueError:
+            # Offsets that change across DST come back as mixed timezones
+            return pd.DatetimeIndex(pd.to_datetime(values, utc=True))
+
+    def frames(self) -> Iterator[DataFrame]:
+        # Only one chunk is ever in memory, however large the file is
+        for chunk in self._chunks():
+            if self.dateColumn is not None:
+                dates = self._parseDates(chunk.pop(self.dateColumn))
+            elif isinstance(chunk.index, pd.DatetimeIndex):
+                dates = chunk.index
+            else:
+                dates = self._parseDates(chunk.pop(chunk.columns[0]))
+            if self.tz is not None:
+                dates = dates.tz_localize(self.tz) if dates.tz is None else dates.tz_convert(self.tz)
+            numeric = chunk.select_dtypes(include="number")
+            numeric.index = dates
+            yield numeric
+
+    def __iter__(self) -> Iterator[Tuple[pd.Timestamp, Dict[str, float]]]:
+        for frame in self.frames():
+            columns = list(frame.columns)
+            for date, values in zip(frame.index, frame.to_numpy(dtype=np.float64)):
+                yield date, dict(zip(columns, values))
+
+
+class StreamingBacktest(Backtest):
+    def __init__(
+        self,
+        ticker: str,
+        cash: float | int,
+        strategy: Strategy,
+        commision: float | int = 0.0,
+        commisionType: str = "FLAT",
+        maxBars: int = 500,
+        lotMatching: str = "FIFO",
+        transactionLog: Optional[TransactionLog] = None,
+        recordEquity: bool = True,
+        profile: Union[bool, Profiler] = False,
+        fillModel: Optional[FillModel] = None,
+    ) -> None:
+        self.ticker: str = ticker.upper()
+        self.commision: float = commision
+        self.commisionType: str = commisionType
+        self.maxBars: int = maxBars
+        self.engine: str = "stream"
+        self._data = None
+
+        self.window: Optional[RollingWindow] = None
+        self.bars: Optional[BarArrays] = None
+        self.cursor: int = -1
+        self.date: Optional[pd.Timestamp] = None
+        self.barDate: Optional[pd.Timestamp] = None
+        self.transactions: TransactionLog = transactionLog if transactionLog is not None else TransactionLog()
+
+        self.cash: float = cash
+        self.ledger: PositionLedger = PositionLedger(lotMatching)
+        self.orderBook: OrderBook = OrderBook()
+        self.fillModel: FillModel = fillModel if fillModel is not None else FillModel()
+        self.volumeFilled: float = 0.0
+        self.recorder: Optional[StreamEquityRecorder] = StreamEquityRecorder() if recordEquity else None
+        self.queue: Optional[asyncio.Queue] = None
+        self.stopped: bool = False
+        self.strategy = strategy
+        self.strategy.initialize(self)
+        self.profiler: Optional[Profiler] = Profiler() if profile is True else (profile or None)
+        if self.profiler is not None:
+            self.profiler.attach(self)
+
+    def checkpoint(self, path: Optional[str] = None) -> Snapshot:
+        raise CheckpointError("A streaming backtest cannot be checkpointed")
+
+    def restore(self, path: Optional[str] = None, cursor: Optional[int] = None, strategyState: bool = True) -> Snapshot:
+        raise CheckpointError("A streaming backtest cannot be checkpointed")
+
+    @property
+    def hist(self) -> DataFrame:
+        if self.window is None:
+            return DataFrame(columns=list(BarArrays.FIELDS), index=pd.DatetimeIndex([]))
+        return self.window.frame()
+
+    @property
+    def barsProcessed(self) -> int:
+        return self.window.count if self.window is not None else 0
+
+    def getValidDate(self, target_date: pd.Timestamp) -> pd.Timestamp:
+        return self.barDate
+
+    def timeframe(self, interval: str, partial: bool = False) -> DataFrame:
+        # The window moves every bar so nothing is cached; a live feed cannot tell its newest bin has closed
+        # until a bar from the next one arrives, so that bin only shows with partial=True
+        if self.window is None:
+            return self.hist
+        bars = resampleOHLCV(self.hist, interval)
+        return bars if partial else bars.iloc[:-1]
+
+    def push(self, item: BarItem) -> pd.Series:
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.start("bar")
+        try:
+            date, values = unpackBar(item)
+            if self.window is None:
+                columns = [name for name, value in values.items() if isinstance(value, (Number, np.number))]
+                self.window = RollingWindow(self.maxBars, columns)
+                self.bars = self.window.bars
+            self.cursor = self.window.append(date, values)
+            self.barDate = self.window.date()
+            self.date = self.barDate
+            self._check_pending_orders()
+            row = self.window.row()
+            if self.strategy.indicators:
+                self.strategy.updateIndicators(row)
+            self.strategy.step(row)
+            self._record()
+        finally:
+            if profiler is not None:
+                profiler.stop()
+        if profiler is not None:
+            profiler.endBar(self.cursor, self.barDate)
+        return row
+
+    def _record(self) -> None:
+        if self.recorder is not None:
+            self.recorder.record(self.barDate, self.cash, self.getPosition(), self.bars.close[self.cursor])
+
+    def stop(self) -> None:
+        self.stopped = True
+
+    def result(self) -> BacktestResult:
+        if self.profiler is not None:
+            self.profiler.runFinished()
+        return BacktestResult(
+            final_value=self.totalValue() if self.window is not None else self.cash,
+            transactions=self.transactions,
+            strategy=self.strategy,
+            equity=self.recorder.frame() if self.recorder is not None else None,
+            profile=self.profiler.report() if self.profiler is not None else None
+        )
+
+    def run(self, feed: Iterable[BarItem]) -> BacktestResult:
+        self.stopped = False
+        if self.profiler is not None:
+            self.profiler.runStarted()
+        for item in feed:
+            self.push(item)
+            if self.stopped:
+                break
+        return self.result()
+
+    def makeQueue(self, maxsize: int = 1024) -> asyncio.Queue:
+        # Producers awaiting put() on a full queue are throttled to the engine's pace; put None to finish
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        return self.queue
+
+    async def _drain(self, queue: asyncio.Queue) -> AsyncIterable[BarItem]:
+        # An item is only marked done once the engine has pushed it, so a producer awaiting queue.join() sees it processed
+        while True:
+            item = await queue.get()
+            try:
+                if item is None:
+                    return
+                yield item
+            finally:
+                queue.task_done()
+
+    async def arun(self, feed: Union[AsyncIterable[BarItem], Iterable[BarItem], asyncio.Queue, None] = None, yieldEvery: int = 1) -> BacktestResult:
+        if feed is None:
+            feed = self.queue if self.queue is not None else self.makeQueue()
+        drain = None
+        if isinstance(feed, asyncio.Queue):
+            feed = drain = self._drain(feed)
+        self.stopped = False
+        if self.profiler is not None:
+            self.profiler.runStarted()
+        processed = 0
+        if hasattr(feed, "__aiter__"):
+            try:
+                async for item in feed:
+                    self.push(item)
+                    processed += 1
+                    if self.stopped:
+                        break
+                    if yieldEvery and processed % yieldEvery == 0:
+                        await asyncio.sleep(0)
+            finally:
+                # Marks the item in hand done when the run stops or a push raises
+                if drain is not None:
+                    await drain.aclose()
+        else:
+            for item in feed:
+                self.push(item)
+                processed += 1
+                if self.stopped:
+                    break
+                if yieldEvery and processed % yieldEvery == 0:
+                    await asyncio.sleep(0)
+        return self.result()
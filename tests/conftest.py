@@ -0,0 +1,15 @@
+import importlib.util
+import os
+import sys
+
+# The repository root is the pyBacktest package itself, so it is importable under that name without installing
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if "pyBacktest" not in sys.modules:
+    if os.path.basename(ROOT) == "pyBacktest":
+        sys.path.insert(0, os.path.dirname(ROOT))
+    else:
+        spec = importlib.util.spec_from_file_location("pyBacktest", os.path.join(ROOT, "__init__.py"), submodule_search_locations=[ROOT])
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["pyBacktest"] = module
+        spec.loader.exec_module(module)
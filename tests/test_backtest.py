@@ -0,0 +1,48 @@
+from datetime import datetime
+import pytest
+from pyBacktest.backtest import Backtest
+from pyBacktest.benchmarks.synthetic import generateOHLCV
+from pyBacktest.data import DataFrameSource
+from pyBacktest.strategy import Strategy
+from pyBacktest.tradeTypes import TradeType
+
+
+class CountSteps(Strategy):
+    def setup(self):
+        self.steps = 0
+
+    def step(self, row):
+        self.steps += 1
+
+
+@pytest.fixture
+def businessDays():
+    return generateOHLCV(30)
+
+
+def makeBacktest(hist, **kwargs):
+    return Backtest("SYN", 10_000, CountSteps(), startDate=datetime(2000, 1, 3), endDate=datetime(2000, 2, 14), dataSource=DataFrameSource(hist), **kwargs)
+
+
+def test_default_engine_is_pandas(businessDays):
+    backtest = makeBacktest(businessDays)
+    assert backtest.engine == "pandas"
+    backtest.run()
+    # One step per calendar day; weekends land on a trading day again
+    assert backtest.strategy.steps == (backtest.endDate - backtest.bars.index[0]).days
+
+
+def test_array_engine_steps_each_bar_once(businessDays):
+    backtest = makeBacktest(businessDays, engine="array")
+    backtest.run()
+    assert backtest.strategy.steps == len(backtest.bars) - 1
+
+
+def test_holdings_are_read_only(businessDays):
+    backtest = makeBacktest(businessDays, engine="array")
+    backtest.trade(TradeType.BUY, 5)
+    assert isinstance(backtest.holdings, tuple)
+    with pytest.raises(AttributeError):
+        backtest.holdings.append(backtest.holdings[0])
+    backtest.applyStopLoss(-1.0)
+    assert backtest.holdings == () and backtest.getPosition() == 0
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pyBacktest.utils import (
+    calculateBatchBeta, calculateBatchDrawdown, calculateBatchReturnStats, calculateBatchSharpeRatio,
+    calculateBatchVaR, calculateBatchVolatility, calculateBeta, calculateDrawdown, calculateReturnStats,
+    calculateRollingBeta, calculateRollingSharpeRatio, calculateRollingVolatility, calculateSharpeRatio,
+    calculateVaR, calculateVolatility,
+)
+
+
+@pytest.fixture(scope="module")
+def runs():
+    rng = np.random.default_rng(11)
+    index = pd.date_range("2020-01-01", periods=300, freq="B")
+    frame = pd.DataFrame(rng.normal(0.0005, 0.01, (300, 4)), index=index, columns=["a", "b", "c", "d"])
+    # Runs of different lengths share the array, padded with NaN
+    frame.iloc[200:, 2] = np.nan
+    frame.iloc[:50, 3] = np.nan
+    return frame
+
+
+@pytest.fixture(scope="module")
+def market(runs):
+    return pd.Series(np.random.default_rng(12).normal(0.0003, 0.009, len(runs)), index=runs.index)
+
+
+def test_matches_single_series(runs, market):
+    sharpe = calculateBatchSharpeRatio(runs)
+    volatility = calculateBatchVolatility(runs)
+    beta = calculateBatchBeta(runs, market)
+    var = calculateBatchVaR(runs)
+    for name in runs:
+        column = runs[name].dropna()
+        assert sharpe[name] == pytest.approx(calculateSharpeRatio(column), rel=1e-9)
+        assert volatility[name] == pytest.approx(calculateVolatility(column), rel=1e-9)
+        assert beta[name] == pytest.approx(calculateBeta(runs[name], market), rel=1e-9)
+        assert var[name] == pytest.approx(calculateVaR(column), rel=1e-9)
+
+
+def test_return_stats_match_single_series(runs):
+    equity = (1 + runs.fillna(0)).cumprod() * 100
+    stats = calculateBatchReturnStats(runs, equity)
+    assert list(stats.index) == list(runs.columns)
+    for name in runs:
+        expected = calculateReturnStats(runs[name].dropna(), equity[name])
+        for key, value in expected.items():
+            assert stats.loc[name, key] == pytest.approx(value, rel=1e-9)
+
+
+def test_drawdown(runs):
+    equity = (1 + runs.fillna(0)).cumprod()
+    maxDrawdown, current = calculateBatchDrawdown(equity)
+    for name in runs:
+        assert (maxDrawdown[name], current[name]) == pytest.approx(calculateDrawdown(equity[name]), rel=1e-9)
+    empty = calculateBatchDrawdown(np.full((3, 2), np.nan))[0]
+    assert np.isnan(empty).all()
+
+
+def test_arrays_in_arrays_out(runs):
+    values = runs.to_numpy()
+    assert isinstance(calculateBatchSharpeRatio(values), np.ndarray)
+    np.testing.assert_allclose(calculateBatchVolatility(values), calculateBatchVolatility(runs).to_numpy())
+    assert set(calculateBatchReturnStats(values)) == {"totalReturn", "annualizedReturn", "volatility", "sharpeRatio", "maxDrawdown"}
+
+
+def test_rolling_match_single_series(runs, market):
+    window = 20
+    sharpe = calculateRollingSharpeRatio(runs, window)
+    volatility = calculateRollingVolatility(runs, window)
+    beta = calculateRollingBeta(runs, market, window)
+    assert sharpe.shape == runs.shape
+    for end in (window, 120, 299):
+        rows = slice(end - window + 1, end + 1)
+        for name in ("a", "b"):
+            column = runs[name].iloc[rows]
+            assert sharpe[name].iloc[end] == pytest.approx(calculateSharpeRatio(column), rel=1e-9)
+            assert volatility[name].iloc[end] == pytest.approx(calculateVolatility(column), rel=1e-9)
+            assert beta[name].iloc[end] == pytest.approx(calculateBeta(column, market.iloc[rows]), rel=1e-9)
+    assert sharpe["a"].iloc[:window - 1].isna().all()
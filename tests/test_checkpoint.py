@@ -0,0 +1,88 @@
+from datetime import datetime
+import pandas as pd
+import pytest
+from pyBacktest.backtest import Backtest
+from pyBacktest.benchmarks.synthetic import generateOHLCV
+from pyBacktest.data import DataFrameSource
+from pyBacktest.indicators import SMA
+from pyBacktest.streaming import StreamingBacktest
+from pyBacktest.strategy import Strategy
+from pyBacktest.tradeTypes import CheckpointError, TradeType
+
+
+class MeanReversion(Strategy):
+    def setup(self):
+        self.sma = self.addIndicator(SMA(10))
+        self.steps = 0
+
+    def step(self, row):
+        self.steps += 1
+        if not self.sma.ready:
+            return
+        close = row["Close"]
+        position = self.backtest.getPosition()
+        if close < self.sma.value and position < 50:
+            self.backtest.trade(TradeType.BUY, 5)
+        elif close > self.sma.value and position > 0:
+            self.backtest.trade(TradeType.SELL, min(3, position))
+        if self.steps % 7 == 0:
+            self.backtest.submitGTCOrder(TradeType.LIMIT_BUY, 1, round(close * 0.99, 2))
+
+
+@pytest.fixture(scope="module")
+def source():
+    return DataFrameSource(generateOHLCV(300))
+
+
+def makeBacktest(source, engine, **kwargs):
+    return Backtest(
+        "SYN", 10_000, MeanReversion(), commision=1.0, startDate=datetime(2000, 1, 3), endDate=datetime(2001, 2, 1),
+        dataSource=source, engine=engine, **kwargs,
+    )
+
+
+def assertSameRun(result, expected):
+    assert result.final_value == pytest.approx(expected.final_value, abs=1e-9)
+    pd.testing.assert_frame_equal(result.transactions.to_pandas(), expected.transactions.to_pandas())
+    pd.testing.assert_frame_equal(result.equity, expected.equity)
+
+
+@pytest.mark.parametrize("engine", ["array", "pandas"])
+def test_resume_matches_full_run(source, engine, tmp_path):
+    expected = makeBacktest(source, engine).run()
+    assert len(expected.transactions) > 20
+
+    checkpointed = makeBacktest(source, engine, checkpointPath=str(tmp_path), checkpointEvery=25)
+    assertSameRun(checkpointed.run(), expected)
+    assert len(checkpointed.checkpoints.snapshots()) >= 8
+
+    for cursor in (30, 140, 260):
+        resumed = makeBacktest(source, engine, checkpointPath=str(tmp_path))
+        snapshot = resumed.restore(cursor=cursor)
+        assert snapshot.cursor <= cursor
+        assertSameRun(resumed.run(), expected)
+
+
+def test_branch_with_fresh_strategy_state(source, tmp_path):
+    makeBacktest(source, "array", checkpointPath=str(tmp_path), checkpointEvery=50).run()
+    resumed = makeBacktest(source, "array", checkpointPath=str(tmp_path))
+    resumed.restore(cursor=100, strategyState=False)
+    assert resumed.strategy.steps == 0
+    assert resumed.cursor == 100
+
+
+def test_profiled_run_can_checkpoint(source, tmp_path):
+    expected = makeBacktest(source, "array").run()
+    profiled = makeBacktest(source, "array", profile=True, checkpointPath=str(tmp_path), checkpointEvery=50)
+    profiled.run()
+    resumed = makeBacktest(source, "array", checkpointPath=str(tmp_path))
+    resumed.restore(cursor=120)
+    assertSameRun(resumed.run(), expected)
+
+
+def test_streaming_backtest_rejects_checkpoints(tmp_path):
+    stream = StreamingBacktest("SYN", 10_000, MeanReversion())
+    with pytest.raises(CheckpointError):
+        stream.checkpoint(str(tmp_path))
+    with pytest.raises(CheckpointError):
+        stream.restore(str(tmp_path))
@@ -0,0 +1,76 @@
+from datetime import datetime
+import numpy as np
+import pandas as pd
+import pytest
+from pyBacktest.backtest import Backtest
+from pyBacktest.benchmarks.suite import Idle, ReadmeSMACross
+from pyBacktest.benchmarks.synthetic import generateDailyOHLCV, generateOHLCV
+from pyBacktest.data import DataFrameSource, MemoryMappedStore
+from pyBacktest.tradeTypes import DataUnavailableError
+
+
+def test_naive_index_is_new_york_time():
+    hist = generateDailyOHLCV(30)
+    naive = hist.copy()
+    naive.index = naive.index.tz_localize(None)
+    source = DataFrameSource(naive)
+    assert str(source.frame.index.tz) == "America/New_York"
+    sliced = source.history("SYN", datetime(2000, 1, 4), datetime(2000, 1, 10))
+    pd.testing.assert_frame_equal(sliced, hist.loc["2000-01-04":"2000-01-09"], check_freq=False)
+
+
+def test_backtest_on_naive_index():
+    hist = generateDailyOHLCV(30)
+    hist.index = hist.index.tz_localize(None)
+    backtest = Backtest("SYN", 1000, Idle(), startDate=datetime(2000, 1, 5), endDate=datetime(2000, 2, 1), dataSource=DataFrameSource(hist))
+    assert backtest.barDate == pd.Timestamp("2000-01-05", tz="America/New_York")
+    assert len(backtest.run().equity) == len(backtest.bars)
+
+
+def test_memory_mapped_round_trip(tmp_path):
+    hist = generateOHLCV(100)
+    store = MemoryMappedStore(str(tmp_path))
+    assert store.write("syn", hist) == 100
+    assert store.tickers() == ["SYN"]
+    frame = store.history("SYN", datetime(2000, 1, 1), datetime(2001, 1, 1))
+    pd.testing.assert_frame_equal(frame, hist, check_index_type=False, check_freq=False)
+    # Columns are views of the mapped files, not copies
+    mapped = store._open("SYN", "1d")[1]
+    for name in hist.columns:
+        assert np.shares_memory(frame[name].to_numpy(), mapped[name])
+    sliced = store.history("SYN", datetime(2000, 1, 10), datetime(2000, 1, 20))
+    pd.testing.assert_frame_equal(sliced, hist.loc["2000-01-10":"2000-01-19"], check_index_type=False, check_freq=False)
+    assert np.shares_memory(sliced["Close"].to_numpy(), mapped["Close"])
+
+
+def test_memory_mapped_append_in_chunks(tmp_path):
+    hist = generateOHLCV(90)
+    store = MemoryMappedStore(str(tmp_path))
+    assert store.ingest("SYN", (hist.iloc[i:i + 25] for i in range(0, 90, 25))) == 90
+    pd.testing.assert_frame_equal(store.history("SYN", datetime(2000, 1, 1), datetime(2001, 1, 1)), hist, check_index_type=False, check_freq=False)
+    with pytest.raises(ValueError):
+        store.append("SYN", hist.iloc[-5:])
+    with pytest.raises(DataUnavailableError):
+        store.history("OTHER", datetime(2000, 1, 1), datetime(2001, 1, 1))
+
+
+def test_memory_mapped_naive_index(tmp_path):
+    hist = generateDailyOHLCV(20)
+    hist.index = hist.index.tz_localize(None)
+    store = MemoryMappedStore(str(tmp_path))
+    store.write("SYN", hist)
+    frame = store.history("SYN", datetime(2000, 1, 1), datetime(2001, 1, 1))
+    assert frame.index.tz is None
+    pd.testing.assert_frame_equal(frame, hist, check_index_type=False, check_freq=False)
+
+
+def test_backtest_on_memory_mapped_store(tmp_path):
+    hist = generateOHLCV(300)
+    store = MemoryMappedStore(str(tmp_path))
+    store.write("SYN", hist)
+    settings = dict(ticker="SYN", cash=10_000, startDate=datetime(2000, 1, 3), endDate=datetime(2001, 1, 1), engine="array")
+    mapped = Backtest(strategy=ReadmeSMACross(), dataSource=store, **settings).run()
+    expected = Backtest(strategy=ReadmeSMACross(), dataSource=DataFrameSource(hist), **settings).run()
+    assert len(expected.transactions) > 0
+    assert mapped.final_value == expected.final_value
+    pd.testing.assert_frame_equal(mapped.transactions.to_pandas(), expected.transactions.to_pandas())
@@ -0,0 +1,83 @@
+from datetime import datetime
+import numpy as np
+import pandas as pd
+import pytest
+from pyBacktest.backtest import Backtest
+from pyBacktest.data import DataFrameSource
+from pyBacktest.fillModels import FillModel, OHLCFillModel
+from pyBacktest.strategy import Strategy
+from pyBacktest.tradeTypes import TradeType
+
+BAR = (100.0, 110.0, 90.0, 105.0)
+SIGNS = np.array([1, 1, 1, -1, -1, -1])
+TARGETS = np.array([95.0, 101.0, 106.0, 108.0, 99.0, 111.0])
+
+
+def test_legacy_triggers_on_close_and_fills_at_target():
+    model = FillModel()
+    assert list(model.triggered(SIGNS, TARGETS, *BAR)) == [False, False, True, False, True, False]
+    assert list(model.limitPrices(SIGNS, TARGETS, *BAR)) == list(TARGETS)
+    assert model.marketPrices(1, *BAR) == 100.0
+
+
+def test_ohlc_triggers_on_range_and_fills_gaps_at_open():
+    model = OHLCFillModel()
+    assert list(model.triggered(SIGNS, TARGETS, *BAR)) == [True, True, True, True, True, False]
+    # Targets the open already went through fill at the open instead
+    assert list(model.limitPrices(SIGNS, TARGETS, *BAR)) == [95.0, 100.0, 100.0, 108.0, 100.0, 111.0]
+    assert model.marketPrices(1, *BAR) == 105.0
+
+
+def test_slippage_moves_against_the_order():
+    percentage = OHLCFillModel(slippage=0.01)
+    assert percentage.marketPrices(1, *BAR) == pytest.approx(106.05)
+    assert percentage.marketPrices(-1, *BAR) == pytest.approx(103.95)
+    fixed = FillModel(slippage=0.5, slippageType="FIXED")
+    assert list(fixed.marketPrices(np.array([1, -1]), *BAR)) == [100.5, 99.5]
+    # Limit fills are never slipped
+    assert list(percentage.limitPrices(SIGNS[:1], TARGETS[:1], *BAR)) == [95.0]
+
+
+def test_participation_caps_fills_in_time_priority():
+    model = FillModel(participation=0.1)
+    assert model.capacity(1234.0) == 123
+    assert FillModel().capacity(1234.0) == np.inf
+    assert list(model.allocate(np.array([100, 50, 30]), 123.0)) == [100, 23, 0]
+    groups = np.array([0, 1, 0, 1])
+    assert list(model.allocate(np.array([100, 50, 30, 80]), np.array([110.0, 60.0, 110.0, 60.0]), groups)) == [100, 50, 10, 10]
+    assert list(FillModel().allocate(np.array([100, 50]), 10.0)) == [100, 50]
+
+
+@pytest.mark.parametrize("kwargs", [{"slippageType": "BPS"}, {"marketPrice": "vwap"}, {"participation": 0.0}, {"participation": 1.5}])
+def test_rejects_bad_settings(kwargs):
+    with pytest.raises(ValueError):
+        FillModel(**kwargs)
+
+
+class DipBuyer(Strategy):
+    def step(self, row):
+        if not self.backtest.pending_orders and self.backtest.getPosition() == 0:
+            self.backtest.submitGTCOrder(TradeType.LIMIT_BUY, 10, 95.0)
+
+
+def dipBars():
+    index = pd.date_range("2024-01-02", periods=3, freq="D")
+    return pd.DataFrame({
+        "Open": [100.0, 100.0, 100.0],
+        "High": [101.0, 101.0, 110.0],
+        "Low": [99.0, 99.0, 90.0],
+        "Close": [100.0, 100.0, 105.0],
+        "Volume": [1e6, 1e6, 1e6],
+    }, index=index)
+
+
+@pytest.mark.parametrize("model, filled", [(FillModel(), False), (OHLCFillModel(), True)])
+def test_backtest_uses_fill_model(model, filled):
+    backtest = Backtest("SYN", 10_000, DipBuyer(), startDate=datetime(2024, 1, 2), endDate=datetime(2024, 1, 5), dataSource=DataFrameSource(dipBars()), fillModel=model, engine="array")
+    backtest.run()
+    buys = backtest.transactions.to_pandas().query("tradeType == 'LIMIT_BUY'")
+    if filled:
+        assert list(buys["pricePerShare"]) == [95.0]
+        assert backtest.getPosition() == 10
+    else:
+        assert buys.empty and backtest.getPosition() == 0
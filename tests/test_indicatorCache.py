@@ -0,0 +1,28 @@
+import numpy as np
+from pyBacktest.benchmarks.synthetic import generateDailyOHLCV
+from pyBacktest.indicatorCache import IndicatorCache, fingerprint
+
+
+def mean(series):
+    return float(series.mean())
+
+
+def test_hits_on_equal_content():
+    cache = IndicatorCache()
+    hist = generateDailyOHLCV(50)
+    cache.compute(mean, hist["Close"])
+    cache.compute(mean, hist.copy()["Close"])
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_in_place_edit_is_not_stale():
+    cache = IndicatorCache()
+    hist = generateDailyOHLCV(50)
+    close = hist["Close"]
+    before = cache.compute(mean, close)
+    values = close.to_numpy()
+    values.flags.writeable = True
+    values[:] += 1.0
+    assert fingerprint(close) != fingerprint(generateDailyOHLCV(50)["Close"])
+    assert cache.compute(mean, close) == before + 1.0
+    assert cache.misses == 2
@@ -0,0 +1,67 @@
+from datetime import datetime
+import numpy as np
+import pytest
+from pyBacktest.backtest import Backtest
+from pyBacktest.benchmarks.synthetic import generateOHLCV
+from pyBacktest.data import DataFrameSource
+from pyBacktest.indicators import ATR, EMA, RSI, SMA, VWAP, OnlineIndicator
+from pyBacktest.strategy import Strategy
+from pyBacktest.utils import calculateATR, calculateEMA, calculateRSI, calculateSMA, calculateVWAP
+
+
+@pytest.fixture(scope="module")
+def hist():
+    return generateOHLCV(120)
+
+
+def online(indicator, bars):
+    return np.array([indicator.update(bar) for bar in bars])
+
+
+@pytest.mark.parametrize("indicator, expected", [
+    (lambda: SMA(5), lambda close: calculateSMA(close, 5)),
+    (lambda: EMA(10), lambda close: calculateEMA(close, 10)),
+    (lambda: RSI(14), lambda close: calculateRSI(close, 14)),
+    (lambda: RSI(14, method="wilder"), lambda close: calculateRSI(close, 14, "wilder")),
+])
+def test_matches_batch_versions(hist, indicator, expected):
+    close = hist["Close"]
+    np.testing.assert_allclose(online(indicator(), close.tolist()), expected(close).to_numpy(), rtol=1e-9, equal_nan=True)
+
+
+def test_bar_indicators_match_batch_versions(hist):
+    bars = [row for _, row in hist.iterrows()]
+    atr = calculateATR(hist["High"], hist["Low"], hist["Close"], 14).to_numpy()
+    np.testing.assert_allclose(online(ATR(14), bars)[14:], atr[14:], rtol=1e-9)
+    vwap = calculateVWAP(hist["High"], hist["Low"], hist["Close"], hist["Volume"]).to_numpy()
+    np.testing.assert_allclose(online(VWAP(), bars), vwap, rtol=1e-9)
+
+
+def test_base_needs_update_rule():
+    with pytest.raises(TypeError):
+        OnlineIndicator()
+
+
+class TrackSMA(Strategy):
+    def setup(self):
+        self.sma = self.addIndicator(SMA(5))
+        self.seen = {}
+        self.steps = 0
+
+    def step(self, row):
+        self.steps += 1
+        self.seen[row.name] = self.sma.value
+
+
+def test_pandas_engine_updates_once_per_bar():
+    hist = generateOHLCV(55)
+    strategy = TrackSMA()
+    backtest = Backtest("SYN", 10_000, strategy, startDate=datetime(2000, 1, 3), endDate=datetime(2000, 3, 17), dataSource=DataFrameSource(hist))
+    backtest.run()
+    # Weekends step the same Friday bar again without feeding it to the indicator twice
+    assert strategy.steps > len(backtest.bars)
+    assert strategy.sma.count == len(backtest.bars)
+    expected = calculateSMA(backtest.hist["Close"], 5)
+    for date, value in strategy.seen.items():
+        if not np.isnan(value):
+            assert value == pytest.approx(expected[date], rel=1e-12)
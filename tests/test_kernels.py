@@ -0,0 +1,29 @@
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+from numpy.lib.stride_tricks import sliding_window_view
+from pyBacktest import kernels
+
+
+@pytest.mark.parametrize("level,scale", [(100.0, 1.0), (1e6, 0.01)])
+@pytest.mark.parametrize("period", [2, 20, 250])
+def test_rolling_std_matches_two_pass(level, scale, period):
+    x = level + np.cumsum(np.random.default_rng(0).normal(0, scale, 20_000))
+    expected = np.full(len(x), np.nan)
+    expected[period - 1:] = sliding_window_view(x, period).std(axis=1, ddof=1)
+    result = kernels.rollingStd(x, period, backend="numpy")
+    np.testing.assert_allclose(result, expected, rtol=1e-6, atol=1e-5 * scale)
+
+
+def test_rolling_std_skips_windows_with_nan():
+    x = 100 + np.cumsum(np.random.default_rng(1).normal(size=500))
+    x[200] = np.nan
+    expected = pd.Series(x).rolling(20).std().to_numpy()
+    np.testing.assert_array_equal(np.isnan(kernels.rollingStd(x, 20, backend="numpy")), np.isnan(expected))
+
+
+def test_import_does_not_load_numba():
+    import pyBacktest
+    assert "numba" not in sys.modules
+    assert kernels.getBackend() != "numba"
@@ -0,0 +1,88 @@
+from datetime import datetime
+import pytest
+from pyBacktest.backtest import Backtest
+from pyBacktest.benchmarks.suite import Idle
+from pyBacktest.benchmarks.synthetic import generateDailyOHLCV
+from pyBacktest.data import DataFrameSource
+from pyBacktest.ledger import PositionLedger
+from pyBacktest.tradeTypes import Holding, InsufficientSharesError, TradeType
+
+
+def lot(numShares, price, short=False):
+    return Holding(
+        tradeType=TradeType.SHORT_SELL if short else TradeType.BUY, ticker="SYN", commission=0.0, executedSuccessfully=True,
+        numShares=numShares, totalCost=numShares * price, entryPrice=price, shortPosition=short,
+    )
+
+
+def filled(policy, short=False):
+    ledger = PositionLedger(policy)
+    for price in (10.0, 20.0, 30.0):
+        (ledger.addShort if short else ledger.addLong)(lot(10, price, short))
+    return ledger
+
+
+@pytest.mark.parametrize("policy,profit,remaining", [
+    ("FIFO", 175.0, [(5, 100.0), (10, 300.0)]),
+    ("LIFO", -25.0, [(10, 100.0), (5, 100.0)]),
+    ("AVERAGE", 75.0, [(15, 300.0)]),
+])
+def test_close_long(policy, profit, remaining):
+    ledger = filled(policy)
+    assert ledger.closeLong(15, 25.0) == pytest.approx(profit)
+    assert [(h.numShares, h.totalCost) for h in ledger.holdings()] == remaining
+    assert ledger.longShares == 15
+    assert ledger.longCost == pytest.approx(sum(cost for _, cost in remaining))
+    assert ledger.netPosition == 15
+
+
+@pytest.mark.parametrize("policy,profit", [("FIFO", -175.0), ("LIFO", 25.0), ("AVERAGE", -75.0)])
+def test_close_short(policy, profit):
+    ledger = filled(policy, short=True)
+    assert ledger.closeShort(15, 25.0) == pytest.approx(profit)
+    assert ledger.netPosition == -15
+
+
+def test_average_keeps_one_lot():
+    ledger = filled("AVERAGE")
+    assert len(ledger.holdings()) == 1
+    assert ledger.holdings()[0].entryPrice == pytest.approx(20.0)
+
+
+@pytest.mark.parametrize("policy", ["FIFO", "LIFO", "AVERAGE"])
+def test_closing_everything_clears_cost(policy):
+    ledger = filled(policy)
+    ledger.closeLong(30, 25.0)
+    assert ledger.holdings() == [] and ledger.longShares == 0 and ledger.longCost == 0.0
+
+
+def test_overselling_raises():
+    ledger = filled("FIFO")
+    with pytest.raises(InsufficientSharesError):
+        ledger.closeLong(31, 25.0)
+    with pytest.raises(InsufficientSharesError):
+        ledger.closeShort(1, 25.0)
+
+
+def test_invalid_policy():
+    with pytest.raises(ValueError):
+        PositionLedger("HIFO")
+
+
+@pytest.mark.parametrize("policy,profit", [("FIFO", 175.0), ("LIFO", -25.0), ("AVERAGE", 75.0)])
+def test_backtest_sells_by_policy(policy, profit):
+    backtest = Backtest("SYN", 10_000, Idle(), startDate=datetime(2000, 1, 3), endDate=datetime(2000, 2, 1), dataSource=DataFrameSource(generateDailyOHLCV(30)), lotMatching=policy)
+    for price in (10.0, 20.0, 30.0):
+        backtest.trade(TradeType.BUY, 10, price)
+    backtest.trade(TradeType.SELL, 15, 25.0)
+    assert backtest.transactions[-1].profitLoss == pytest.approx(profit)
+
+
+@pytest.mark.parametrize("policy", ["FIFO", "LIFO", "AVERAGE"])
+def test_returned_holdings_do_not_change(policy):
+    ledger = filled(policy)
+    before = ledger.holdings()
+    snapshot = [(h.numShares, h.totalCost, h.entryPrice) for h in before]
+    ledger.addLong(lot(10, 40.0))
+    ledger.closeLong(15, 25.0)
+    assert [(h.numShares, h.totalCost, h.entryPrice) for h in before] == snapshot
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pyBacktest.monteCarlo import MonteCarloResult, bootstrapPaths, monteCarloReturns, monteCarloTrades, shuffleTrades
+from pyBacktest.results import BacktestResult
+
+
+def test_bootstrap_keeps_blocks_together():
+    returns = np.arange(10, dtype=np.float64)
+    paths = bootstrapPaths(returns, 50, blockSize=5, rng=np.random.default_rng(1))
+    assert paths.shape == (10, 50)
+    # Each block is a run of consecutive returns, wrapping around the end
+    for block in (paths[:5], paths[5:]):
+        assert (np.diff(block, axis=0) % 10 == 1).all()
+
+
+def test_shuffle_keeps_each_trade():
+    pnl = np.array([5.0, -3.0, 2.0, 7.0])
+    shuffled = shuffleTrades(pnl, 20, rng=np.random.default_rng(2))
+    assert (np.sort(shuffled, axis=0) == np.sort(pnl)[:, None]).all()
+
+
+def test_trade_shuffle_terminal_value_is_fixed():
+    result = monteCarloTrades(np.array([50.0, -20.0, 30.0, -10.0]), cash=1000.0, numPaths=200, seed=3)
+    assert isinstance(result, MonteCarloResult)
+    assert result.paths["terminalValue"].to_numpy() == pytest.approx(np.full(200, 1050.0))
+    assert result.probabilityOfLoss() == 0.0
+    assert result.probabilityOfRuin() == 0.0
+
+
+def test_ruined_paths_stop_at_zero():
+    # Only the orders that take the -150 first run out of money
+    result = monteCarloTrades(np.array([-150.0, 100.0, 100.0]), cash=100.0, numPaths=600, seed=4)
+    paths = result.paths
+    assert np.isfinite(paths.to_numpy()).all()
+    ruined = paths["terminalValue"].to_numpy() == 0
+    assert 0 < ruined.sum() < len(paths)
+    assert (paths["terminalValue"][ruined] == 0).all()
+    assert (paths["terminalValue"][~ruined] == 150.0).all()
+    assert (paths["maxDrawdown"][ruined] == -1.0).all()
+    assert result.probabilityOfRuin() == pytest.approx(ruined.mean())
+
+
+def test_results_repeat_with_a_seed():
+    returns = np.random.default_rng(5).normal(0.001, 0.01, 250)
+    first = monteCarloReturns(returns, numPaths=300, blockSize=10, seed=6, chunkSize=64)
+    second = monteCarloReturns(returns, numPaths=300, blockSize=10, seed=6, chunkSize=64)
+    pd.testing.assert_frame_equal(first.paths, second.paths)
+    assert len(first.paths) == 300
+    assert first.quantiles().shape == (5, len(first.paths.columns))
+
+
+def test_result_monte_carlo_starts_from_first_equity():
+    index = pd.date_range("2024-01-01", periods=5, freq="D")
+    equity = pd.DataFrame({"cash": 0.0, "position": 0, "equity": [100.0, 101.0, 99.0, 102.0, 104.0]}, index=index)
+    result = BacktestResult(final_value=104.0, transactions=[], strategy=None, equity=equity)
+    paths = result.monteCarlo(numPaths=50, seed=7, blockSize=1).paths
+    assert paths["terminalValue"].min() > 0
+    with pytest.raises(ValueError):
+        result.monteCarlo("other")
@@ -0,0 +1,80 @@
+from datetime import datetime
+import pandas as pd
+import pytest
+from pyBacktest.backtest import Backtest
+from pyBacktest.benchmarks.suite import LimitGrid, ReadmeSMACross
+from pyBacktest.benchmarks.synthetic import generateOHLCV
+from pyBacktest.data import DataFrameSource
+from pyBacktest.indicators import SMA
+from pyBacktest.multiplex import MultiplexBacktest
+from pyBacktest.strategy import Strategy
+from pyBacktest.tradeTypes import TradeType
+
+
+class Breakout(Strategy):
+    def __init__(self, period=10, size=5):
+        super().__init__()
+        self.period = period
+        self.size = size
+
+    def setup(self):
+        self.sma = self.addIndicator(SMA(self.period))
+
+    def step(self, row):
+        if not self.sma.ready:
+            return
+        position = self.backtest.getPosition()
+        if row["Close"] > self.sma.value * 1.01 and position <= 0:
+            self.backtest.trade(TradeType.BUY, self.size)
+        elif row["Close"] < self.sma.value * 0.99 and position > 0:
+            self.backtest.trade(TradeType.SELL, position)
+            self.backtest.trade(TradeType.SHORT_SELL, self.size)
+        elif position < 0 and row["Close"] > self.sma.value:
+            self.backtest.trade(TradeType.SHORT_COVER, -position)
+            self.backtest.submitGTCOrder(TradeType.LIMIT_BUY, self.size, round(row["Close"] * 0.98, 2))
+
+
+def strategies():
+    return [ReadmeSMACross(), Breakout(5), Breakout(20, 3), LimitGrid(levels=4)]
+
+
+@pytest.fixture(scope="module")
+def source():
+    return DataFrameSource(generateOHLCV(400))
+
+
+SETTINGS = dict(ticker="SYN", cash=1e9, commision=1.0, startDate=datetime(2000, 1, 3), endDate=datetime(2001, 6, 1))
+
+
+def test_matches_separate_runs(source):
+    multiplexed = MultiplexBacktest(strategies=strategies(), dataSource=source, **SETTINGS).run()
+    for result, strategy in zip(multiplexed, strategies()):
+        expected = Backtest(strategy=strategy, dataSource=source, engine="array", **SETTINGS).run()
+        assert len(expected.transactions) > 0
+        assert result.final_value == pytest.approx(expected.final_value, rel=1e-12)
+        pd.testing.assert_frame_equal(result.transactions.to_pandas(), expected.transactions.to_pandas())
+        pd.testing.assert_frame_equal(result.equity, expected.equity)
+
+
+def test_slots_only_trade(source):
+    slot = MultiplexBacktest(strategies=strategies(), dataSource=source, **SETTINGS).slots[0]
+    for name in ("run", "next", "checkpoint", "restore"):
+        assert not hasattr(slot, name)
+    assert slot.strategy.backtest is slot
+
+
+class OverBudget(Strategy):
+    def step(self, row):
+        if self.backtest.cursor == 1:
+            self.backtest.submitGTCOrder(TradeType.LIMIT_BUY, 1_000, round(row["Close"] * 1.5, 2))
+
+
+def test_rejected_fill_is_logged(source, capsys):
+    multiplex = MultiplexBacktest(strategies=[OverBudget(), Breakout(5)], dataSource=source, **dict(SETTINGS, cash=1_000))
+    results = multiplex.run()
+    log = results[0].transactions.to_pandas()
+    assert len(log) == 1 and not log["executedSuccessfully"].iloc[0]
+    assert log["notes"].iloc[0].startswith("Order execution error")
+    assert len(multiplex.slots[0].pending_orders) == 0
+    assert capsys.readouterr().out == ""
+    assert len(results[1].transactions) > 0
@@ -0,0 +1,85 @@
+from datetime import datetime
+import numpy as np
+import pandas as pd
+import pytest
+from pyBacktest.backtest import Backtest
+from pyBacktest.benchmarks.synthetic import generateOHLCV
+from pyBacktest.data import DataFrameSource
+from pyBacktest.indicators import SMA
+from pyBacktest.optimize import SharedHistory, gridSearch, optimize, randomSearch
+from pyBacktest.strategy import Strategy
+from pyBacktest.tradeTypes import TradeType
+
+
+class Crossover(Strategy):
+    fast = 5
+    slow = 20
+
+    def setup(self):
+        self.fastSMA = self.addIndicator(SMA(self.fast))
+        self.slowSMA = self.addIndicator(SMA(self.slow))
+
+    def step(self, row):
+        if not self.slowSMA.ready:
+            return
+        position = self.backtest.getPosition()
+        if self.fastSMA.value > self.slowSMA.value and position == 0:
+            self.backtest.trade(TradeType.BUY, 10)
+        elif self.fastSMA.value < self.slowSMA.value and position > 0:
+            self.backtest.trade(TradeType.SELL, position)
+
+
+@pytest.fixture(scope="module")
+def source():
+    return DataFrameSource(generateOHLCV(200))
+
+
+SETTINGS = dict(ticker="SYN", cash=10_000, startDate=datetime(2000, 1, 3), endDate=datetime(2000, 10, 1), commision=1.0, engine="array")
+SPACE = {"fast": [3, 5, 8], "slow": [20, 30]}
+
+
+def sequential(source, **params):
+    return Backtest(strategy=Crossover().setParams(**params), dataSource=source, **SETTINGS).run()
+
+
+def test_grid_and_random_search():
+    assert gridSearch({"a": [1, 2], "b": "xy"}) == [{"a": 1, "b": "x"}, {"a": 1, "b": "y"}, {"a": 2, "b": "x"}, {"a": 2, "b": "y"}]
+    space = {"a": [1, 2, 3], "b": lambda rng: rng.uniform(0, 1)}
+    trials = randomSearch(space, 10, seed=1)
+    assert trials == randomSearch(space, 10, seed=1)
+    assert all(t["a"] in (1, 2, 3) and 0 <= t["b"] <= 1 for t in trials)
+
+
+@pytest.mark.parametrize("maxWorkers", [1, 2])
+def test_grid_matches_sequential_runs(source, maxWorkers):
+    trials = optimize(Crossover, SPACE, dataSource=source, maxWorkers=maxWorkers, **SETTINGS)
+    assert len(trials) == 6 and trials["error"].isna().all()
+    assert trials["final_value"].is_monotonic_decreasing
+    for _, trial in trials.iterrows():
+        result = sequential(source, fast=trial["fast"], slow=trial["slow"])
+        assert trial["final_value"] == pytest.approx(result.final_value, rel=1e-12)
+        assert trial["num_transactions"] == len(result.transactions)
+
+
+def test_random_search_ranks_ascending(source):
+    trials = optimize(Crossover, SPACE, dataSource=source, method="random", numSamples=5, seed=2, maxWorkers=1, rankBy="max_drawdown", ascending=True, **SETTINGS)
+    assert len(trials) == 5
+    assert trials["max_drawdown"].is_monotonic_increasing
+    with pytest.raises(ValueError):
+        optimize(Crossover, SPACE, dataSource=source, method="anneal", **SETTINGS)
+
+
+def test_shared_history_round_trip():
+    hist = generateOHLCV(50)
+    shared = SharedHistory.create(hist)
+    try:
+        attached = SharedHistory.attach(shared.spec)
+        frame = attached.frame()
+        pd.testing.assert_frame_equal(frame, hist[frame.columns.tolist()], check_index_type=False, check_freq=False)
+        # The frame is a view onto the shared block, not a copy
+        assert np.shares_memory(frame["Close"].to_numpy(), np.ndarray(shared.spec["shape"], np.float64, buffer=attached._values.buf))
+        del frame
+        attached.close()
+    finally:
+        shared.close()
+        shared.unlink()
@@ -0,0 +1,85 @@
+from datetime import datetime
+import numpy as np
+import pandas as pd
+import pytest
+from pyBacktest.backtest import Backtest
+from pyBacktest.benchmarks.suite import Idle
+from pyBacktest.benchmarks.synthetic import generateDailyOHLCV
+from pyBacktest.data import DataFrameSource
+from pyBacktest.orderbook import OrderBook
+from pyBacktest.tradeTypes import InvalidOrderError, Order, TradeType
+
+DAY = pd.Timestamp("2000-01-03", tz="America/New_York")
+
+
+def order(tradeType, targetPrice, duration="GTC", date=DAY):
+    return Order(tradeType=tradeType, ticker="SYN", numShares=1, targetPrice=targetPrice, duration=duration, orderDate=date)
+
+
+def test_match_by_price_then_submission():
+    book = OrderBook()
+    buys = [book.add(order(TradeType.LIMIT_BUY, price)) for price in (10.0, 11.0, 9.0, 11.0)]
+    sells = [book.add(order(TradeType.LIMIT_SELL, price)) for price in (12.0, 13.0)]
+    triggered = book.match(10.5, 12.5)
+    assert [o.orderId for o in triggered] == [buys[1].orderId, buys[3].orderId, sells[0].orderId]
+    assert len(book) == 3
+    assert book.match(10.5, 12.5) == []
+
+
+def test_cancelled_orders_never_match():
+    book = OrderBook()
+    kept = book.add(order(TradeType.LIMIT_BUY, 10.0))
+    dropped = book.add(order(TradeType.LIMIT_BUY, 10.0))
+    assert book.cancel(dropped.orderId) is dropped
+    assert book.cancel(dropped.orderId) is None
+    assert book.match(9.0, 9.0) == [kept]
+
+
+def test_only_day_orders_expire():
+    book = OrderBook()
+    day = book.add(order(TradeType.LIMIT_BUY, 10.0, "DAY"))
+    book.add(order(TradeType.LIMIT_BUY, 10.0, "GTC"))
+    assert book.expired(DAY) == []
+    assert book.expired(DAY + pd.Timedelta(days=1)) == [day]
+
+
+def test_market_orders_cannot_rest():
+    with pytest.raises(InvalidOrderError):
+        OrderBook().add(order(TradeType.BUY, 10.0))
+
+
+@pytest.fixture
+def backtest():
+    hist = generateDailyOHLCV(40)
+    return Backtest("SYN", 1e6, Idle(), startDate=datetime(2000, 1, 3), endDate=datetime(2000, 2, 12), dataSource=DataFrameSource(hist), engine="array")
+
+
+def test_gtc_limit_buy_rests_until_the_close_reaches_it(backtest):
+    close = backtest.bars.close
+    fillBar = int(np.argmin(close[1:])) + 1
+    target = float(close[fillBar])
+    assert fillBar > 1
+    placed = backtest.submitGTCOrder(TradeType.LIMIT_BUY, 7, target)
+    backtest.run()
+    assert not placed.active and len(backtest.orderBook) == 0
+    fill = backtest.transactions[-1]
+    assert (fill.tradeType, fill.numShares, fill.pricePerShare, fill.date) == (TradeType.LIMIT_BUY, 7, target, backtest.bars.index[fillBar])
+    assert backtest.getPosition() == 7
+
+
+def test_gtc_limit_sell_fills_at_its_target(backtest):
+    backtest.trade(TradeType.BUY, 5)
+    target = float(np.max(backtest.bars.close[1:])) - 0.01
+    backtest.submitGTCOrder(TradeType.LIMIT_SELL, 5, target)
+    backtest.run()
+    fill = backtest.transactions[-1]
+    assert (fill.tradeType, fill.numShares, fill.pricePerShare) == (TradeType.LIMIT_SELL, 5, target)
+    assert backtest.getPosition() == 0
+
+
+def test_day_order_is_cancelled_on_the_next_bar(backtest):
+    backtest.trade(TradeType.LIMIT_BUY, 3, float(backtest.bars.close.max()), "DAY")
+    backtest.next()
+    assert len(backtest.orderBook) == 0
+    assert backtest.transactions[-1].tradeType == TradeType.Cancel
+    assert backtest.getPosition() == 0
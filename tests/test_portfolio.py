@@ -0,0 +1,76 @@
+from datetime import datetime
+import numpy as np
+import pandas as pd
+import pytest
+from pyBacktest.data import DataFrameSource
+from pyBacktest.portfolio import PortfolioBacktest, PortfolioStrategy
+from pyBacktest.tradeTypes import TradeType
+
+
+def flatBars(price, days=5):
+    index = pd.date_range("2024-01-01", periods=days, freq="D")
+    return pd.DataFrame({"Open": price, "High": price, "Low": price, "Close": price, "Volume": 1e6}, index=index)
+
+
+class Scripted(PortfolioStrategy):
+    # Places the given orders on the first bar and does nothing after
+    def __init__(self, orders):
+        super().__init__()
+        self.orders = orders
+
+    def step(self, bar):
+        for args in self.orders:
+            self.backtest.trade(*args)
+        self.orders = []
+
+
+def portfolio(orders, cash=10_000.0, tickers=("AAA", "BBB")):
+    source = DataFrameSource({ticker: flatBars(200.0) for ticker in tickers})
+    return PortfolioBacktest(tickers, cash, Scripted(orders), startDate=datetime(2024, 1, 1), endDate=datetime(2024, 1, 6), dataSource=source)
+
+
+def test_market_orders_update_positions_and_cash():
+    backtest = portfolio([("AAA", TradeType.BUY, 10), ("BBB", TradeType.SHORT_SELL, 5)])
+    result = backtest.run()
+    assert backtest.getPosition("AAA") == 10
+    assert backtest.getPosition("BBB") == -5
+    assert backtest.cash == pytest.approx(10_000.0 - 2000.0 + 1000.0)
+    assert result.final_value == pytest.approx(10_000.0)
+
+
+def test_repeated_limit_sells_cannot_oversell():
+    backtest = portfolio([
+        ("AAA", TradeType.BUY, 10),
+        ("AAA", TradeType.LIMIT_SELL, 10, 200.0, "GTC"),
+        ("AAA", TradeType.LIMIT_SELL, 10, 200.0, "GTC"),
+    ])
+    backtest.run()
+    # Only the first sell fits the 10-share long; the second is rejected rather than opening a short
+    assert backtest.getPosition("AAA") == 0
+    assert backtest.cash == pytest.approx(10_000.0)
+    sells = backtest.transactions.to_pandas().query("tradeType == 'LIMIT_SELL'")
+    assert sells["numShares"].sum() == 10
+    assert backtest.totalValue() == pytest.approx(10_000.0)
+
+
+def test_repeated_limit_buys_book_every_share():
+    backtest = portfolio([
+        ("AAA", TradeType.LIMIT_BUY, 10, 200.0, "GTC"),
+        ("AAA", TradeType.LIMIT_BUY, 10, 200.0, "GTC"),
+    ])
+    backtest.run()
+    assert backtest.getPosition("AAA") == 20
+    assert backtest.cash == pytest.approx(10_000.0 - 4000.0)
+    assert backtest.costBasis[backtest.tickerIndex["AAA"]] == pytest.approx(4000.0)
+    assert backtest.totalValue() == pytest.approx(10_000.0)
+
+
+def test_repeated_fills_realize_against_running_average():
+    backtest = portfolio([])
+    backtest.next()
+    backtest._fill(np.array([0, 0, 0]), np.array([10, 10, -15]), np.array([100.0, 200.0, 300.0]))
+    assert backtest.getPosition("AAA") == 5
+    assert backtest.costBasis[0] == pytest.approx(5 * 150.0)
+    log = backtest.transactions.to_pandas()
+    assert list(log["profitLoss"]) == pytest.approx([0.0, 0.0, 15 * 150.0])
+    assert list(log["tradeType"]) == ["BUY", "BUY", "SELL"]
@@ -0,0 +1,65 @@
+import io
+from datetime import datetime
+import pytest
+from pyBacktest.backtest import Backtest
+from pyBacktest.benchmarks.synthetic import generateOHLCV
+from pyBacktest.data import DataFrameSource
+from pyBacktest.profiling import FoldedStackWriter, Profiler
+from pyBacktest.strategy import Strategy
+from pyBacktest.tradeTypes import TradeType
+
+
+class BuyOnce(Strategy):
+    def setup(self):
+        self.steps = 0
+
+    def step(self, row):
+        self.steps += 1
+        if self.steps == 1:
+            self.backtest.trade(TradeType.BUY, 1)
+
+
+class FailsOnce(Strategy):
+    def setup(self):
+        self.failed = False
+
+    def step(self, row):
+        if not self.failed:
+            self.failed = True
+            raise RuntimeError("bad bar")
+
+
+def makeBacktest(strategy, **kwargs):
+    return Backtest("SYN", 10_000, strategy, startDate=datetime(2000, 1, 3), endDate=datetime(2000, 2, 14), dataSource=DataFrameSource(generateOHLCV(30)), **kwargs)
+
+
+def test_report_covers_phases():
+    stream = io.StringIO()
+    result = makeBacktest(BuyOnce(), engine="array", profile=Profiler(FoldedStackWriter(stream))).run()
+    report = result.profile
+    assert report.bars == result.strategy.steps
+    assert report.phases.loc["strategy.step", "calls"] == report.bars
+    assert report.phases.loc["execute_buy", "calls"] == 1
+    assert "bar;strategy.step;execute_buy" in report.folded
+    assert report.barsPerSecond > 0
+    assert "bar;strategy.step" in stream.getvalue()
+
+
+def test_pandas_engine_counts_each_bar_once():
+    backtest = makeBacktest(BuyOnce(), profile=True)
+    report = backtest.run().profile
+    # Weekends step the Friday bar again; those steps are timed but are not new bars
+    assert backtest.strategy.steps > len(backtest.bars) - 1
+    assert report.bars == len(backtest.bars) - 1
+    assert report.phases.loc["bar", "calls"] == backtest.strategy.steps
+
+
+def test_failed_bar_leaves_timers_balanced():
+    backtest = makeBacktest(FailsOnce(), engine="array", profile=True)
+    with pytest.raises(RuntimeError):
+        backtest.next()
+    assert backtest.profiler._stack == []
+    backtest.next()
+    assert backtest.profiler._stack == []
+    assert all(path.count("bar") == 1 for path in backtest.profiler.folded)
+    assert backtest.profiler.calls["bar"] == 2
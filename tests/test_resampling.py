@@ -0,0 +1,78 @@
+from datetime import datetime
+import numpy as np
+import pandas as pd
+import pytest
+from pyBacktest.backtest import Backtest
+from pyBacktest.benchmarks.synthetic import generateOHLCV
+from pyBacktest.data import DataFrameSource
+from pyBacktest.resampling import MultiTimeframe, intervalRule, parseInterval, resampleOHLCV
+from pyBacktest.strategy import Strategy
+
+
+@pytest.fixture(scope="module")
+def hourly():
+    index = pd.date_range("2024-01-01 09:00", periods=30, freq="h", tz="America/New_York")
+    close = 100 + np.arange(30.0)
+    return pd.DataFrame({"Open": close - 0.5, "High": close + 1, "Low": close - 1, "Close": close, "Volume": np.arange(1.0, 31.0)}, index=index)
+
+
+def test_intervals():
+    assert intervalRule("4h") == "4h" and intervalRule("1wk") == "1W-MON" and intervalRule("1mo") == "1MS"
+    assert parseInterval("15m") == pd.DateOffset(minutes=15)
+    with pytest.raises(ValueError):
+        intervalRule("1 fortnight")
+
+
+def test_resample_aggregates(hourly):
+    bars = resampleOHLCV(hourly, "4h")
+    first = hourly.iloc[0:3]
+    # 09:00 falls in the 08:00 bin, which holds three hourly bars
+    assert bars.index[0] == pd.Timestamp("2024-01-01 08:00", tz="America/New_York")
+    assert list(bars.iloc[0]) == [first["Open"].iloc[0], first["High"].max(), first["Low"].min(), first["Close"].iloc[-1], first["Volume"].sum()]
+    assert bars["Volume"].sum() == hourly["Volume"].sum()
+
+
+def test_views_see_only_closed_bars(hourly):
+    timeframe = MultiTimeframe(hourly).view("4h")
+    pd.testing.assert_frame_equal(timeframe.frame, resampleOHLCV(hourly, "4h"))
+    for cursor in range(len(hourly)):
+        seen = resampleOHLCV(hourly.iloc[:cursor + 1], "4h")
+        pd.testing.assert_frame_equal(timeframe.history(cursor, partial=True), seen, check_freq=False)
+        closed = timeframe.history(cursor)
+        binEnds = cursor + 1 < len(hourly) and timeframe.group[cursor + 1] != timeframe.group[cursor]
+        pd.testing.assert_frame_equal(closed, seen if binEnds else seen.iloc[:-1], check_freq=False)
+        pd.testing.assert_series_equal(timeframe.forming(cursor), seen.iloc[-1], check_dtype=False)
+
+
+def test_align_has_no_lookahead(hourly):
+    timeframe = MultiTimeframe(hourly).view("4h")
+    aligned = timeframe.align(timeframe.frame["Close"])
+    for cursor, value in enumerate(aligned):
+        closed = timeframe.history(cursor)
+        assert np.isnan(value) if closed.empty else value == closed["Close"].iloc[-1]
+
+
+def test_equal_periods_share_a_view(hourly):
+    timeframes = MultiTimeframe(hourly)
+    assert timeframes.view("60m") is timeframes.view("1h")
+    assert "1h" in timeframes and "2h" not in timeframes
+    timeframes.clear()
+    assert "1h" not in timeframes
+
+
+class Weekly(Strategy):
+    def setup(self):
+        self.seen = []
+
+    def step(self, row):
+        self.seen.append((row.name, self.timeframe("1wk")))
+
+
+def test_strategy_timeframe_matches_resample():
+    hist = generateOHLCV(40)
+    strategy = Weekly()
+    Backtest("SYN", 10_000, strategy, startDate=datetime(2000, 1, 3), endDate=datetime(2000, 3, 1), dataSource=DataFrameSource(hist), engine="array").run()
+    for date, weekly in strategy.seen:
+        expected = resampleOHLCV(hist.loc[:date], "1wk")
+        assert len(weekly) in (len(expected) - 1, len(expected))
+        pd.testing.assert_frame_equal(weekly, expected.iloc[:len(weekly)], check_freq=False)
@@ -0,0 +1,62 @@
+from datetime import datetime
+import numpy as np
+import pandas as pd
+import pytest
+from pyBacktest.backtest import Backtest
+from pyBacktest.benchmarks.synthetic import generateOHLCV
+from pyBacktest.data import DataFrameSource
+from pyBacktest.results import EquityRecorder
+from pyBacktest.strategy import Strategy
+from pyBacktest.tradeTypes import TradeType
+from pyBacktest.utils import calculateDrawdown
+
+
+class Alternate(Strategy):
+    # Flips between flat and 7 shares every step, noting the value it expects to be recorded
+    def setup(self):
+        self.values = {}
+
+    def step(self, row):
+        if self.backtest.getPosition() == 0:
+            self.backtest.trade(TradeType.BUY, 7)
+        else:
+            self.backtest.trade(TradeType.SELL, 7)
+        self.values[row.name] = self.backtest.totalValue()
+
+
+def test_recorder_keeps_only_recorded_bars():
+    index = pd.date_range("2024-01-01", periods=4, freq="D")
+    recorder = EquityRecorder(index)
+    recorder.record(0, 100.0, 0, 10.0)
+    recorder.record(2, 50.0, 5, 12.0)
+    recorder.record(2, 40.0, 6, 12.0)
+    frame = recorder.frame()
+    assert list(frame.index) == [index[0], index[2]]
+    assert list(frame["cash"]) == [100.0, 40.0]
+    assert list(frame["position"]) == [0, 6]
+    assert list(frame["equity"]) == [100.0, 112.0]
+
+
+@pytest.mark.parametrize("engine", ["array", "pandas"])
+def test_equity_matches_total_value(engine):
+    strategy = Alternate()
+    backtest = Backtest("SYN", 10_000, strategy, commision=1.0, startDate=datetime(2000, 1, 3), endDate=datetime(2000, 3, 1), dataSource=DataFrameSource(generateOHLCV(50)), engine=engine)
+    result = backtest.run()
+    equity = result.equity
+    # One row per bar, starting with the untraded first bar
+    assert list(equity.index) == list(backtest.bars.index)
+    assert equity["equity"].iloc[0] == 10_000
+    for date, value in strategy.values.items():
+        assert equity.loc[date, "equity"] == pytest.approx(value, rel=1e-12)
+    assert equity["equity"].iloc[-1] == pytest.approx(result.final_value, rel=1e-12)
+
+
+def test_returns_and_stats_use_equity():
+    backtest = Backtest("SYN", 10_000, Alternate(), startDate=datetime(2000, 1, 3), endDate=datetime(2000, 3, 1), dataSource=DataFrameSource(generateOHLCV(50)), engine="array")
+    result = backtest.run()
+    equity = result.equity["equity"]
+    pd.testing.assert_series_equal(result.returns(), equity.pct_change().dropna())
+    stats = result.stats()
+    assert stats["totalReturn"] == pytest.approx(equity.iloc[-1] / equity.iloc[0] - 1)
+    assert stats["maxDrawdown"] == pytest.approx(calculateDrawdown(equity)[0])
+    assert np.isfinite(stats["sharpeRatio"])
@@ -0,0 +1,131 @@
+import asyncio
+from datetime import datetime
+import pandas as pd
+import pytest
+from pyBacktest.backtest import Backtest
+from pyBacktest.benchmarks.synthetic import generateOHLCV
+from pyBacktest.data import DataFrameSource
+from pyBacktest.indicators import SMA
+from pyBacktest.streaming import StreamingBacktest
+from pyBacktest.strategy import Strategy
+from pyBacktest.tradeTypes import TradeType
+
+
+class Crossover(Strategy):
+    # Trades only once both averages are warm, so the first bar, which a batch run never steps, cannot matter
+    def setup(self):
+        self.fast = self.addIndicator(SMA(5))
+        self.slow = self.addIndicator(SMA(20))
+
+    def step(self, row):
+        if not self.slow.ready:
+            return
+        position = self.backtest.getPosition()
+        if self.fast.value > self.slow.value and position == 0:
+            self.backtest.trade(TradeType.BUY, 10)
+            self.backtest.submitGTCOrder(TradeType.LIMIT_SELL, 5, round(row["Close"] * 1.02, 2))
+        elif self.fast.value < self.slow.value and position > 0:
+            for order in self.backtest.pending_orders:
+                self.backtest.cancelOrder(order.orderId)
+            self.backtest.trade(TradeType.SELL, position)
+
+
+@pytest.fixture(scope="module")
+def hist():
+    return generateOHLCV(300)
+
+
+@pytest.fixture(scope="module")
+def batch(hist):
+    backtest = Backtest(
+        "SYN", 10_000, Crossover(), commision=1.0, startDate=hist.index[0], endDate=hist.index[-1] + pd.Timedelta(days=1),
+        dataSource=DataFrameSource(hist), engine="array",
+    )
+    result = backtest.run()
+    assert len(result.transactions) > 10
+    return result
+
+
+def assertSameRun(result, expected):
+    assert result.final_value == pytest.approx(expected.final_value, rel=1e-12)
+    pd.testing.assert_frame_equal(result.transactions.to_pandas(), expected.transactions.to_pandas())
+    # The stream builds its index bar by bar, in nanoseconds and without a frequency
+    pd.testing.assert_frame_equal(result.equity, expected.equity, check_index_type=False, check_freq=False)
+
+
+def test_iterator_matches_batch(hist, batch):
+    stream = StreamingBacktest("SYN", 10_000, Crossover(), commision=1.0, maxBars=30)
+    assertSameRun(stream.run(row for _, row in hist.iterrows()), batch)
+
+
+def test_tuples_through_a_queue_match_batch(hist, batch):
+    stream = StreamingBacktest("SYN", 10_000, Crossover(), commision=1.0, maxBars=30)
+
+    async def replay():
+        queue = stream.makeQueue(maxsize=8)
+
+        async def produce():
+            for date, values in zip(hist.index, hist.to_dict("records")):
+                await queue.put((date, values))
+            await queue.put(None)
+
+        producer = asyncio.ensure_future(produce())
+        result = await stream.arun()
+        await producer
+        return result
+
+    assertSameRun(asyncio.run(replay()), batch)
+
+
+def test_window_is_bounded(hist):
+    stream = StreamingBacktest("SYN", 10_000, Crossover(), maxBars=30)
+    stream.run(row for _, row in hist.iterrows())
+    assert len(stream.hist) == 30 and stream.barsProcessed == len(hist)
+    assert stream.hist.index[-1] == hist.index[-1]
+
+
+
+def test_queue_join_waits_for_processing(hist):
+    stream = StreamingBacktest("SYN", 10_000, Crossover(), maxBars=30)
+    seen = []
+
+    async def replay():
+        queue = stream.makeQueue(maxsize=4)
+
+        async def produce():
+            for date, values in zip(hist.index[:50], hist.to_dict("records")):
+                await queue.put((date, values))
+                await queue.join()
+                seen.append(stream.barsProcessed)
+            await queue.put(None)
+
+        producer = asyncio.ensure_future(produce())
+        await stream.arun(yieldEvery=1)
+        await producer
+
+    asyncio.run(replay())
+    assert seen == list(range(1, 51))
+
+
+def test_stopping_marks_the_last_item_done(hist):
+    class StopAfterTen(Crossover):
+        def step(self, row):
+            if self.backtest.barsProcessed == 10:
+                self.backtest.stop()
+
+    stream = StreamingBacktest("SYN", 10_000, StopAfterTen(), maxBars=30)
+
+    async def replay():
+        queue = stream.makeQueue()
+        for date, values in zip(hist.index[:20], hist.to_dict("records")):
+            queue.put_nowait((date, values))
+        await stream.arun()
+        left = queue.qsize()
+        while not queue.empty():
+            queue.get_nowait()
+            queue.task_done()
+        await asyncio.wait_for(queue.join(), 1)
+        return left
+
+    assert asyncio.run(replay()) == 10
+    assert stream.barsProcessed == 10
@@ -0,0 +1,77 @@
+import pandas as pd
+import pytest
+from pyBacktest.tradeTypes import TradeType, Transaction
+from pyBacktest.transactionLog import TransactionLog
+
+START = pd.Timestamp("2024-01-02", tz="America/New_York")
+
+
+def fill(log, i, ticker="AAA"):
+    return log.record(
+        tradeType=TradeType.BUY if i % 2 == 0 else TradeType.SELL,
+        ticker=ticker,
+        commission=1.0,
+        executedSuccessfully=True,
+        numShares=i + 1,
+        pricePerShare=100.0 + i,
+        totalCost=(i + 1) * (100.0 + i),
+        date=START + pd.Timedelta(days=i),
+        notes=f"fill {i % 3}",
+    )
+
+
+def test_record_returns_global_index(tmp_path):
+    log = TransactionLog(capacity=2, spillDir=str(tmp_path), spillThreshold=3)
+    indexes = [fill(log, i) for i in range(8)]
+    assert indexes == list(range(8))
+    for i in indexes:
+        assert log[i].numShares == i + 1
+
+
+def test_spilled_rows_read_back(tmp_path):
+    spilled = TransactionLog(capacity=2, spillDir=str(tmp_path), spillThreshold=4)
+    inMemory = TransactionLog()
+    for i in range(10):
+        fill(spilled, i)
+        fill(inMemory, i)
+    assert len(spilled._chunks) == 2 and len(spilled) == 10
+    assert list(spilled) == list(inMemory)
+    assert spilled[-1] == inMemory[9]
+    assert spilled[3:6] == inMemory[3:6]
+    pd.testing.assert_frame_equal(spilled.to_pandas(), inMemory.to_pandas())
+    for name, values in spilled.rows(5).items():
+        assert list(values) == list(inMemory.to_numpy()[name][5:])
+
+
+def test_to_pandas():
+    log = TransactionLog()
+    fill(log, 0)
+    fill(log, 1, ticker="BBB")
+    frame = log.to_pandas()
+    assert list(frame["tradeType"]) == ["BUY", "SELL"]
+    assert list(frame["ticker"]) == ["AAA", "BBB"]
+    assert list(frame["notes"]) == ["fill 0", "fill 1"]
+    assert list(frame["date"]) == [START, START + pd.Timedelta(days=1)]
+    assert str(frame["date"].dt.tz) == "America/New_York"
+    assert list(frame["totalCost"]) == [100.0, 202.0]
+
+
+def test_extend_remaps_codes():
+    first, second = TransactionLog(), TransactionLog()
+    fill(first, 0, ticker="AAA")
+    fill(second, 1, ticker="BBB")
+    fill(second, 2, ticker="AAA")
+    first.extend(second)
+    assert len(first) == 3
+    assert [t.ticker for t in first] == ["AAA", "BBB", "AAA"]
+    assert [t.notes for t in first] == ["fill 0", "fill 1", "fill 2"]
+    assert first[1:] == list(second)
+
+
+def test_append_and_bounds():
+    log = TransactionLog()
+    transaction = Transaction(TradeType.SHORT_SELL, "AAA", 0.0, True, 5, 10.0, 50.0, START, -3.0, "note")
+    log.append(transaction)
+    assert log[0] == transaction
+    with pytest.raises(IndexError):
+        log[1]
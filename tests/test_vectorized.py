@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+from pyBacktest.benchmarks.synthetic import generateDailyOHLCV
+from pyBacktest.vectorized import compareWithBacktest, runVectorized, signalsToPositions
+
+
+@pytest.fixture
+def hist():
+    return generateDailyOHLCV(300)
+
+
+@pytest.fixture
+def signals(hist):
+    rng = np.random.default_rng(0)
+    return rng.random(len(hist)) < 0.05, rng.random(len(hist)) < 0.05
+
+
+@pytest.mark.parametrize("tz", ["America/New_York", "UTC", None])
+@pytest.mark.parametrize("commisionType", ["FLAT", "PERCENTAGE"])
+def test_matches_backtest(hist, signals, tz, commisionType):
+    hist.index = hist.index.tz_convert(tz) if tz else hist.index.tz_localize(None)
+    entries, exits = signals
+    result = compareWithBacktest(hist, 1e6, entries, exits, size=10, commision=1.0, commisionType=commisionType)
+    assert result["transactions_match"]
+    assert result["num_transactions"] > 0
+    assert result["final_value_diff"] == pytest.approx(0.0, abs=1e-6)
+    assert result["equity_max_abs_diff"] == pytest.approx(0.0, abs=1e-6)
+
+
+def test_keeps_every_bar(hist, signals):
+    hist.index = hist.index.tz_convert("UTC")
+    entries, exits = signals
+    result = runVectorized(hist, 1e6, targetPositions=signalsToPositions(entries, exits, 10))
+    assert len(result.equity) == len(hist)
+
+
+def test_target_positions_with_shorts_match_backtest(hist):
+    targets = np.round(20 * np.sin(np.arange(len(hist)) / 9.0)).astype(int)
+    result = compareWithBacktest(hist, 1e6, targetPositions=targets, commision=0.5, commisionType="PER_SHARE")
+    assert result["transactions_match"]
+    assert result["final_value_diff"] == pytest.approx(0.0, abs=1e-6)
+    assert result["equity_max_abs_diff"] == pytest.approx(0.0, abs=1e-6)
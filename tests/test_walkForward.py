@@ -0,0 +1,95 @@
+from datetime import datetime
+import pandas as pd
+import pytest
+from pyBacktest.benchmarks.synthetic import generateOHLCV
+from pyBacktest.data import DataFrameSource
+from pyBacktest.indicators import SMA
+from pyBacktest.results import BacktestResult
+from pyBacktest.strategy import Strategy
+from pyBacktest.tradeTypes import OptimizationError, TradeType
+from pyBacktest.walkForward import stitchResults, walkForward, walkForwardSplits
+
+
+class Trend(Strategy):
+    period = 5
+
+    def setup(self):
+        if self.period > 100:
+            raise ValueError("period too long")
+        self.sma = self.addIndicator(SMA(self.period))
+        self.firstBar = None
+
+    def step(self, row):
+        if self.firstBar is None:
+            self.firstBar = (row.name, self.sma.ready)
+        if not self.sma.ready:
+            return
+        position = self.backtest.getPosition()
+        if row["Close"] > self.sma.value and position == 0:
+            self.backtest.trade(TradeType.BUY, 10)
+        elif row["Close"] < self.sma.value and position > 0:
+            self.backtest.trade(TradeType.SELL, position)
+
+
+@pytest.fixture(scope="module")
+def source():
+    return DataFrameSource(generateOHLCV(120))
+
+
+def run(source, params, **kwargs):
+    return walkForward(Trend, params, "SYN", 100_000, datetime(2000, 1, 3), datetime(2000, 7, 1), trainBars=40, testBars=20, dataSource=source, maxWorkers=1, engine="array", **kwargs)
+
+
+def test_splits():
+    assert walkForwardSplits(10, 4, 3) == [(slice(0, 4), slice(4, 7)), (slice(3, 7), slice(7, 10))]
+    assert walkForwardSplits(10, 4, 3, anchored=True) == [(slice(0, 4), slice(4, 7)), (slice(0, 7), slice(7, 10))]
+    assert walkForwardSplits(9, 4, 3, stepBars=2) == [(slice(0, 4), slice(4, 7)), (slice(2, 6), slice(6, 9)), (slice(4, 8), slice(8, 9))]
+    with pytest.raises(ValueError):
+        walkForwardSplits(10, 0, 3)
+
+
+def test_folds_trade_only_in_their_test_window(source):
+    result = run(source, {"period": [5, 10]})
+    hist = source.frame
+    folds = result.folds
+    assert len(folds) == 4
+    for fold, row in folds.iterrows():
+        train, test = walkForwardSplits(len(hist), 40, 20)[fold]
+        assert row["trainStart"] == hist.index[train.start] and row["trainEnd"] == hist.index[train.stop - 1]
+        assert row["testStart"] == hist.index[test.start] and row["testEnd"] == hist.index[test.stop - 1]
+        assert row["params"]["period"] in (5, 10)
+        foldResult = result.foldResults[fold]
+        # The training window is look-back only: indicators are warm on the first test bar
+        firstBar, ready = foldResult.strategy.firstBar
+        assert firstBar == hist.index[test.start + 1] and ready
+        assert foldResult.equity.index[0] == row["testStart"] and foldResult.equity.index[-1] == row["testEnd"]
+        dates = foldResult.transactions.to_pandas()["date"]
+        assert ((dates > row["testStart"]) & (dates <= row["testEnd"])).all()
+    assert len(result.transactions) == sum(len(r.transactions) for r in result.foldResults)
+
+
+def equityFrame(values, start):
+    index = pd.date_range(start, periods=len(values), freq="D")
+    return pd.DataFrame({"cash": values, "position": 0, "equity": values}, index=index, dtype=float)
+
+
+def test_stitch_modes():
+    results = [
+        BacktestResult(final_value=110.0, transactions=[], strategy=None, equity=equityFrame([100.0, 110.0], "2024-01-01")),
+        BacktestResult(final_value=120.0, transactions=[], strategy=None, equity=equityFrame([100.0, 120.0], "2024-01-03")),
+    ]
+    compounded, _ = stitchResults(results, 100.0, compound=True)
+    assert list(compounded["equity"]) == pytest.approx([100.0, 110.0, 110.0, 132.0])
+    added, _ = stitchResults(results, 100.0, compound=False)
+    assert list(added["equity"]) == pytest.approx([100.0, 110.0, 110.0, 130.0])
+    assert list(added["fold"]) == [0, 0, 1, 1]
+
+
+def test_failed_trials_are_not_picked(source):
+    result = run(source, {"period": [500, 5]})
+    assert all(params == {"period": 5} for params in result.folds["params"])
+
+
+def test_all_trials_failed(source):
+    with pytest.raises(OptimizationError, match="fold 0"):
+        run(source, {"period": [200, 300]})
@@ -1,3 +1,4 @@
+import sys
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
@@ -33,8 +34,24 @@ class InvalidOrderError(Exception):
 class ShortPositionError(Exception):
     pass
 
+class DataUnavailableError(Exception):
+    pass
+
+class InsufficientLiquidityError(Exception):
+    pass
+
+class CheckpointError(Exception):
+    pass
+
+class OptimizationError(Exception):
+    pass
+
+
+# Records are created on every fill; slots drop the per-instance __dict__ where dataclasses support them (3.10+)
+_slots = {"slots": True} if sys.version_info >= (3, 10) else {}
+
 
-@dataclass
+@dataclass(**_slots)
 class Holding:
     tradeType: TradeType
     ticker: str
@@ -46,7 +63,7 @@ class Holding:
     shortPosition: bool = False
 
 
-@dataclass
+@dataclass(**_slots)
 class Transaction:
     tradeType: TradeType
     ticker: str
@@ -60,7 +77,7 @@ class Transaction:
     notes: str = ""
 
 
-@dataclass
+@dataclass(**_slots)
 class Order:
     tradeType: TradeType
     ticker: str
@@ -70,3 +87,4 @@ class Order:
     orderDate: datetime
     active: bool = True
     limitPrice: Optional[float] = None
+    orderId: Optional[int] = None
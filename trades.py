@@ -1,5 +1,5 @@
 from pyBacktest.tradeTypes import (
-    TradeType, Holding, Transaction,
+    TradeType, Holding,
     InsufficientFundsError, InsufficientSharesError, ShortPositionError
 )
 import pandas as pd
@@ -27,76 +27,46 @@ def execute_buy(backtest: Backtest, price: float, numShares: int, valid_date: pd
         shortPosition=False,
         entryPrice=price
     )
-    backtest.holdings.append(holding)
+    backtest.ledger.addLong(holding)
 
-    backtest.transactions.append(
-        Transaction(
-            tradeType=trade_type,
-            ticker=backtest.ticker,
-            commission=commission,
-            executedSuccessfully=True,
-            numShares=numShares,
-            pricePerShare=price,
-            totalCost=numShares * price,
-            date=valid_date,
-            profitLoss=0.0,
-        )
+    backtest.transactions.record(
+        tradeType=trade_type,
+        ticker=backtest.ticker,
+        commission=commission,
+        executedSuccessfully=True,
+        numShares=numShares,
+        pricePerShare=price,
+        totalCost=numShares * price,
+        date=valid_date,
+        profitLoss=0.0,
     )
     return holding
 
-def execute_sell(backtest: Backtest, price: float, numShares: int, valid_date: pd.Timestamp, trade_type: TradeType = TradeType.SELL) -> Holding:
+def execute_sell(backtest: Backtest, price: float, numShares: int, valid_date: pd.Timestamp, trade_type: TradeType = TradeType.SELL) -> None:
     commission = backtest.calculateCommision(price, numShares)
-    shares_to_sell = numShares
-    total_profit_loss = 0.0
-    total_sell_value = 0.0
-
-    for holding in backtest.holdings[:]:  # Use a copy to modify the list while iterating
-        if shares_to_sell <= 0:
-            break
-        if holding.tradeType in [TradeType.BUY, TradeType.MARKET_BUY, TradeType.LIMIT_BUY]:
-            sell_shares = min(holding.numShares, shares_to_sell)
-            buy_price_per_share = holding.totalCost / holding.numShares
-            profit_loss = sell_shares * (price - buy_price_per_share)
-            total_profit_loss += profit_loss
-            total_sell_value += sell_shares * price
 
-            holding.numShares -= sell_shares
-            holding.totalCost -= sell_shares * buy_price_per_share
-            shares_to_sell -= sell_shares
-
-            if holding.numShares == 0:
-                backtest.holdings.remove(holding)
-
-    if shares_to_sell > 0:
+    if backtest.ledger.longShares < numShares:
         raise InsufficientSharesError("Not enough shares to sell")
 
+    total_profit_loss = backtest.ledger.closeLong(numShares, price)
+    total_sell_value = numShares * price
+
     backtest.cash += total_sell_value - commission
 
-    backtest.transactions.append(
-        Transaction(
-            tradeType=trade_type,
-            ticker=backtest.ticker,
-            commission=commission,
-            executedSuccessfully=True,
-            numShares=numShares,
-            pricePerShare=price,
-            totalCost=total_sell_value,
-            date=valid_date,
-            profitLoss=total_profit_loss,
-        )
-    )
-    return Holding(
-        trade_type,
-        backtest.ticker,
-        commission,
-        True,
-        numShares,
-        total_sell_value,
-        entryPrice=price
+    backtest.transactions.record(
+        tradeType=trade_type,
+        ticker=backtest.ticker,
+        commission=commission,
+        executedSuccessfully=True,
+        numShares=numShares,
+        pricePerShare=price,
+        totalCost=total_sell_value,
+        date=valid_date,
+        profitLoss=total_profit_loss,
     )
 
 def execute_market_buy(backtest: Backtest, numShares: int, valid_date: pd.Timestamp) -> Holding:
-    current_price = backtest.hist.loc[valid_date].Open
+    current_price, numShares = backtest.marketFill(1, numShares)
     commission = backtest.calculateCommision(current_price, numShares)
     total_cost = numShares * current_price + commission
 
@@ -104,6 +74,7 @@ def execute_market_buy(backtest: Backtest, numShares: int, valid_date: pd.Timest
         raise InsufficientFundsError(f"Insufficient funds for market buy. Need {total_cost}, have {backtest.cash}")
 
     backtest.cash -= total_cost
+    backtest.volumeFilled += numShares
 
     holding = Holding(
         TradeType.MARKET_BUY,
@@ -114,76 +85,47 @@ def execute_market_buy(backtest: Backtest, numShares: int, valid_date: pd.Timest
         numShares * current_price,
         entryPrice=current_price
     )
-    backtest.holdings.append(holding)
+    backtest.ledger.addLong(holding)
     
-    backtest.transactions.append(
-        Transaction(
-            tradeType=TradeType.MARKET_BUY,
-            ticker=backtest.ticker,
-            commission=commission,
-            executedSuccessfully=True,
-            numShares=numShares,
-            pricePerShare=current_price,
-            totalCost=numShares * current_price,
-            date=valid_date,
-            profitLoss=0.0,
-            notes="Market order"
-        )
+    backtest.transactions.record(
+        tradeType=TradeType.MARKET_BUY,
+        ticker=backtest.ticker,
+        commission=commission,
+        executedSuccessfully=True,
+        numShares=numShares,
+        pricePerShare=current_price,
+        totalCost=numShares * current_price,
+        date=valid_date,
+        profitLoss=0.0,
+        notes="Market order"
     )
     return holding
 
-def execute_market_sell(backtest: Backtest, numShares: int, valid_date: pd.Timestamp) -> Holding:
-    current_price = backtest.hist.loc[valid_date].Open
+def execute_market_sell(backtest: Backtest, numShares: int, valid_date: pd.Timestamp) -> None:
+    current_price, numShares = backtest.marketFill(-1, numShares)
     commission = backtest.calculateCommision(current_price, numShares)
-    shares_to_sell = numShares
-    total_profit_loss = 0.0
-    total_sell_value = 0.0
-
-    for holding in backtest.holdings[:]:
-        if shares_to_sell <= 0:
-            break
-        if holding.tradeType in [TradeType.BUY, TradeType.MARKET_BUY, TradeType.LIMIT_BUY]:
-            sell_shares = min(holding.numShares, shares_to_sell)
-            buy_price_per_share = holding.totalCost / holding.numShares
-            profit_loss = sell_shares * (current_price - buy_price_per_share)
-            total_profit_loss += profit_loss
-            total_sell_value += sell_shares * current_price
-
-            holding.numShares -= sell_shares
-            holding.totalCost -= sell_shares * buy_price_per_share
-            shares_to_sell -= sell_shares
 
-            if holding.numShares == 0:
-                backtest.holdings.remove(holding)
+    if backtest.ledger.longShares < numShares:
+        raise InsufficientSharesError(f"Not enough shares for market sell. Still need {numShares - backtest.ledger.longShares} shares")
 
-    if shares_to_sell > 0:
-        raise InsufficientSharesError(f"Not enough shares for market sell. Still need {shares_to_sell} shares")
+    total_profit_loss = backtest.ledger.closeLong(numShares, current_price)
+    total_sell_value = numShares * current_price
 
     sell_proceeds = total_sell_value - commission
     backtest.cash += sell_proceeds
+    backtest.volumeFilled += numShares
 
-    backtest.transactions.append(
-        Transaction(
-            tradeType=TradeType.MARKET_SELL,
-            ticker=backtest.ticker,
-            commission=commission,
-            executedSuccessfully=True,
-            numShares=numShares,
-            pricePerShare=current_price,
-            totalCost=total_sell_value,
-            date=valid_date,
-            profitLoss=total_profit_loss,
-            notes="Market order"
-        )
-    )
-    return Holding(
-        TradeType.MARKET_SELL,
-        backtest.ticker,
-        commission,
-        True,
-        numShares,
-        total_sell_value,
-        entryPrice=current_price
+    backtest.transactions.record(
+        tradeType=TradeType.MARKET_SELL,
+        ticker=backtest.ticker,
+        commission=commission,
+        executedSuccessfully=True,
+        numShares=numShares,
+        pricePerShare=current_price,
+        totalCost=total_sell_value,
+        date=valid_date,
+        profitLoss=total_profit_loss,
+        notes="Market order"
     )
 
 def execute_short_sell(backtest: Backtest, price: float, numShares: int, valid_date: pd.Timestamp) -> Holding:
@@ -201,74 +143,42 @@ def execute_short_sell(backtest: Backtest, price: float, numShares: int, valid_d
         shortPosition=True,
         entryPrice=price
     )
-    backtest.holdings.append(holding)
+    backtest.ledger.addShort(holding)
 
-    backtest.transactions.append(
-        Transaction(
-            tradeType=TradeType.SHORT_SELL,
-            ticker=backtest.ticker,
-            commission=commission,
-            executedSuccessfully=True,
-            numShares=numShares,
-            pricePerShare=price,
-            totalCost=proceeds,
-            date=valid_date,
-            profitLoss=0.0,
-        )
+    backtest.transactions.record(
+        tradeType=TradeType.SHORT_SELL,
+        ticker=backtest.ticker,
+        commission=commission,
+        executedSuccessfully=True,
+        numShares=numShares,
+        pricePerShare=price,
+        totalCost=proceeds,
+        date=valid_date,
+        profitLoss=0.0,
     )
     return holding
 
-def execute_short_cover(backtest: Backtest, price: float, numShares: int, valid_date: pd.Timestamp) -> Holding:
+def execute_short_cover(backtest: Backtest, price: float, numShares: int, valid_date: pd.Timestamp) -> None:
     commission = backtest.calculateCommision(price, numShares)
-    shares_to_cover = numShares
-    total_profit_loss = 0.0
-    total_cover_cost = 0.0
-
-    for holding in backtest.holdings[:]:
-        if shares_to_cover <= 0:
-            break
-        if holding.tradeType == TradeType.SHORT_SELL:
-            cover_shares = min(holding.numShares, shares_to_cover)
-            sell_price_per_share = holding.totalCost / holding.numShares
-            profit_loss = cover_shares * (sell_price_per_share - price)
-            total_profit_loss += profit_loss
-            total_cover_cost += cover_shares * price
-
-            holding.numShares -= cover_shares
-            holding.totalCost -= cover_shares * sell_price_per_share
-            shares_to_cover -= cover_shares
+    total_cover_cost = numShares * price
 
-            if holding.numShares == 0:
-                backtest.holdings.remove(holding)
-
-    if shares_to_cover > 0:
+    if backtest.ledger.shortShares < numShares:
         raise ShortPositionError("Not enough short positions to cover")
 
     if backtest.cash < total_cover_cost + commission:
         raise InsufficientFundsError(f"Insufficient funds to cover short position. Need ${total_cover_cost + commission:,.2f}, have ${backtest.cash:,.2f}")
 
+    total_profit_loss = backtest.ledger.closeShort(numShares, price)
     backtest.cash -= total_cover_cost + commission
 
-    backtest.transactions.append(
-        Transaction(
-            tradeType=TradeType.SHORT_COVER,
-            ticker=backtest.ticker,
-            commission=commission,
-            executedSuccessfully=True,
-            numShares=numShares,
-            pricePerShare=price,
-            totalCost=total_cover_cost,
-            date=valid_date,
-            profitLoss=total_profit_loss,
-        )
-    )
-    return Holding(
+    backtest.transactions.record(
         tradeType=TradeType.SHORT_COVER,
         ticker=backtest.ticker,
         commission=commission,
         executedSuccessfully=True,
         numShares=numShares,
+        pricePerShare=price,
         totalCost=total_cover_cost,
-        entryPrice=price,
-        shortPosition=False
+        date=valid_date,
+        profitLoss=total_profit_loss,
     )
@@ -0,0 +1,300 @@
+import bisect
+import os
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Sequence, Union
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+from pyBacktest.tradeTypes import TradeType, Transaction
+
+COLUMNS = {
+    "tradeType": np.int8,
+    "ticker": np.int32,
+    "commission": np.float64,
+    "executedSuccessfully": np.bool_,
+    "numShares": np.int64,
+    "pricePerShare": np.float64,
+    "totalCost": np.float64,
+    "date": np.int64,
+    "profitLoss": np.float64,
+    "notes": np.int32,
+}
+
+
+class TransactionLog:
+    def __init__(self, capacity: int = 1024, spillDir: Optional[str] = None, spillThreshold: int = 1_000_000) -> None:
+        self._capacity = max(capacity, 1)
+        self._arrays: Dict[str, np.ndarray] = {name: np.zeros(self._capacity, dtype=dtype) for name, dtype in COLUMNS.items()}
+        self._size = 0
+        self._tz = None
+        self._hasDates = False
+        self._tickers: List[str] = []
+        self._notes: List[str] = []
+        self._tickerCodes: Dict[str, int] = {}
+        self._noteCodes: Dict[str, int] = {}
+        self.spillDir = spillDir
+        self.spillThreshold = spillThreshold
+        self._chunks: List[Dict[str, np.ndarray]] = []
+        self._chunkStarts: List[int] = []
+        self._spilled = 0
+
+    @staticmethod
+    def _code(codes: Dict[str, int], strings: List[str], value: str) -> int:
+        code = codes.get(value)
+        if code is None:
+            code = len(strings)
+            codes[value] = code
+            strings.append(value)
+        return code
+
+    def _dateValue(self, date: datetime) -> int:
+        if not isinstance(date, pd.Timestamp):
+            date = pd.Timestamp(date)
+        if not self._hasDates:
+            self._tz = date.tz
+            self._hasDates = True
+        elif date.tz is None and self._tz is not None:
+            date = date.tz_localize(self._tz)
+        elif date.tz is not None and self._tz is None:
+            date = date.tz_localize(None)
+        return date.value
+
+    def _grow(self, needed: int) -> None:
+        capacity = self._capacity
+        while capacity < needed:
+            capacity *= 2
+        for name, array in self._arrays.items():
+            grown = np.zeros(capacity, dtype=array.dtype)
+            grown[:self._size] = array[:self._size]
+            self._arrays[name] = grown
+        self._capacity = capacity
+
+    def record(
+        self,
+        tradeType: TradeType,
+        ticker: str,
+        commission: float,
+        executedSuccessfully: bool,
+        numShares: int,
+        pricePerShare: float,
+        totalCost: float,
+        date: datetime,
+        profitLoss: float = 0.0,
+        notes: str = "",
+    ) -> int:
+        if self._size == self._capacity:
+            self._grow(self._size + 1)
+        i = self._size
+        arrays = self._arrays
+        arrays["tradeType"][i] = tradeType.value
+        arrays["ticker"][i] = self._code(self._tickerCodes, self._tickers, ticker)
+        arrays["commission"][i] = commission
+        arrays["executedSuccessfully"][i] = executedSuccessfully
+        arrays["numShares"][i] = numShares
+        arrays["pricePerShare"][i] = pricePerShare
+        arrays["totalCost"][i] = totalCost
+        arrays["date"][i] = self._dateValue(date)
+        arrays["profitLoss"][i] = profitLoss
+        arrays["notes"][i] = self._code(self._noteCodes, self._notes, notes)
+        self._size += 1
+        # Spilling moves the live rows into a chunk, so the global index is taken first
+        index = self._spilled + i
+        if self.spillDir is not None and self._size >= self.spillThreshold:
+            self.spill()
+        return index
+
+    def append(self, transaction: Transaction) -> None:
+        self.record(
+            tradeType=transaction.tradeType,
+            ticker=transaction.ticker,
+            commission=transaction.commission,
+            executedSuccessfully=transaction.executedSuccessfully,
+            numShares=transaction.numShares,
+            pricePerShare=transaction.pricePerShare,
+            totalCost=transaction.totalCost,
+            date=transaction.date,
+            profitLoss=transaction.profitLoss,
+            notes=transaction.notes,
+        )
+
+    def extend(self, other: 'TransactionLog') -> None:
+        # Bulk copy of another log's columns, remapping its ticker and note codes onto this log's tables
+        count = len(other)
+        if not count:
+            return
+        columns = other.to_numpy()
+        if self._size + count > self._capacity:
+            self._grow(self._size + count)
+        if not self._hasDates and other._hasDates:
+            self._tz = other._tz
+            self._hasDates = True
+        tickerMap = np.array([self._code(self._tickerCodes, self._tickers, t) for t in other._tickers], dtype=np.int32)
+        noteMap = np.array([self._code(self._noteCodes, self._notes, n) for n in other._notes], dtype=np.int32)
+        lo, hi = self._size, self._size + count
+        for name, values in columns.items():
+            if name == "ticker":
+                values = tickerMap[values]
+            elif name == "notes":
+                values = noteMap[values]
+            self._arrays[name][lo:hi] = values
+        self._size = hi
+        if self.spillDir is not None and self._size >= self.spillThreshold:
+            self.spill()
+
+    def recordBatch(
+        self,
+        tradeType: np.ndarray,
+        ticker: Union[str, Sequence[str]],
+        commission: np.ndarray,
+        numShares: np.ndarray,
+        pricePerShare: np.ndarray,
+        totalCost: np.ndarray,
+        date: pd.DatetimeIndex,
+        profitLoss: Union[float, np.ndarray] = 0.0,
+        notes: str = "",
+    ) -> None:
+        count = len(numShares)
+        if not count:
+            return
+        if self._size + count > self._capacity:
+            self._grow(self._size + count)
+        if isinstance(ticker, str):
+            tickerCodes = self._code(self._tickerCodes, self._tickers, ticker)
+        else:
+            tickerCodes = np.fromiter((self._code(self._tickerCodes, self._tickers, t) for t in ticker), dtype=np.int32, count=count)
+        self._dateValue(date[0])
+        if date.tz is not None and self._tz is None:
+            date = date.tz_localize(None)
+        elif date.tz is None and self._tz is not None:
+            date = date.tz_localize(self._tz)
+        lo, hi = self._size, self._size + count
+        arrays = self._arrays
+        arrays["tradeType"][lo:hi] = np.asarray(tradeType)
+        arrays["ticker"][lo:hi] = tickerCodes
+        arrays["commission"][lo:hi] = commission
+        arrays["executedSuccessfully"][lo:hi] = True
+        arrays["numShares"][lo:hi] = numShares
+        arrays["pricePerShare"][lo:hi] = pricePerShare
+        arrays["totalCost"][lo:hi] = totalCost
+        arrays["date"][lo:hi] = date.values.astype("datetime64[ns]").view(np.int64)
+        arrays["profitLoss"][lo:hi] = profitLoss
+        arrays["notes"][lo:hi] = self._code(self._noteCodes, self._notes, notes)
+        self._size = hi
+        if self.spillDir is not None and self._size >= self.spillThreshold:
+            self.spill()
+
+    def spill(self) -> None:
+        if self.spillDir is None or not self._size:
+            return
+        os.makedirs(self.spillDir, exist_ok=True)
+        chunk = {}
+        for name, array in self._arrays.items():
+            path = os.path.join(self.spillDir, f"chunk{len(self._chunks)}_{name}.npy")
+            np.save(path, array[:self._size])
+            chunk[name] = np.load(path, mmap_mode="r")
+        self._chunks.append(chunk)
+        self._chunkStarts.append(self._spilled)
+        self._spilled += self._size
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._spilled + self._size
+
+    def state(self) -> dict:
+        # Everything besides the columns needed to rebuild the log
+        return {"tickers": list(self._tickers), "notes": list(self._notes), "tz": self._tz, "hasDates": self._hasDates}
+
+    def rows(self, start: int = 0) -> Dict[str, np.ndarray]:
+        # Columns from row start onward, reading only the spilled chunks that hold them
+        live = {name: array[max(start - self._spilled, 0):self._size] for name, array in self._arrays.items()}
+        if start >= self._spilled:
+            return live
+        parts = []
+        for chunkStart, chunk in zip(self._chunkStarts, self._chunks):
+            if chunkStart + len(chunk["date"]) > start:
+                parts.append({name: values[max(start - chunkStart, 0):] for name, values in chunk.items()})
+        parts.append(live)
+        return {name: np.concatenate([part[name] for part in parts]) for name in COLUMNS}
+
+    def load(self, columns: Dict[str, np.ndarray], state: dict) -> None:
+        # Replaces the contents with saved columns and code tables, as written by rows() and state()
+        count = len(columns["date"])
+        self._chunks, self._chunkStarts, self._spilled, self._size = [], [], 0, 0
+        if count > self._capacity:
+            self._grow(count)
+        for name in COLUMNS:
+            self._arrays[name][:count] = columns[name]
+        self._size = count
+        self._tickers = list(state["tickers"])
+        self._notes = list(state["notes"])
+        self._tickerCodes = {ticker: code for code, ticker in enumerate(self._tickers)}
+        self._noteCodes = {note: code for code, note in enumerate(self._notes)}
+        self._tz = state["tz"]
+        self._hasDates = state["hasDates"]
+        if self.spillDir is not None and self._size >= self.spillThreshold:
+            self.spill()
+
+    def _locate(self, i: int):
+        if i >= self._spilled:
+            return self._arrays, i - self._spilled
+        chunk = bisect.bisect_right(self._chunkStarts, i) - 1
+        return self._chunks[chunk], i - self._chunkStarts[chunk]
+
+    def _date(self, value: int) -> pd.Timestamp:
+        date = pd.Timestamp(int(value))
+        return date.tz_localize("UTC").tz_convert(self._tz) if self._tz is not None else date
+
+    def _materialize(self, i: int) -> Transaction:
+        arrays, j = self._locate(i)
+        return Transaction(
+            tradeType=TradeType(int(arrays["tradeType"][j])),
+            ticker=self._tickers[arrays["ticker"][j]],
+            commission=float(arrays["commission"][j]),
+            executedSuccessfully=bool(arrays["executedSuccessfully"][j]),
+            numShares=int(arrays["numShares"][j]),
+            pricePerShare=float(arrays["pricePerShare"][j]),
+            totalCost=float(arrays["totalCost"][j]),
+            date=self._date(arrays["date"][j]),
+            profitLoss=float(arrays["profitLoss"][j]),
+            notes=self._notes[arrays["notes"][j]],
+        )
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[Transaction, List[Transaction]]:
+        if isinstance(key, slice):
+            return [self._materialize(i) for i in range(*key.indices(len(self)))]
+        if key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError("transaction index out of range")
+        return self._materialize(key)
+
+    def __iter__(self) -> Iterator[Transaction]:
+        for i in range(len(self)):
+            yield self._materialize(i)
+
+    def to_numpy(self) -> Dict[str, np.ndarray]:
+        # Views onto the live buffers; only a spilled log has to concatenate
+        if not self._chunks:
+            return {name: array[:self._size] for name, array in self._arrays.items()}
+        return {
+            name: np.concatenate([chunk[name] for chunk in self._chunks] + [array[:self._size]])
+            for name, array in self._arrays.items()
+        }
+
+    def to_pandas(self) -> DataFrame:
+        columns = self.to_numpy()
+        date = pd.DatetimeIndex(columns["date"].view("datetime64[ns]"))
+        if self._tz is not None:
+            date = date.tz_localize("UTC").tz_convert(self._tz)
+        return DataFrame({
+            "tradeType": pd.Categorical.from_codes(columns["tradeType"] - 1, [t.name for t in TradeType]),
+            "ticker": pd.Categorical.from_codes(columns["ticker"], self._tickers),
+            "commission": columns["commission"],
+            "executedSuccessfully": columns["executedSuccessfully"],
+            "numShares": columns["numShares"],
+            "pricePerShare": columns["pricePerShare"],
+            "totalCost": columns["totalCost"],
+            "date": date,
+            "profitLoss": columns["profitLoss"],
+            "notes": pd.Categorical.from_codes(columns["notes"], self._notes),
+        }, copy=False)
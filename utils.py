@@ -1,24 +1,45 @@
-from typing import List, Union, Tuple
+from typing import List, Optional, Union, Tuple
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 from pyBacktest.results import BacktestResult
-import yfinance as yf
+from pyBacktest import kernels
+from pyBacktest.data import DataSource, getDefaultDataSource
 
 def calculateSMA(data: pd.Series, period: int) -> pd.Series:
+    x = kernels.accelerated(data)
+    if x is not None:
+        return kernels.wrap(data, kernels.rollingMean(x, period))
     return data.rolling(window=period).mean()
 
 def calculateEMA(data: pd.Series, period: int) -> pd.Series:
+    x = kernels.accelerated(data, finite=True)
+    if x is not None:
+        return kernels.wrap(data, kernels.ema(x, 2 / (period + 1)))
     return data.ewm(span=period, adjust=False).mean()
 
-def calculateRSI(data: pd.Series, period: int = 14) -> pd.Series:
+def calculateRSI(data: pd.Series, period: int = 14, method: str = "simple") -> pd.Series:
+    x = kernels.accelerated(data, finite=True)
+    if x is not None and method in ("simple", "wilder"):
+        return kernels.wrap(data, kernels.rsi(x, period, method == "wilder"))
     delta = data.diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+    if method == "wilder":
+        gain = (delta.where(delta > 0, 0)).ewm(alpha=1 / period, adjust=False, min_periods=period).mean()
+        loss = (-delta.where(delta < 0, 0)).ewm(alpha=1 / period, adjust=False, min_periods=period).mean()
+    elif method == "simple":
+        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
+        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+    else:
+        raise ValueError(f"Invalid RSI method: {method}, accepted methods are wilder and simple")
     rs = gain / loss
     return 100 - (100 / (1 + rs))
 
 def calculateBollingerBands(data: pd.Series, period: int = 20, stdDev: int = 2) -> Tuple[pd.Series, pd.Series, pd.Series]:
+    x = kernels.accelerated(data, finite=True)
+    if x is not None:
+        middle = kernels.rollingMean(x, period)
+        width = kernels.rollingStd(x, period) * stdDev
+        return kernels.wrap(data, middle + width), kernels.wrap(data, middle), kernels.wrap(data, middle - width)
     sma = calculateSMA(data, period)
     std = data.rolling(window=period).std()
     upperBand = sma + (std * stdDev)
@@ -26,6 +47,11 @@ def calculateBollingerBands(data: pd.Series, period: int = 20, stdDev: int = 2)
     return upperBand, sma, lowerBand
 
 def calculateMACD(data: pd.Series, fastPeriod: int = 12, slowPeriod: int = 26, signalPeriod: int = 9) -> Tuple[pd.Series, pd.Series, pd.Series]:
+    x = kernels.accelerated(data, finite=True)
+    if x is not None:
+        macd = kernels.ema(x, 2 / (fastPeriod + 1)) - kernels.ema(x, 2 / (slowPeriod + 1))
+        signal = kernels.ema(macd, 2 / (signalPeriod + 1))
+        return kernels.wrap(data, macd), kernels.wrap(data, signal), kernels.wrap(data, macd - signal)
     fastEMA = calculateEMA(data, fastPeriod)
     slowEMA = calculateEMA(data, slowPeriod)
     macd = fastEMA - slowEMA
@@ -33,7 +59,27 @@ def calculateMACD(data: pd.Series, fastPeriod: int = 12, slowPeriod: int = 26, s
     histogram = macd - signal
     return macd, signal, histogram
 
+def calculateATR(high: pd.Series, low: pd.Series, close: pd.Series, period: int = 14) -> pd.Series:
+    x = kernels.accelerated(close, finite=True)
+    if x is not None:
+        h, l = kernels.values(high), kernels.values(low)
+        trueRange = h - l
+        if len(x) > 1:
+            np.maximum(trueRange[1:], np.abs(h[1:] - x[:-1]), out=trueRange[1:])
+            np.maximum(trueRange[1:], np.abs(l[1:] - x[:-1]), out=trueRange[1:])
+        return kernels.wrap(close, kernels.ema(trueRange, 1 / period, period))
+    previousClose = close.shift(1)
+    trueRange = pd.concat([high - low, (high - previousClose).abs(), (low - previousClose).abs()], axis=1).max(axis=1)
+    return trueRange.ewm(alpha=1 / period, adjust=False, min_periods=period).mean()
+
+def calculateVWAP(high: pd.Series, low: pd.Series, close: pd.Series, volume: pd.Series) -> pd.Series:
+    typical = (high + low + close) / 3
+    return (typical * volume).cumsum() / volume.cumsum()
+
 def calculateDrawdown(data: pd.Series) -> Tuple[float, float]:
+    x = kernels.accelerated(data)
+    if x is not None:
+        return kernels.drawdown(x)
     rolling_max = data.expanding().max()
     drawdown = data / rolling_max - 1.0
     maxDrawdown = drawdown.min()
@@ -41,10 +87,18 @@ def calculateDrawdown(data: pd.Series) -> Tuple[float, float]:
     return maxDrawdown, currentDrawdown
 
 def calculateSharpeRatio(returns: pd.Series, riskFreeRate: float = 0.01) -> float:
+    x = kernels.accelerated(returns)
+    if x is not None:
+        mean, std = kernels.meanStd(x)
+        return np.sqrt(252) * ((mean - riskFreeRate / 252) / std)
     excessReturns = returns - riskFreeRate/252
     return np.sqrt(252) * (excessReturns.mean() / excessReturns.std())
 
 def calculateVolatility(returns: pd.Series, annualized: bool = True) -> float:
+    x = kernels.accelerated(returns)
+    if x is not None:
+        vol = kernels.meanStd(x)[1]
+        return vol * np.sqrt(252) if annualized else vol
     vol = returns.std()
     return vol * np.sqrt(252) if annualized else vol
 
@@ -53,16 +107,21 @@ def calculateBeta(returns: pd.Series, marketReturns: pd.Series) -> float:
     marketVariance = marketReturns.var()
     return covariance / marketVariance
 
-def calculateReturnStats(returns: pd.Series) -> dict:
+def calculateReturnStats(returns: pd.Series, equity: pd.Series = None) -> dict:
     return {
         "totalReturn": (returns + 1).prod() - 1,
         "annualizedReturn": (1 + returns).prod() ** (252/len(returns)) - 1,
         "volatility": calculateVolatility(returns),
         "sharpeRatio": calculateSharpeRatio(returns),
-        "maxDrawdown": calculateDrawdown(returns)[0]
+        "maxDrawdown": calculateDrawdown(equity if equity is not None else returns)[0]
     }
 
 def calculateSortinoRatio(returns: pd.Series, riskFreeRate: float = 0.01) -> float:
+    x = kernels.accelerated(returns)
+    if x is not None:
+        mean = kernels.meanStd(x)[0]
+        downside_deviation = kernels.meanStd(x, negativeOnly=True)[1]
+        return np.sqrt(252) * ((mean - riskFreeRate / 252) / downside_deviation)
     downside_returns = returns[returns < 0]
     expected_return = returns.mean() - riskFreeRate / 252
     downside_deviation = downside_returns.std()
@@ -76,6 +135,97 @@ def calculateTreynorRatio(returns: pd.Series, marketReturns: pd.Series, riskFree
 def calculateVaR(returns: pd.Series, confidence_level: float = 0.95) -> float:
     return np.percentile(returns, (1 - confidence_level) * 100)
 
+BatchInput = Union[pd.DataFrame, np.ndarray]
+
+def _batchValues(data: BatchInput) -> Tuple[np.ndarray, Optional[pd.Index]]:
+    # Time runs down the rows and each column is one run
+    if isinstance(data, pd.DataFrame):
+        return data.to_numpy(dtype=np.float64), data.columns
+    if isinstance(data, pd.Series):
+        return data.to_numpy(dtype=np.float64)[:, None], pd.Index([data.name])
+    values = np.asarray(data, dtype=np.float64)
+    return (values[:, None] if values.ndim == 1 else values), None
+
+def _batchWrap(values: np.ndarray, columns: Optional[pd.Index]) -> Union[pd.Series, np.ndarray]:
+    return pd.Series(values, index=columns) if columns is not None else values
+
+def _columnStd(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    counts = np.sum(~np.isnan(values), axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = np.nansum(values, axis=0) / counts
+        deviations = values - means
+        stds = np.sqrt(np.nansum(deviations * deviations, axis=0) / (counts - 1))
+    return means, stds, counts
+
+def calculateBatchSharpeRatio(returns: BatchInput, riskFreeRate: float = 0.01) -> Union[pd.Series, np.ndarray]:
+    values, columns = _batchValues(returns)
+    means, stds, _ = _columnStd(values)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return _batchWrap(np.sqrt(252) * ((means - riskFreeRate / 252) / stds), columns)
+
+def calculateBatchVolatility(returns: BatchInput, annualized: bool = True) -> Union[pd.Series, np.ndarray]:
+    values, columns = _batchValues(returns)
+    stds = _columnStd(values)[1]
+    return _batchWrap(stds * np.sqrt(252) if annualized else stds, columns)
+
+def calculateBatchBeta(returns: BatchInput, marketReturns: Union[pd.Series, np.ndarray]) -> Union[pd.Series, np.ndarray]:
+    values, columns = _batchValues(returns)
+    market = np.asarray(marketReturns, dtype=np.float64)[:, None]
+    # Covariance over the rows where both the run and the market have data, as Series.cov does
+    paired = ~np.isnan(values) & ~np.isnan(market)
+    counts = paired.sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        runMeans = np.where(paired, values, 0.0).sum(axis=0) / counts
+        marketMeans = np.where(paired, market, 0.0).sum(axis=0) / counts
+        covariance = np.where(paired, (values - runMeans) * (market - marketMeans), 0.0).sum(axis=0) / (counts - 1)
+        return _batchWrap(covariance / np.nanvar(market, ddof=1), columns)
+
+def calculateBatchVaR(returns: BatchInput, confidence_level: float = 0.95) -> Union[pd.Series, np.ndarray]:
+    values, columns = _batchValues(returns)
+    return _batchWrap(np.nanpercentile(values, (1 - confidence_level) * 100, axis=0), columns)
+
+def calculateBatchDrawdown(data: BatchInput) -> Tuple[Union[pd.Series, np.ndarray], Union[pd.Series, np.ndarray]]:
+    values, columns = _batchValues(data)
+    peaks = np.fmax.accumulate(values, axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        drawdown = values / peaks - 1.0
+    maxDrawdown = np.full(values.shape[1], np.nan)
+    hasData = ~np.all(np.isnan(drawdown), axis=0)
+    maxDrawdown[hasData] = np.nanmin(drawdown[:, hasData], axis=0)
+    return _batchWrap(maxDrawdown, columns), _batchWrap(drawdown[-1], columns)
+
+def calculateBatchReturnStats(returns: BatchInput, equity: Optional[BatchInput] = None) -> Union[pd.DataFrame, dict]:
+    values, columns = _batchValues(returns)
+    counts = np.sum(~np.isnan(values), axis=0)
+    growth = np.nanprod(1 + values, axis=0)
+    means, stds, _ = _columnStd(values)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        stats = {
+            "totalReturn": growth - 1,
+            "annualizedReturn": growth ** (252 / counts) - 1,
+            "volatility": stds * np.sqrt(252),
+            "sharpeRatio": np.sqrt(252) * ((means - 0.01 / 252) / stds),
+            "maxDrawdown": np.asarray(calculateBatchDrawdown(equity if equity is not None else values)[0]),
+        }
+    if columns is None:
+        return stats
+    return pd.DataFrame(stats, index=columns)
+
+def calculateRollingSharpeRatio(returns: BatchInput, window: int, riskFreeRate: float = 0.01) -> pd.DataFrame:
+    frame = returns.to_frame() if isinstance(returns, pd.Series) else pd.DataFrame(returns)
+    rolling = frame.rolling(window)
+    return np.sqrt(252) * ((rolling.mean() - riskFreeRate / 252) / rolling.std())
+
+def calculateRollingVolatility(returns: BatchInput, window: int, annualized: bool = True) -> pd.DataFrame:
+    frame = returns.to_frame() if isinstance(returns, pd.Series) else pd.DataFrame(returns)
+    vol = frame.rolling(window).std()
+    return vol * np.sqrt(252) if annualized else vol
+
+def calculateRollingBeta(returns: BatchInput, marketReturns: pd.Series, window: int) -> pd.DataFrame:
+    frame = returns.to_frame() if isinstance(returns, pd.Series) else pd.DataFrame(returns)
+    market = pd.Series(np.asarray(marketReturns, dtype=np.float64), index=frame.index)
+    return frame.rolling(window).cov(market).div(market.rolling(window).var(), axis=0)
+
 def getPreviousRows(data: pd.DataFrame, date: datetime, periods: int) -> pd.DataFrame:
     date = pd.Timestamp(date)
     if date not in data.index:
@@ -139,7 +289,7 @@ def compareBacktests(results1: BacktestResult, results2: BacktestResult) -> dict
     }
     return comparison
 
-def getSP500Returns(start_date: datetime, end_date: datetime) -> pd.Series:
-    sp500 = yf.Ticker('^GSPC')
-    sp500_data = sp500.history(start=start_date, end=end_date)
+def getSP500Returns(start_date: datetime, end_date: datetime, dataSource: DataSource = None) -> pd.Series:
+    source = dataSource if dataSource is not None else getDefaultDataSource()
+    sp500_data = source.history('^GSPC', start_date, end_date, "1d")
     return sp500_data['Close'].pct_change().dropna()
\ No newline at end of file
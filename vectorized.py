@@ -0,0 +1,187 @@
+from datetime import timedelta
+from typing import Optional, Union
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+from pyBacktest.commissions import calculate_commission_array
+from pyBacktest.data import DataFrameSource, _toTimestamp
+from pyBacktest.results import BacktestResult
+from pyBacktest.strategy import Strategy
+from pyBacktest.tradeTypes import TradeType
+from pyBacktest.transactionLog import TransactionLog
+
+ArrayLike = Union[pd.Series, np.ndarray]
+
+
+def signalsToPositions(entries: ArrayLike, exits: ArrayLike, size: Union[int, ArrayLike] = 1) -> np.ndarray:
+    entries = np.asarray(entries, dtype=bool)
+    exits = np.asarray(exits, dtype=bool)
+    # Exits take precedence when both fire on the same bar
+    changed = entries | exits
+    state = np.where(exits, 0, 1)
+    lastChange = np.maximum.accumulate(np.where(changed, np.arange(len(changed)), -1))
+    held = np.where(lastChange >= 0, state[np.maximum(lastChange, 0)], 0)
+    sizes = np.broadcast_to(np.asarray(size), held.shape)
+    # Hold the size chosen at entry until the next exit
+    return held * sizes[np.maximum(lastChange, 0)]
+
+
+def runVectorized(
+    hist: DataFrame,
+    cash: float,
+    entries: Optional[ArrayLike] = None,
+    exits: Optional[ArrayLike] = None,
+    targetPositions: Optional[ArrayLike] = None,
+    size: Union[int, ArrayLike] = 1,
+    commision: float = 0.0,
+    commisionType: str = "FLAT",
+    priceField: str = "Close",
+    ticker: str = "",
+) -> BacktestResult:
+    if targetPositions is None:
+        if entries is None or exits is None:
+            raise ValueError("Either targetPositions or both entries and exits must be given")
+        targetPositions = signalsToPositions(entries, exits, size)
+
+    position = np.asarray(targetPositions, dtype=np.int64).copy()
+    # Like Backtest.run, the first bar is the starting point and is never traded on
+    position[0] = 0
+    fillPrice = hist[priceField].to_numpy(dtype=np.float64)
+    closePrice = hist["Close"].to_numpy(dtype=np.float64)
+
+    previous = np.concatenate(([0], position[:-1]))
+    trade = position - previous
+    # A trade that flips the sign of the position is two legs: close the old side, open the new one
+    crossing = (previous * position) < 0
+    closeLeg = np.where(crossing, np.abs(previous), np.abs(trade))
+    openLeg = np.where(crossing, np.abs(position), 0)
+
+    commission = (
+        calculate_commission_array(commisionType, commision, fillPrice, closeLeg)
+        + calculate_commission_array(commisionType, commision, fillPrice, openLeg)
+    )
+    cashFlow = -(trade * fillPrice) - commission
+    cashCurve = cash + np.cumsum(cashFlow)
+    equityCurve = cashCurve + position * closePrice
+
+    equity = DataFrame(
+        {"cash": cashCurve, "position": position, "equity": equityCurve},
+        index=hist.index,
+    )
+    transactions = _buildTransactions(hist.index, fillPrice, previous, position, closeLeg, openLeg, commisionType, commision, ticker)
+    return BacktestResult(
+        final_value=float(equityCurve[-1]) if len(equityCurve) else float(cash),
+        transactions=transactions,
+        strategy=None,
+        equity=equity,
+    )
+
+
+def _buildTransactions(index, fillPrice, previous, position, closeLeg, openLeg, commisionType, commision, ticker):
+    bars = np.flatnonzero(closeLeg)
+    before = previous[bars]
+    after = position[bars]
+    firstLeg = np.select(
+        [before > 0, before < 0, after > 0],
+        [
+            np.where(after < before, TradeType.SELL.value, TradeType.BUY.value),
+            np.where(after > before, TradeType.SHORT_COVER.value, TradeType.SHORT_SELL.value),
+            TradeType.BUY.value,
+        ],
+        TradeType.SHORT_SELL.value,
+    )
+    secondLeg = np.where(after < 0, TradeType.SHORT_SELL.value, TradeType.BUY.value)
+
+    # Only bars that trade are materialized, closing leg first on a sign flip
+    legBars = np.concatenate((bars, bars[openLeg[bars] > 0]))
+    legTypes = np.concatenate((firstLeg, secondLeg[openLeg[bars] > 0]))
+    legShares = np.concatenate((closeLeg[bars], openLeg[bars][openLeg[bars] > 0]))
+    order = np.argsort(legBars, kind="stable")
+    legBars, legTypes, legShares = legBars[order], legTypes[order], legShares[order]
+    legPrices = fillPrice[legBars]
+    legCommissions = calculate_commission_array(commisionType, commision, legPrices, legShares)
+
+    transactions = TransactionLog(capacity=len(legBars))
+    transactions.recordBatch(
+        tradeType=legTypes,
+        ticker=ticker,
+        commission=legCommissions,
+        numShares=legShares,
+        pricePerShare=legPrices,
+        totalCost=legShares * legPrices,
+        date=index[legBars],
+    )
+    return transactions
+
+
+class TargetPositionStrategy(Strategy):
+    def __init__(self, targetPositions: ArrayLike, priceField: str = "Close") -> None:
+        super().__init__()
+        self.targetPositions = np.asarray(targetPositions, dtype=np.int64)
+        self.priceField = priceField
+
+    def step(self, row: pd.Series) -> None:
+        target = int(self.targetPositions[self.backtest.cursor])
+        position = self.backtest.getPosition()
+        if target == position:
+            return
+        price = row[self.priceField]
+        if position > 0 and target < position:
+            self.backtest.trade(TradeType.SELL, min(position, position - target), price)
+            position = max(target, 0)
+        elif position < 0 and target > position:
+            self.backtest.trade(TradeType.SHORT_COVER, min(-position, target - position), price)
+            position = min(target, 0)
+        if target > position:
+            self.backtest.trade(TradeType.BUY, target - position, price)
+        elif target < position:
+            self.backtest.trade(TradeType.SHORT_SELL, position - target, price)
+
+
+def compareWithBacktest(
+    hist: DataFrame,
+    cash: float,
+    entries: Optional[ArrayLike] = None,
+    exits: Optional[ArrayLike] = None,
+    targetPositions: Optional[ArrayLike] = None,
+    size: Union[int, ArrayLike] = 1,
+    commision: float = 0.0,
+    commisionType: str = "FLAT",
+    priceField: str = "Close",
+    ticker: str = "VEC",
+) -> dict:
+    from pyBacktest.backtest import Backtest
+
+    if targetPositions is None:
+        targetPositions = signalsToPositions(entries, exits, size)
+    vectorized = runVectorized(
+        hist, cash, targetPositions=targetPositions, commision=commision,
+        commisionType=commisionType, priceField=priceField, ticker=ticker,
+    )
+
+    # The range stays in the index's own timezone; a naive index is read as New York time, as sliceRange does
+    start = _toTimestamp(hist.index[0])
+    end = _toTimestamp(hist.index[-1]) + timedelta(microseconds=1)
+    backtest = Backtest(
+        ticker=ticker,
+        cash=cash,
+        strategy=TargetPositionStrategy(targetPositions, priceField),
+        commision=commision,
+        commisionType=commisionType,
+        startDate=start,
+        endDate=end,
+        dataSource=DataFrameSource(hist),
+    )
+    event = backtest.run()
+
+    def fills(transactions):
+        return [(t.tradeType, t.numShares, round(t.pricePerShare, 8), round(t.commission, 8)) for t in transactions]
+
+    return {
+        "vectorized_final_value": vectorized.final_value,
+        "event_final_value": float(event.final_value),
+        "final_value_diff": vectorized.final_value - float(event.final_value),
+        "equity_max_abs_diff": float(np.abs(vectorized.equity["equity"].to_numpy() - event.equity["equity"].to_numpy()).max()),
+        "transactions_match": fills(vectorized.transactions) == fills(event.transactions),
+        "num_transactions": len(event.transactions),
+    }
@@ -0,0 +1,222 @@
+import os
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple, Type
+import pandas as pd
+from pandas import DataFrame
+from pyBacktest.data import DataSource, DataFrameSource, MemoryMappedStore, getDefaultDataSource, _toTimestamp
+from pyBacktest.fillModels import FillModel
+from pyBacktest.optimize import SharedHistory, SearchSpace, optimize
+from pyBacktest.results import BacktestResult
+from pyBacktest.strategy import Strategy
+from pyBacktest.tradeTypes import OptimizationError
+from pyBacktest.transactionLog import TransactionLog
+
+
+@dataclass
+class WalkForwardResult(BacktestResult):
+    folds: Optional[DataFrame] = None
+    foldResults: List[BacktestResult] = field(default_factory=list)
+
+
+def walkForwardSplits(numBars: int, trainBars: int, testBars: int, stepBars: Optional[int] = None, anchored: bool = False) -> List[Tuple[slice, slice]]:
+    # Positional train/test windows; the last test window is cut short at the end of the history
+    if trainBars < 1 or testBars < 1:
+        raise ValueError("trainBars and testBars must be at least 1")
+    step = stepBars or testBars
+    splits = []
+    start = 0
+    while start + trainBars < numBars:
+        trainEnd = start + trainBars
+        splits.append((slice(0 if anchored else start, trainEnd), slice(trainEnd, min(trainEnd + testBars, numBars))))
+        start += step
+    return splits
+
+
+_worker: Dict[str, Any] = {}
+
+
+def _initWorker(spec: Optional[dict], settings: dict) -> None:
+    if spec is None:
+        store = MemoryMappedStore(settings["storeRoot"])
+        _worker["hist"] = store.history(settings["ticker"], settings["start"], settings["end"], settings["interval"])
+    else:
+        shared = SharedHistory.attach(spec)
+        _worker["shared"] = shared
+        _worker["hist"] = shared.frame()
+    _worker["settings"] = settings
+
+
+def _endOf(index: pd.DatetimeIndex) -> pd.Timestamp:
+    # Exclusive end just past the last bar, in the index's own resolution
+    return index[-1] + pd.Timedelta(1, index.unit)
+
+
+def _runFold(task: Tuple[int, slice, slice]) -> Dict[str, Any]:
+    from pyBacktest.backtest import Backtest
+
+    fold, train, test = task
+    hist: DataFrame = _worker["hist"]
+    settings = _worker["settings"]
+    trainHist = hist.iloc[train]
+    # The test run sees the training window as its look-back, but only trades and records from the test start
+    testHist = hist.iloc[train.start:test.stop]
+    row: Dict[str, Any] = {"fold": fold, "trainStart": trainHist.index[0], "trainEnd": trainHist.index[-1], "testStart": hist.index[test.start], "testEnd": hist.index[test.stop - 1]}
+
+    params: Dict[str, Any] = {}
+    if settings["params"]:
+        trials = optimize(
+            settings["strategyClass"], settings["params"], settings["ticker"], settings["cash"],
+            startDate=trainHist.index[0], endDate=_endOf(trainHist.index),
+            dataSource=DataFrameSource(trainHist), interval=settings["interval"],
+            commision=settings["commision"], commisionType=settings["commisionType"],
+            method=settings["method"], numSamples=settings["numSamples"], seed=settings["seed"],
+            maxWorkers=1, rankBy=settings["rankBy"], ascending=settings["ascending"], fillModel=settings["fillModel"],
+            engine=settings["engine"],
+        )
+        # Failed trials carry only their error and must not be picked as the best parameters
+        succeeded = trials[trials["error"].isna()]
+        if not len(succeeded):
+            raise OptimizationError(f"Every trial failed in fold {fold}, first error: {trials['error'].iloc[0]}")
+        best = succeeded.iloc[0]
+        params = {name: best[name] for name in trials.columns if name in settings["paramNames"]}
+        row["trainScore"] = float(best[settings["rankBy"]])
+
+    strategy = settings["strategyClass"]().setParams(**params)
+    backtest = Backtest(
+        ticker=settings["ticker"],
+        cash=settings["cash"],
+        strategy=strategy,
+        commision=settings["commision"],
+        commisionType=settings["commisionType"],
+        interval=settings["interval"],
+        startDate=testHist.index[0],
+        endDate=_endOf(testHist.index),
+        dataSource=DataFrameSource(testHist),
+        fillModel=settings["fillModel"],
+        engine=settings["engine"],
+    )
+    backtest.warmUp(test.start - train.start)
+    result = backtest.run()
+    row["params"] = params
+    row["testReturn"] = float(result.final_value) / settings["cash"] - 1
+    row["result"] = BacktestResult(final_value=result.final_value, transactions=result.transactions, strategy=strategy, equity=result.equity)
+    return row
+
+
+def stitchResults(results: List[BacktestResult], cash: float, compound: bool = True) -> Tuple[DataFrame, TransactionLog]:
+    # Every fold starts from the same cash, so folds can run independently; the curves are chained afterwards,
+    # by compounding each fold's returns (sizing relative to equity) or by adding its P&L (fixed sizing)
+    frames = []
+    transactions = TransactionLog()
+    carried = cash
+    for fold, result in enumerate(results):
+        equity = result.equity.copy()
+        if compound:
+            scale = carried / cash
+            equity["cash"] *= scale
+            equity["equity"] *= scale
+        else:
+            offset = carried - cash
+            equity["cash"] += offset
+            equity["equity"] += offset
+        equity["fold"] = fold
+        if len(equity):
+            carried = float(equity["equity"].iloc[-1])
+        frames.append(equity)
+        if isinstance(result.transactions, TransactionLog):
+            transactions.extend(result.transactions)
+        else:
+            for transaction in result.transactions:
+                transactions.append(transaction)
+    equity = pd.concat(frames) if frames else DataFrame(columns=["cash", "position", "equity", "fold"])
+    return equity, transactions
+
+
+def walkForward(
+    strategyClass: Type[Strategy],
+    params: SearchSpace,
+    ticker: str,
+    cash: float,
+    startDate: datetime,
+    endDate: datetime,
+    trainBars: int,
+    testBars: int,
+    stepBars: Optional[int] = None,
+    anchored: bool = False,
+    compound: bool = True,
+    dataSource: Optional[DataSource] = None,
+    interval: str = "1d",
+    commision: float = 0.0,
+    commisionType: str = "FLAT",
+    method: str = "grid",
+    numSamples: int = 100,
+    seed: Optional[int] = None,
+    maxWorkers: Optional[int] = None,
+    rankBy: str = "final_value",
+    ascending: bool = False,
+    fillModel: Optional[FillModel] = None,
+    engine: str = "pandas",
+) -> WalkForwardResult:
+    source = dataSource if dataSource is not None else getDefaultDataSource()
+    start = _toTimestamp(startDate).tz_convert("America/New_York")
+    end = _toTimestamp(endDate).tz_convert("America/New_York")
+    # The history is fetched once; every fold is a positional view of it
+    hist = source.history(ticker.upper(), start, end, interval)
+    splits = walkForwardSplits(len(hist), trainBars, testBars, stepBars, anchored)
+    if not splits:
+        raise ValueError(f"{len(hist)} bars are not enough for a {trainBars} bar training window and a test window")
+
+    settings = {
+        "strategyClass": strategyClass,
+        "params": params,
+        "paramNames": list(params),
+        "ticker": ticker.upper(),
+        "cash": cash,
+        "commision": commision,
+        "commisionType": commisionType,
+        "interval": interval,
+        "method": method,
+        "numSamples": numSamples,
+        "seed": seed,
+        "rankBy": rankBy,
+        "ascending": ascending,
+        "fillModel": fillModel,
+        "engine": engine,
+        "start": start,
+        "end": end,
+    }
+    tasks = [(fold, train, test) for fold, (train, test) in enumerate(splits)]
+    workers = min(maxWorkers or os.cpu_count() or 1, len(tasks))
+
+    if workers == 1:
+        _worker["hist"] = hist
+        _worker["settings"] = settings
+        try:
+            rows = [_runFold(task) for task in tasks]
+        finally:
+            _worker.clear()
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        mapped = isinstance(source, MemoryMappedStore)
+        if mapped:
+            settings["storeRoot"] = source.root
+        shared = None if mapped else SharedHistory.create(hist)
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_initWorker, initargs=(shared.spec if shared is not None else None, settings)) as executor:
+                rows = list(executor.map(_runFold, tasks))
+        finally:
+            if shared is not None:
+                shared.close()
+                shared.unlink()
+
+    foldResults = [row.pop("result") for row in rows]
+    equity, transactions = stitchResults(foldResults, cash, compound)
+    return WalkForwardResult(
+        final_value=float(equity["equity"].iloc[-1]) if len(equity) else cash,
+        transactions=transactions,
+        strategy=foldResults[-1].strategy,
+        equity=equity,
+        folds=DataFrame(rows).set_index("fold"),
+        foldResults=foldResults,
+    )